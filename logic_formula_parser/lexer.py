@@ -35,12 +35,30 @@ def t_error(t):
     t.lexer.skip(1)
 
 
+_lexer: Optional[lex.Lexer] = None
+
+
+def get_lexer() -> lex.Lexer:
+    """Return the lexer, built on first use.
+
+    Building the master regular expression of the lexer is only paid by
+    the processes actually parsing formulas, not when importing.
+    """
+    global _lexer
+    if _lexer is None:
+        # _lexer = lex.lex(debug=1)
+        _lexer = lex.lex()
+    return _lexer
+
+
 def tokenize(data):
-    # lexer = lex.lex(debug=1)
-    # lexer = lex.lex()
+    lexer = get_lexer()
     lexer.input(data)
     return [token for token in lexer]
 
 
-# lexer = lex.lex(debug=1)
-lexer = lex.lex()
+def __getattr__(name: str) -> Any:
+    # The lexer attribute is built lazily.
+    if name == "lexer":
+        return get_lexer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,33 +1,79 @@
+"""
+Nodes of the formulas.
+
+The nodes are hash-consed: building a node equal to an existing one
+returns the existing node, so that equal subformulas share their storage
+and equality is identity. The nodes are immutable, and their hash is
+computed once, when they are built.
+"""
+
 from __future__ import annotations
+import weakref
 from typing import *
 
 
 class Proposition:
-    def __init__(self, literal: str) -> None:
-        self.literal = literal
+    __slots__ = ("literal", "_hash", "__weakref__")
+
+    _interned: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    def __new__(cls, literal: str) -> Proposition:
+        node = cls._interned.get(literal)
+        if node is None:
+            node = super().__new__(cls)
+            object.__setattr__(node, "literal", literal)
+            object.__setattr__(node, "_hash", hash(literal))
+            cls._interned[literal] = node
+        return node
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
 
-    def __eq__(self, o: Proposition) -> bool:
-        return isinstance(o, Proposition) and self.literal == o.literal
+    def __reduce__(self):
+        return type(self), (self.literal,)
 
     def __hash__(self):
-        return hash(self.literal)
+        return self._hash
 
     def __str__(self) -> str:
         return str(self.literal)
 
 
 class Operator:
-    def __init__(self, left: Formula = None, right: Formula = None) -> None:
+    __slots__ = ("left", "right", "_hash", "__weakref__")
+
+    # Nodes by type and identity of their children: the children of an
+    # interned node are alive as long as it is, so their ids are not reused.
+    _interned: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    def __new__(cls, left: Formula = None, right: Formula = None) \
+            -> Operator:
+        return cls._intern(left, right)
+
+    @classmethod
+    def _intern(cls, left: Optional[Formula],
+                right: Optional[Formula]) -> Operator:
         if not left and not right:
             raise ValueError("Both children of the operator are None.")
-        self.left = left
-        self.right = right
-
-    def __eq__(self, o: Operator) -> bool:
-        return self.left == o.left and self.right == o.right
+        key = (cls, id(left), id(right))
+        node = Operator._interned.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            object.__setattr__(node, "left", left)
+            object.__setattr__(node, "right", right)
+            object.__setattr__(node, "_hash",
+                               hash((cls.__name__, left, right)))
+            Operator._interned[key] = node
+        return node
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return _intern_operator, (type(self), self.left, self.right)
 
     def __hash__(self):
-        return hash((self.left, self.right))
+        return self._hash
 
     @property
     def children(self):
@@ -35,49 +81,73 @@ class Operator:
 
 
 class UnaryOperator(Operator):
-    def __init__(self, right: Leaf) -> None:
-        super().__init__(right=right)
+    __slots__ = ()
+
+    def __new__(cls, right: Leaf) -> UnaryOperator:
+        return cls._intern(None, right)
 
 
 class Not(UnaryOperator):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'¬{self.right}'
 
 
 class Box(UnaryOperator):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'☐{self.right}'
 
 
 class BoxNot(UnaryOperator):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'☐¬{self.right}'
 
 
 class Diamond(UnaryOperator):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'◇{self.right}'
 
 
 class DiamondNot(UnaryOperator):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'◇¬{self.right}'
 
 
 class Imply(Operator):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'{self.left}→{self.right}'
 
 
 class And(Operator):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'{self.left}∧{self.right}'
 
 
 class Or(Operator):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'{self.left}∨{self.right}'
 
 
 Formula = NewType('SubFormula', Union[Operator, Proposition])
 Leaf = NewType('Leaf', Union[UnaryOperator, Proposition])
+
+
+def _intern_operator(cls: Type[Operator], left: Optional[Formula],
+                     right: Optional[Formula]) -> Operator:
+    """Return the node, used to unpickle the operators."""
+    return cls._intern(left, right)
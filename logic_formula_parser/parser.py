@@ -1,9 +1,15 @@
-from ply import yacc
+from __future__ import annotations
+import os
+from typing import *
 
 # Get the token map from the lexer.  This is required.
-from logic_formula_parser.lexer import lexer, tokenize, tokens
+from logic_formula_parser.lexer import get_lexer, tokens
 import logic_formula_parser.operators as op
 
+# Module holding the precomputed LALR tables, regenerated by PLY if the
+# grammar changes.
+TABLES_MODULE = "logic_formula_parser.parsetab"
+
 precedence = (
     ("left", "IMPLY"),
     ("left", "OR"),
@@ -73,19 +79,38 @@ def p_error(p):
     print(p)
 
 
-def parse_file(filename: str):
+if TYPE_CHECKING:
+    from ply import yacc
+
+_parser: Optional[yacc.LRParser] = None
+
+
+def get_parser() -> yacc.LRParser:
+    """Return the parser, built on first use from the persisted tables.
+
+    The same parser is used for every formula of the process. PLY is only
+    imported then, to keep the import of this module cheap.
+    """
+    global _parser
+    if _parser is None:
+        from ply import yacc
+        # yacc.yacc(write_tables=True, debug=True)
+        _parser = yacc.yacc(tabmodule=TABLES_MODULE,
+                            outputdir=os.path.dirname(__file__),
+                            debug=False)
+    return _parser
+
+
+def parse_file(filename: str) -> List[op.Formula]:
+    """Return the formula of each line of the file."""
+    parser = get_parser()
+    lexer = get_lexer()
     with open(filename) as f:
-        for line in f:
-            tokenize(line)
-            parser = yacc.yacc()
-            parser.parse(line, lexer=lexer)
-    return
+        return [parser.parse(line, lexer=lexer) for line in f]
 
 
 def parse(data: str):
-    # yacc.yacc(write_tables=True, debug=True)
-    parser = yacc.yacc()
-    return parser.parse(data, lexer=lexer)
+    return get_parser().parse(data, lexer=get_lexer())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,310 @@
+"""
+Stochastic local search for weighted partial MaxSAT, in the style of
+SATLike: a complete assignment is improved by flipping one variable at a
+time, guided by dynamic clause weights.
+
+Every variable has a score, the total dynamic weight of the clauses its
+flip would satisfy (make) minus the weight of those it would falsify
+(break), maintained incrementally from the number of true literals of
+each clause. A variable of positive score is flipped while there is one
+(the best of a sample), unless it was flipped during the last few steps
+(tabu). In a local optimum, the weights of the falsified clauses are
+increased, or with a small probability the weights of the satisfied
+clauses are smoothed down, and a variable of a random falsified clause is
+flipped. The search never proves optimality, it quickly finds good
+solutions, usable as upper bounds for the exact algorithms.
+"""
+import random
+import time
+from typing import *
+
+from sat_solver.clauses import Clauses
+from sat_solver.model import Model
+from max_sat_solver.solution import MaxSatSolution
+
+
+class LocalSearch:
+    """Local search solver for weighted partial MaxSAT."""
+
+    def __init__(self, clauses: Clauses, seed: Optional[int] = None,
+                 hard_increment: int = 3, soft_limit: int = 1000,
+                 tabu_tenure: int = 10, noise: float = 0.1,
+                 smoothing: float = 0.01, sample_size: int = 15) -> None:
+        """Construct a local search over the clauses.
+
+        The dynamic weight of the hard clauses grows by hard_increment in
+        each local optimum where they are falsified; the weight of a soft
+        clause grows by 1, up to soft_limit for the heaviest soft clauses
+        (proportionally lower for the others). With probability noise, a
+        random variable of the falsified clause is flipped instead of the
+        best one; with probability smoothing, the weights are smoothed
+        instead of increased.
+        """
+        self.clauses = clauses
+        self.hard_increment = hard_increment
+        self.tabu_tenure = tabu_tenure
+        self.noise = noise
+        self.smoothing = smoothing
+        self.sample_size = sample_size
+        self._random = random.Random(seed)
+        # Empty soft clauses are always falsified and tautologies always
+        # satisfied: neither takes part in the search.
+        self._constant = 0
+        self._unsatisfiable = False
+        self._clauses: List[List[int]] = []
+        self._hard: List[bool] = []
+        self._cost: List[int] = []
+        for clause, weight, hard in zip(clauses.clauses, clauses.weights,
+                                        clauses.hard):
+            clause = list(dict.fromkeys(clause))
+            if any(-literal in clause for literal in clause):
+                continue
+            if not clause:
+                if hard:
+                    self._unsatisfiable = True
+                else:
+                    self._constant += weight
+                continue
+            self._clauses.append(clause)
+            self._hard.append(hard)
+            self._cost.append(0 if hard else weight)
+        heaviest = max(self._cost, default=1) or 1
+        self._limits: List[int] = [
+            0 if hard else max(1, soft_limit * cost // heaviest)
+            for hard, cost in zip(self._hard, self._cost)
+        ]
+        # Every variable of the input is in the model, including the ones
+        # only occurring in tautologies.
+        self._variables: List[int] = sorted(
+            {abs(literal) for literal in clauses.clauses.literals} - {0}
+        )
+        size = max(self._variables, default=0) + 1
+        self._occurrences: Dict[int, List[int]] = {}
+        for index, clause in enumerate(self._clauses):
+            for literal in clause:
+                self._occurrences.setdefault(literal, []).append(index)
+        self._values: List[bool] = [False] * size
+        self._scores: List[int] = [0] * size
+        self._flipped_at: List[int] = [0] * size
+        self._step = 0
+        self._weights: List[int] = []
+        self._true_counts: List[int] = []
+        self._critical: List[int] = []
+        self._falsified = _RandomSet(self._random)
+        self._good = _RandomSet(self._random)
+        self._hard_falsified = 0
+        self._soft_falsified = 0
+
+    def solve(self, max_flips: int = 100000,
+              time_limit: Optional[float] = None,
+              initial: Iterable[int] = ()) -> Optional[MaxSatSolution]:
+        """Return the best solution found, None if no assignment satisfying
+        the hard clauses was found.
+
+        The search starts from the initial literals, the other variables
+        being set randomly, and stops after max_flips flips or time_limit
+        seconds. The solution is only known to be optimal if it satisfies
+        every non-empty soft clause.
+        """
+        if self._unsatisfiable:
+            return None
+        deadline = (time.monotonic() + time_limit
+                    if time_limit is not None else None)
+        self._initialize(initial)
+        best: Optional[List[bool]] = None
+        best_cost = 0
+        for step in range(max_flips + 1):
+            if not self._hard_falsified and (
+                    best is None or self._soft_falsified < best_cost):
+                best = list(self._values)
+                best_cost = self._soft_falsified
+                if not best_cost:
+                    break
+            if step == max_flips or (deadline is not None and step % 256 == 0
+                                     and time.monotonic() > deadline):
+                break
+            self._step = step
+            variable = self._pick()
+            self._flip(variable)
+            self._flipped_at[variable] = step
+        if best is None:
+            return None
+        model = Model((variable if best[variable] else -variable
+                       for variable in self._variables), self.clauses)
+        return MaxSatSolution(model, best_cost + self._constant,
+                              optimal=not best_cost)
+
+    def _initialize(self, initial: Iterable[int]) -> None:
+        """Assign every variable and compute the scores from scratch."""
+        for variable in self._variables:
+            self._values[variable] = self._random.random() < 0.5
+            self._scores[variable] = 0
+        for literal in initial:
+            if abs(literal) < len(self._values):
+                self._values[abs(literal)] = literal > 0
+        self._flipped_at = [-self.tabu_tenure - 1] * len(self._values)
+        self._weights = [1] * len(self._clauses)
+        self._true_counts = [0] * len(self._clauses)
+        self._critical = [0] * len(self._clauses)
+        self._falsified.clear()
+        self._good.clear()
+        self._hard_falsified = 0
+        self._soft_falsified = 0
+        for index, clause in enumerate(self._clauses):
+            true_literals = [literal for literal in clause
+                             if self._is_true(literal)]
+            self._true_counts[index] = len(true_literals)
+            if not true_literals:
+                self._falsify(index)
+                for literal in clause:
+                    self._scores[abs(literal)] += 1
+            elif len(true_literals) == 1:
+                self._critical[index] = abs(true_literals[0])
+                self._scores[abs(true_literals[0])] -= 1
+        for variable in self._variables:
+            if self._scores[variable] > 0:
+                self._good.add(variable)
+
+    def _pick(self) -> int:
+        """Return the variable to flip."""
+        if self._good:
+            candidates = self._good.sample(self.sample_size)
+            allowed = [variable for variable in candidates
+                       if not self._is_tabu(variable)]
+            if allowed:
+                return max(allowed, key=self._priority)
+        self._update_weights()
+        clause = self._clauses[self._falsified.choice()]
+        if self._random.random() < self.noise:
+            return abs(self._random.choice(clause))
+        variables = [abs(literal) for literal in clause]
+        allowed = [variable for variable in variables
+                   if not self._is_tabu(variable)]
+        return max(allowed or variables, key=self._priority)
+
+    def _priority(self, variable: int) -> Tuple[int, int]:
+        """Order the variables by score, then by age."""
+        return self._scores[variable], -self._flipped_at[variable]
+
+    def _is_tabu(self, variable: int) -> bool:
+        """Return True if the variable was flipped in the last steps."""
+        return self._step - self._flipped_at[variable] <= self.tabu_tenure
+
+    def _flip(self, variable: int) -> None:
+        """Flip the variable and update the scores incrementally."""
+        self._values[variable] = not self._values[variable]
+        true_literal = variable if self._values[variable] else -variable
+        for index in self._occurrences.get(true_literal, ()):
+            weight = self._weights[index]
+            self._true_counts[index] += 1
+            count = self._true_counts[index]
+            if count == 1:
+                # The clause is now satisfied, only by the variable.
+                self._satisfy(index)
+                for literal in self._clauses[index]:
+                    self._add_score(abs(literal), -weight)
+                self._add_score(variable, -weight)
+                self._critical[index] = variable
+            elif count == 2:
+                self._add_score(self._critical[index], weight)
+        for index in self._occurrences.get(-true_literal, ()):
+            weight = self._weights[index]
+            self._true_counts[index] -= 1
+            count = self._true_counts[index]
+            if count == 0:
+                self._falsify(index)
+                for literal in self._clauses[index]:
+                    self._add_score(abs(literal), weight)
+                self._add_score(variable, weight)
+            elif count == 1:
+                for literal in self._clauses[index]:
+                    if self._is_true(literal):
+                        self._critical[index] = abs(literal)
+                        self._add_score(abs(literal), -weight)
+                        break
+
+    def _update_weights(self) -> None:
+        """Increase the weights of the falsified clauses, or smooth the
+        weights of the satisfied ones."""
+        if self._random.random() < self.smoothing:
+            for index, weight in enumerate(self._weights):
+                if weight > 1 and self._true_counts[index]:
+                    self._weights[index] -= 1
+                    if self._true_counts[index] == 1:
+                        self._add_score(self._critical[index], 1)
+            return
+        for index in self._falsified:
+            if self._hard[index]:
+                increment = self.hard_increment
+            elif self._weights[index] < self._limits[index]:
+                increment = 1
+            else:
+                continue
+            self._weights[index] += increment
+            for literal in self._clauses[index]:
+                self._add_score(abs(literal), increment)
+
+    def _add_score(self, variable: int, delta: int) -> None:
+        self._scores[variable] += delta
+        if self._scores[variable] > 0:
+            self._good.add(variable)
+        else:
+            self._good.discard(variable)
+
+    def _falsify(self, index: int) -> None:
+        self._falsified.add(index)
+        if self._hard[index]:
+            self._hard_falsified += 1
+        else:
+            self._soft_falsified += self._cost[index]
+
+    def _satisfy(self, index: int) -> None:
+        self._falsified.discard(index)
+        if self._hard[index]:
+            self._hard_falsified -= 1
+        else:
+            self._soft_falsified -= self._cost[index]
+
+    def _is_true(self, literal: int) -> bool:
+        return self._values[abs(literal)] == (literal > 0)
+
+
+class _RandomSet:
+    """Set of integers supporting uniform random choice in O(1)."""
+
+    def __init__(self, generator: random.Random) -> None:
+        self._random = generator
+        self._items: List[int] = []
+        self._positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._items))
+
+    def add(self, item: int) -> None:
+        if item not in self._positions:
+            self._positions[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item: int) -> None:
+        position = self._positions.pop(item, None)
+        if position is not None:
+            last = self._items.pop()
+            if position < len(self._items):
+                self._items[position] = last
+                self._positions[last] = position
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._positions.clear()
+
+    def choice(self) -> int:
+        return self._random.choice(self._items)
+
+    def sample(self, size: int) -> List[int]:
+        """Return up to size distinct items."""
+        if len(self._items) <= size:
+            return list(self._items)
+        return self._random.sample(self._items, size)
@@ -1,18 +1,289 @@
+"""
+MaxSAT Solver: find an assignment minimizing the total weight of the
+falsified soft clauses, while satisfying every hard clause.
+
+Two algorithms are available:
+- "oll", core-guided, as in the RC2 solver. Each soft clause is extended
+  with a fresh blocking literal whose negation is assumed by the SAT
+  solver. When the assumptions are unsatisfiable, the SAT solver returns a
+  core: a subset of soft clauses which can't all be satisfied. Its cost is
+  paid, and the core is relaxed with a totalizer allowing one more of its
+  clauses to be falsified. With stratification, the soft clauses of
+  highest weight are considered first, each stratum giving a solution.
+- "linear", SAT-UNSAT search. Each solution found is improved by
+  constraining the total weight of the falsified clauses to be lower,
+  until the constraint is unsatisfiable.
+
+Both report each improving solution as soon as it is found, so that a
+best-so-far solution is available when the time limit is reached. A local
+search can first provide an initial solution, whose cost is an upper
+bound allowing the algorithms to stop as soon as it is proven optimal.
+A single incremental SAT solver is used, keeping its learned clauses from
+one call to the next.
+"""
+import pathlib
+import time
 from typing import *
 
+from sat_solver.cdcl_solver import CdclSatSolver
 from sat_solver.clauses import Clauses
-from dpll_solver import DpllSatSolver
+from sat_solver.evaluation import ClauseEvaluator
+from sat_solver.model import Model
+from max_sat_solver.local_search import LocalSearch
+from max_sat_solver.solution import MaxSatSolution
+from max_sat_solver.totalizer import GeneralizedTotalizer, Totalizer
 
 
 class MaxSatSolver:
-    def __init__(self):  # , clauses: Clauses):
-        # self.initial_clauses = clauses
-        # self.solver = SatSolver(clauses)
-        pass
+    """MaxSAT solver for weighted partial MaxSAT."""
+
+    ALGORITHMS = ("oll", "linear")
+
+    def __init__(self, algorithm: str = "oll", stratified: bool = True,
+                 time_limit: Optional[float] = None,
+                 on_solution: Optional[Callable[[MaxSatSolution], None]]
+                 = None, local_search_flips: int = 0,
+                 preprocess: bool = False) -> None:
+        """Construct a solver.
+
+        If the time limit (in seconds) is reached, the best solution found so
+        far is returned as not optimal. It is only checked between two calls
+        to the SAT solver. on_solution is called with every improving
+        solution found. If local_search_flips is positive, a local search
+        of at most that many flips is run first. If preprocess is set, the
+        hard clauses are simplified first, the variables of the soft clauses
+        being frozen.
+        """
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Algorithm {algorithm} unknown")
+        self.algorithm = algorithm
+        self.stratified = stratified
+        self.time_limit = time_limit
+        self.on_solution = on_solution
+        self.local_search_flips = local_search_flips
+        self.preprocess = preprocess
+        self.best: Optional[MaxSatSolution] = None
+        self._clauses: Optional[Clauses] = None
+        self._solver: Optional[CdclSatSolver] = None
+        self._evaluator: Optional[ClauseEvaluator] = None
+        self._weights: Dict[int, int] = {}
+        self._bounds: Dict[int, Tuple[Totalizer, int]] = {}
+        self._last_variable = 0
+        self._deadline: Optional[float] = None
+
+    def solve(self, clauses: Clauses) -> Optional[MaxSatSolution]:
+        """Return an assignment of minimum cost.
+
+        Return None if the hard clauses are unsatisfiable, or if no solution
+        was found before the time limit.
+        """
+        self._clauses = clauses
+        self.best = None
+        self._solver = CdclSatSolver(
+            Clauses([clause for clause, hard
+                     in zip(clauses.clauses, clauses.hard) if hard],
+                    clauses.translation),
+            preprocess=self.preprocess
+        )
+        self._solver.freeze(abs(literal) for clause, hard
+                            in zip(clauses.clauses, clauses.hard)
+                            if not hard for literal in clause)
+        self._evaluator = ClauseEvaluator(
+            clauses.clauses,
+            [0 if hard else weight
+             for weight, hard in zip(clauses.weights, clauses.hard)]
+        )
+        self._weights = {}
+        self._bounds = {}
+        self._last_variable = _last_variable(clauses)
+        self._deadline = (time.monotonic() + self.time_limit
+                          if self.time_limit is not None else None)
+        cost = 0
+        for clause, weight, hard in zip(clauses.clauses, clauses.weights,
+                                        clauses.hard):
+            if hard:
+                continue
+            if not clause:
+                cost += weight
+            elif len(clause) == 1:
+                self._add_soft(clause[0], weight)
+            else:
+                blocking = self._new_variable()
+                self._solver.add_clause(list(clause) + [blocking])
+                self._add_soft(-blocking, weight)
+        if self.local_search_flips > 0:
+            self._local_search()
+        if self.algorithm == "linear":
+            return self._linear_search(cost)
+        return self._oll(cost)
+
+    def _oll(self, cost: int) -> Optional[MaxSatSolution]:
+        """Return the solution found by the OLL algorithm.
+
+        Only the assumptions whose weight reaches the threshold are made.
+        Once they are satisfiable, the threshold is lowered to the next
+        weight, until every assumption is made.
+        """
+        threshold = (max(self._weights.values(), default=0)
+                     if self.stratified else 0)
+        while True:
+            if self._timed_out():
+                return self._best_so_far()
+            if self.best is not None and self.best.cost <= cost:
+                # The cost paid for the cores is a lower bound.
+                return self._improve(self.best.model, optimal=True)
+            assumptions = [literal for literal, weight
+                           in self._weights.items() if weight >= threshold]
+            solver = self._solver
+            model = solver.solve(assumptions)
+            if model is not None:
+                lower = [weight for weight in self._weights.values()
+                         if weight < threshold]
+                if not lower:
+                    return self._improve(model, optimal=True)
+                self._improve(model)
+                threshold = max(lower)
+            elif not solver.core:
+                return None
+            else:
+                cost += self._relax(solver.core)
+
+    def _linear_search(self, cost: int) -> Optional[MaxSatSolution]:
+        """Return the solution found by the SAT-UNSAT linear search.
+
+        The cost of the empty soft clauses is always paid, it is excluded
+        from the bound on the relaxation literals.
+        """
+        relaxations = [(-literal, weight)
+                       for literal, weight in self._weights.items()]
+        model = self._solver.solve()
+        if model is None:
+            return None
+        solution = self._improve(model)
+        if solution.cost == cost or not relaxations:
+            return self._improve(model, optimal=True)
+        totalizer = GeneralizedTotalizer(relaxations, self._new_variable,
+                                         solution.cost - cost)
+        for clause in totalizer.clauses:
+            self._solver.add_clause(clause)
+        while self.best.cost > cost:
+            if self._timed_out():
+                return self._best_so_far()
+            for literal in totalizer.at_most(self.best.cost - cost - 1):
+                self._solver.add_clause([literal])
+            model = self._solver.solve()
+            if model is None:
+                break
+            self._improve(model)
+        return self.best._replace(optimal=True)
+
+    def _local_search(self) -> None:
+        """Record the solution of a local search as the initial best."""
+        time_limit = (max(self._deadline - time.monotonic(), 0)
+                      if self._deadline is not None else None)
+        solution = LocalSearch(self._clauses, seed=0).solve(
+            self.local_search_flips, time_limit
+        )
+        if solution is not None:
+            self._improve(solution.model)
+
+    def _improve(self, model: Model,
+                 optimal: bool = False) -> MaxSatSolution:
+        """Record the model if it is better than the best one.
+
+        Return the best solution.
+        """
+        model = _restrict(model, self._clauses)
+        cost = self._evaluator.falsified_weight([model.literals])[0]
+        if self.best is None or cost < self.best.cost:
+            self.best = MaxSatSolution(model, cost, optimal)
+            if self.on_solution is not None:
+                self.on_solution(self.best)
+        elif optimal:
+            self.best = self.best._replace(optimal=True)
+        return self.best
+
+    def _best_so_far(self) -> Optional[MaxSatSolution]:
+        if self.best is None:
+            return None
+        return self.best._replace(optimal=False)
+
+    def _timed_out(self) -> bool:
+        return self._deadline is not None and time.monotonic() > self._deadline
+
+    def _add_soft(self, literal: int, weight: int) -> None:
+        """Add the literal to the assumptions with the weight."""
+        self._weights[literal] = self._weights.get(literal, 0) + weight
+
+    def _new_variable(self) -> int:
+        self._last_variable += 1
+        return self._last_variable
+
+    def _relax(self, core: List[int]) -> int:
+        """Relax the core and return the cost paid for it.
+
+        The weight of each assumption of the core is decreased by the
+        minimum weight of the core, which is the cost paid. The assumptions
+        of the core are replaced by a totalizer allowing one of them to be
+        falsified at no further cost.
+        """
+        core = list(dict.fromkeys(core))
+        weight = min(self._weights[literal] for literal in core)
+        for literal in core:
+            self._weights[literal] -= weight
+            if not self._weights[literal]:
+                del self._weights[literal]
+            if literal in self._bounds:
+                totalizer, bound = self._bounds[literal]
+                self._add_bound(totalizer, bound + 1, weight)
+        if len(core) == 1:
+            self._solver.add_clause([-core[0]])
+        else:
+            totalizer = Totalizer([-literal for literal in core],
+                                  self._new_variable)
+            for clause in totalizer.clauses:
+                self._solver.add_clause(clause)
+            self._add_bound(totalizer, 1, weight)
+        return weight
+
+    def _add_bound(self, totalizer: Totalizer, bound: int,
+                   weight: int) -> None:
+        """Assume that at most bound inputs of the totalizer are true."""
+        literal = totalizer.at_most(bound)
+        if literal is not None:
+            self._bounds[literal] = (totalizer, bound)
+            self._add_soft(literal, weight)
+
+
+def _last_variable(clauses: Clauses) -> int:
+    """Return the highest variable of the clauses or their translation."""
+    variables = [abs(literal) for clause in clauses.clauses
+                 for literal in clause]
+    if clauses.translation:
+        variables.extend(clauses.translation.values())
+    return max(variables, default=1)
+
+
+def _restrict(model: Model, clauses: Clauses) -> Model:
+    """Return the model over the variables of the clauses only.
 
-    def solve(self, clauses: Clauses) -> FrozenSet[Clauses]:
-        pass
+    The auxiliary variables are removed, and the variables left unassigned
+    (only occurring in relaxed unit clauses) are set to False.
+    """
+    variables = set(map(abs, clauses.clauses.literals))
+    variables.discard(0)
+    return Model((variable if model.value(variable) else -variable
+                  for variable in sorted(variables)), clauses)
 
 
 if __name__ == "__main__":
-    pass
+    solution = MaxSatSolver(
+        on_solution=lambda s: print(f"Solution of cost {s.cost} found")
+    ).solve(Clauses.from_file(
+        f"{pathlib.Path(__file__).parent.parent}/clauses_input.txt"
+    ))
+    if solution:
+        print(f"Cost: {solution.cost}")
+        print(solution.model)
+    else:
+        print("No solution.")
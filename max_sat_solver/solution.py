@@ -0,0 +1,14 @@
+"""
+Solution of a MaxSAT problem, as returned by the MaxSAT solvers.
+"""
+from typing import *
+
+from sat_solver.model import Model
+
+
+class MaxSatSolution(NamedTuple):
+    """Assignment and the total weight of the soft clauses it
+    falsifies."""
+    model: Model
+    cost: int
+    optimal: bool = True
@@ -0,0 +1,106 @@
+"""
+Totalizer encoding of cardinality constraints.
+
+The totalizer is a binary tree counting in unary how many of its input
+literals are true: output k is implied true as soon as at least k inputs
+are true. Assuming the negation of output k + 1 thus enforces that at most
+k inputs are true.
+"""
+
+from __future__ import annotations
+from typing import *
+
+
+class Totalizer:
+    """Unary counter of the true literals among its inputs."""
+
+    def __init__(self, inputs: Sequence[int],
+                 new_variable: Callable[[], int]) -> None:
+        """Build the encoding of the inputs.
+
+        new_variable is called to create each auxiliary variable.
+        """
+        self.inputs: List[int] = list(inputs)
+        self.clauses: List[List[int]] = []
+        self._new_variable = new_variable
+        self.outputs: List[int] = self._build(self.inputs)
+
+    def _build(self, inputs: List[int]) -> List[int]:
+        """Return the unary outputs of the subtree counting the inputs."""
+        if len(inputs) == 1:
+            return inputs
+        middle = len(inputs) // 2
+        left = self._build(inputs[:middle])
+        right = self._build(inputs[middle:])
+        outputs = [self._new_variable() for _ in range(len(inputs))]
+        for i in range(len(left) + 1):
+            for j in range(len(right) + 1):
+                if i + j == 0:
+                    continue
+                clause = [outputs[i + j - 1]]
+                if i > 0:
+                    clause.append(-left[i - 1])
+                if j > 0:
+                    clause.append(-right[j - 1])
+                self.clauses.append(clause)
+        return outputs
+
+    def at_most(self, bound: int) -> Optional[int]:
+        """Return the literal enforcing at most bound true inputs.
+
+        Return None if the bound is always respected.
+        """
+        if bound >= len(self.outputs):
+            return None
+        return -self.outputs[bound]
+
+
+class GeneralizedTotalizer:
+    """Counter of the total weight of the true literals among its inputs.
+
+    Each node has one output per distinct weight its inputs can sum to, the
+    weights above the limit being merged in a single output. The output of
+    a weight is implied true as soon as the inputs sum to at least it.
+    """
+
+    def __init__(self, inputs: Sequence[Tuple[int, int]],
+                 new_variable: Callable[[], int], limit: int) -> None:
+        """Build the encoding of the (literal, weight) inputs.
+
+        new_variable is called to create each auxiliary variable.
+        """
+        self.inputs: List[Tuple[int, int]] = list(inputs)
+        self.limit = limit
+        self.clauses: List[List[int]] = []
+        self._new_variable = new_variable
+        self.outputs: Dict[int, int] = self._build(self.inputs)
+
+    def _build(self, inputs: List[Tuple[int, int]]) -> Dict[int, int]:
+        """Return the outputs of the subtree by weight."""
+        if len(inputs) == 1:
+            literal, weight = inputs[0]
+            return {min(weight, self.limit): literal}
+        middle = len(inputs) // 2
+        left = self._build(inputs[:middle])
+        right = self._build(inputs[middle:])
+        outputs: Dict[int, int] = {}
+        for left_weight, left_literal in [(0, None)] + list(left.items()):
+            for right_weight, right_literal in ([(0, None)]
+                                                + list(right.items())):
+                if left_literal is None and right_literal is None:
+                    continue
+                weight = min(left_weight + right_weight, self.limit)
+                if weight not in outputs:
+                    outputs[weight] = self._new_variable()
+                clause = [outputs[weight]]
+                if left_literal is not None:
+                    clause.append(-left_literal)
+                if right_literal is not None:
+                    clause.append(-right_literal)
+                self.clauses.append(clause)
+        return outputs
+
+    def at_most(self, bound: int) -> List[int]:
+        """Return the literals enforcing a total weight of at most bound."""
+        return [-literal for weight, literal in self.outputs.items()
+                if weight > bound]
@@ -0,0 +1,143 @@
+"""
+On-disk cache of the clauses read from input files.
+
+The clauses of a file are stored in a binary file named after the SHA-256
+of the content of the input: when the input is unchanged, its clauses are
+loaded without parsing it again or regenerating the modal axioms. The
+cache file holds a header, the raw buffers of the clause arena, of the
+weights, of the hard flags and of the line numbers, then the translation as
+text:
+
+    magic, byte order, number of literals, clauses and translation bytes
+    literals (int32), offsets (int64), weights (int64), hard flags (int8),
+    line numbers (int64, 0 for the clauses without line)
+    translation, one "<variable> <leaf>" per line
+
+The buffers are loaded with array.frombytes from a memory map of the
+file.
+"""
+
+from __future__ import annotations
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import *
+
+from sat_solver.clause_arena import ClauseArena
+from sat_solver.clauses import Clauses, format_leaf, parse_leaf
+
+# Changing the format or the conversion of the input invalidates the cache.
+FORMAT_VERSION = 3
+_MAGIC = b"MSATC"
+_HEADER = struct.Struct("<5sBcxQQQ")
+_BYTE_ORDERS = {"little": b"<", "big": b">"}
+
+
+def default_cache_directory() -> str:
+    """Return the directory of the cache, under $XDG_CACHE_HOME."""
+    root = os.environ.get("XDG_CACHE_HOME",
+                          os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(root, "modal_sat_solver")
+
+
+def input_digest(filename: str) -> str:
+    """Return the key of the file in the cache."""
+    digest = hashlib.sha256(f"{FORMAT_VERSION}\n".encode())
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_clauses(filename: str,
+                 cache_directory: Optional[str] = None) -> Clauses:
+    """Return the clauses of the file, from the cache if it is there.
+
+    Otherwise the file is read with Clauses.from_file and the clauses are
+    added to the cache.
+    """
+    directory = (cache_directory if cache_directory is not None
+                 else default_cache_directory())
+    path = os.path.join(directory, input_digest(filename) + ".clauses")
+    if os.path.exists(path):
+        try:
+            return read_cache(path)
+        except ValueError:
+            pass  # Corrupted: replaced below.
+    clauses = Clauses.from_file(filename)
+    os.makedirs(directory, exist_ok=True)
+    write_cache(clauses, path)
+    return clauses
+
+
+def write_cache(clauses: Clauses, path: str) -> None:
+    """Write the clauses to the binary file, atomically."""
+    arena = clauses.clauses
+    translation = "".join(
+        f"{variable} {format_leaf(leaf)}\n"
+        for leaf, variable in (clauses.translation or {}).items()
+    ).encode()
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION,
+                          _BYTE_ORDERS[sys.byteorder], len(arena.literals),
+                          len(arena), len(translation))
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(header)
+            arena.literals.tofile(f)
+            arena.offsets.tofile(f)
+            array("q", clauses.weights).tofile(f)
+            array("b", clauses.hard).tofile(f)
+            array("q", (line or 0 for line in clauses.lines)).tofile(f)
+            f.write(translation)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def read_cache(path: str) -> Clauses:
+    """Return the clauses of the binary file.
+
+    Raise ValueError if the file is not a valid cache file.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            raise ValueError(f"{path} is truncated")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version, byte_order, literals, size, translation_size \
+                = _HEADER.unpack_from(data)
+            if magic != _MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a cache file")
+            position = _HEADER.size
+            buffers = []
+            with memoryview(data) as view:
+                for typecode, length in (("i", literals), ("q", size),
+                                         ("q", size), ("b", size),
+                                         ("q", size)):
+                    buffer = array(typecode)
+                    end = position + length * buffer.itemsize
+                    if end > len(data):
+                        raise ValueError(f"{path} is truncated")
+                    with view[position:end] as block:
+                        buffer.frombytes(block)
+                    if byte_order != _BYTE_ORDERS[sys.byteorder]:
+                        buffer.byteswap()
+                    buffers.append(buffer)
+                    position = end
+            translation_text = data[position:position + translation_size]
+    arena = ClauseArena()
+    arena.literals, arena.offsets = buffers[0], buffers[1]
+    translation = {}
+    for line in translation_text.decode().splitlines():
+        variable, leaf = line.split(maxsplit=1)
+        translation[parse_leaf(leaf)] = int(variable)
+    return Clauses(arena, translation, buffers[2].tolist(),
+                   [bool(flag) for flag in buffers[3]],
+                   [line or None for line in buffers[4]])
@@ -0,0 +1,413 @@
+"""
+SAT Solver reading clauses from file. It expects the clauses in conjunctive
+normal form.
+Based upon the CDCL algorithm: each conflict is analysed to learn a clause
+(first unique implication point), and the search backjumps to the second
+highest decision level of the learned clause.
+"""
+import pathlib
+from typing import *
+
+from sat_solver.clauses import Clauses
+from sat_solver.heuristics import BranchingHeuristic, Evsids
+from sat_solver.model import Model
+from sat_solver.preprocessing import Preprocessor
+from sat_solver.propagation import WatchedLiterals
+from sat_solver.solver import HeuristicFactory, RestartPolicyFactory
+from sat_solver.solver import SatSolver
+
+
+class CdclSatSolver(SatSolver):
+    """SAT Solver using the CDCL algorithm."""
+
+    def __init__(self, clauses: Clauses,
+                 heuristic: Union[str, HeuristicFactory] = Evsids,
+                 max_learned: int = 2000,
+                 max_learned_increment: int = 300,
+                 preprocess: bool = False,
+                 restarts: Union[str, RestartPolicyFactory] = "luby",
+                 rephase_interval: int = 8) -> None:
+        """Construct a solver for the clauses.
+
+        The variables taking part in each conflict analysis are bumped in
+        the branching heuristic. When more than max_learned clauses have
+        been learned, the half with the highest LBD (literal block distance)
+        is deleted, clauses of LBD 2 or less being always kept. The limit
+        then grows by max_learned_increment.
+
+        The solver is incremental: the learned clauses, the state of the
+        heuristic and the watches are kept from one call of solve() to the
+        next, clauses can be added between them and scoped with push/pop.
+        With preprocessing, the variables eliminated from the clauses are
+        restored when they occur in an added clause or in assumptions; the
+        variables known to be used that way can be frozen beforehand.
+
+        The search restarts, keeping the assumptions, according to the
+        restart policy, which is given the LBD of the learned clauses.
+        """
+        super().__init__(clauses, heuristic, preprocess, restarts,
+                         rephase_interval)
+        self.max_learned = max_learned
+        self.max_learned_increment = max_learned_increment
+        self.core: Optional[List[int]] = None
+        self._engine: Optional[WatchedLiterals] = None
+        self._heuristic: Optional[BranchingHeuristic] = None
+        self._lbd: Dict[int, int] = {}
+        self._learned_limit = max_learned
+        self._unsatisfiable = False
+        self._last_variable = max((clauses.translation or {}).values(),
+                                  default=1)
+        # Selector of each scope, and the clauses added in it.
+        self._scopes: List[Tuple[int, List[int]]] = []
+        self._selectors: Set[int] = set()
+        self._preprocessor: Optional[Preprocessor] = None
+        self._frozen: Set[int] = set()
+
+    def _start(self) -> None:
+        """Build the propagation engine and the heuristic."""
+        # The clauses are copied out of their arena: the engine reorders
+        # their literals and appends the learned clauses.
+        clauses = list(self.clauses.clauses)
+        if self.preprocess:
+            self._preprocessor = Preprocessor(clauses, self._frozen)
+            clauses = self._preprocessor.simplify()
+            self._last_variable = max(self._last_variable,
+                                      max(self._preprocessor.variables,
+                                          default=0))
+        self._engine = WatchedLiterals(clauses)
+        trail = self._engine.trail
+        self._heuristic = self.heuristic(self._engine.clauses, trail)
+        self._last_variable = max(self._last_variable, len(trail.values) - 1)
+        if self._engine.reset() is not None:
+            self._unsatisfiable = True
+
+    def new_variable(self) -> int:
+        """Return a variable unused so far.
+
+        The variables added after a push() must be obtained here: a variable
+        first used in a clause or an assumption after it may be the selector
+        of its scope.
+        """
+        if self._engine is None:
+            self._start()
+        self._last_variable += 1
+        self._engine.trail.ensure_variable(self._last_variable)
+        self._heuristic.add_variable(self._last_variable)
+        return self._last_variable
+
+    def freeze(self, variables: Iterable[int]) -> None:
+        """Keep the variables out of the preprocessing.
+
+        Once the solving started, the variables are restored if they were
+        eliminated.
+        """
+        if self._engine is None:
+            self._frozen.update(variables)
+        else:
+            self._restore(variables)
+
+    def add_clause(self, clause: Iterable[int]) -> None:
+        """Add a clause to the formula, in the current scope.
+
+        The clause is kept until the scope is popped. Raise ValueError if
+        the clause contains the selector of a scope.
+        """
+        clause = list(clause)
+        self._check_selectors(clause)
+        self._restore(abs(literal) for literal in clause)
+        if self._scopes:
+            selector, indices = self._scopes[-1]
+            clause.append(-selector)
+            index = self._add_clause(clause)
+            if index is not None:
+                indices.append(index)
+        else:
+            self._add_clause(clause)
+
+    def _restore(self, variables: Iterable[int]) -> None:
+        """Add back the clauses of the variables eliminated by the
+        preprocessing, outside of any scope."""
+        if self._engine is None:
+            self._start()
+        if self._preprocessor is not None:
+            for clause in self._preprocessor.restore(variables):
+                self._add_clause(clause)
+
+    def _check_selectors(self, literals: List[int]) -> None:
+        """Raise ValueError if a literal is the selector of a scope."""
+        for literal in literals:
+            if abs(literal) in self._selectors:
+                raise ValueError(f"Variable {abs(literal)} is the selector "
+                                 f"of a scope, use new_variable()")
+
+    def _add_clause(self, clause: List[int]) -> Optional[int]:
+        """Add the clause at level 0 and return its index.
+
+        The literals are ordered to watch the non-false ones, and the clause
+        is propagated if it is unit. Tautologies are not added.
+        """
+        if self._engine is None:
+            self._start()
+        engine, trail = self._engine, self._engine.trail
+        clause = list(dict.fromkeys(clause))
+        self._heuristic.unassigned(trail.backtrack(0))
+        for literal in clause:
+            variable = abs(literal)
+            trail.ensure_variable(variable)
+            self._heuristic.add_variable(variable)
+            self._last_variable = max(self._last_variable, variable)
+        if any(-literal in clause for literal in clause):
+            return None
+        order = {True: 0, None: 1, False: 2}
+        clause.sort(key=lambda literal: order[trail.value(literal)])
+        index = engine.add_clause(clause)
+        if not clause or trail.value(clause[0]) is False:
+            self._unsatisfiable = True
+        elif len(clause) == 1 or trail.value(clause[1]) is False:
+            if trail.value(clause[0]) is None:
+                engine.assign(clause[0], index)
+        return index
+
+    def push(self) -> None:
+        """Open a scope: the clauses added until pop() are removed by it."""
+        selector = self.new_variable()
+        self._selectors.add(selector)
+        self._scopes.append((selector, []))
+
+    def pop(self) -> None:
+        """Remove the clauses added since the last push().
+
+        The clauses learned from them are removed as well.
+        """
+        selector, indices = self._scopes.pop()
+        engine, trail = self._engine, self._engine.trail
+        self._heuristic.unassigned(trail.backtrack(0))
+        removed = set(indices)
+        for index in self._lbd:
+            if -selector in engine.clauses[index]:
+                removed.add(index)
+        removed = {index for index in removed
+                   if trail.reasons[abs(engine.clauses[index][0])] != index
+                   or trail.value(engine.clauses[index][0]) is not True}
+        engine.remove_clauses(removed)
+        for index in removed:
+            self._lbd.pop(index, None)
+        self._add_clause([-selector])
+
+    def solve(self, assumptions: Iterable[int] = ()) -> Optional[Model]:
+        """Return the solution if the formula is solvable.
+
+        The assumptions are literals decided before any other, in order.
+        If the formula is unsatisfiable under the assumptions, the subset of
+        the assumptions responsible for it is stored in the core attribute
+        (empty if the formula is unsatisfiable on its own). Raise ValueError
+        if an assumption is the selector of a scope.
+        """
+        self.core = None
+        assumptions = list(assumptions)
+        self._check_selectors(assumptions)
+        self._restore(abs(literal) for literal in assumptions)
+        self._last_variable = max(self._last_variable,
+                                  max(map(abs, assumptions), default=0))
+        if self._unsatisfiable:
+            self.core = []
+            return None
+        selectors = [selector for selector, _ in self._scopes]
+        assumptions = selectors + assumptions
+        engine = self._engine
+        trail = engine.trail
+        heuristic = self._heuristic
+        policy = self.restarts()
+        statistics = self.statistics
+        heuristic.unassigned(trail.backtrack(0))
+        for literal in assumptions:
+            trail.ensure_variable(abs(literal))
+            heuristic.add_variable(abs(literal))
+        while True:
+            conflict = engine.propagate()
+            if conflict is not None:
+                statistics.conflicts += 1
+                if trail.decision_level == 0:
+                    self._unsatisfiable = True
+                    self.core = []
+                    return None
+                learned, level, lbd = self._analyze(conflict)
+                heuristic.decay()
+                heuristic.unassigned(trail.backtrack(level))
+                self._learn(learned, lbd)
+                policy.conflict(lbd)
+                if len(self._lbd) >= self._learned_limit:
+                    self._reduce_learned_clauses()
+            elif (trail.decision_level > len(assumptions)
+                  and policy.should_restart()):
+                self._restart(trail, heuristic, policy, len(assumptions))
+            else:
+                literal = None
+                while trail.decision_level < len(assumptions):
+                    assumption = assumptions[trail.decision_level]
+                    value = trail.value(assumption)
+                    if value is None:
+                        literal = assumption
+                        break
+                    elif value is False:
+                        self.core = [literal for literal
+                                     in self._analyze_final(assumption)
+                                     if abs(literal) not in self._selectors]
+                        return None
+                    # Already satisfied: open an empty decision level.
+                    trail.new_decision_level()
+                if literal is None:
+                    literal = heuristic.pick()
+                if literal is None:
+                    literals = [literal for literal in trail.literals
+                                if abs(literal) not in self._selectors]
+                    if self._preprocessor is not None:
+                        literals = self._preprocessor.extend(literals)
+                    return Model(literals, self.clauses)
+                statistics.decisions += 1
+                trail.new_decision_level()
+                engine.assign(literal)
+
+    def _analyze(self, conflict: int) -> Tuple[List[int], int, int]:
+        """Return the clause learned from the conflict.
+
+        The conflicting clause is resolved with the reasons of its literals
+        assigned at the current decision level, in reverse chronological
+        order, until a single one remains: the first unique implication
+        point. Also return the backjump level and the LBD of the clause.
+        """
+        clauses = self._engine.clauses
+        trail = self._engine.trail
+        levels = trail.levels
+        current_level = trail.decision_level
+        seen: Set[int] = set()
+        learned: List[int] = [0]
+        pending = 0
+        literal = 0
+        index = len(trail.literals) - 1
+        clause = clauses[conflict]
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if (other == literal or variable in seen
+                        or levels[variable] == 0):
+                    continue
+                seen.add(variable)
+                self._heuristic.bump(variable)
+                if levels[variable] >= current_level:
+                    pending += 1
+                else:
+                    learned.append(other)
+            while abs(trail.literals[index]) not in seen:
+                index -= 1
+            literal = trail.literals[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = clauses[trail.reasons[abs(literal)]]
+        learned[0] = -literal
+        learned = self._minimize(learned)
+
+        level = 0
+        if len(learned) > 1:
+            highest = max(range(1, len(learned)),
+                          key=lambda i: levels[abs(learned[i])])
+            learned[1], learned[highest] = learned[highest], learned[1]
+            level = levels[abs(learned[1])]
+        lbd = len({levels[abs(other)] for other in learned})
+        return learned, level, lbd
+
+    def _analyze_final(self, assumption: int) -> List[int]:
+        """Return the assumptions implying the negation of the assumption.
+
+        Only assumptions have been decided at this point, so the decisions
+        reached by following the reasons backward from the assumption are
+        the other assumptions of the core.
+        """
+        clauses = self._engine.clauses
+        trail = self._engine.trail
+        core = [assumption]
+        seen = {abs(assumption)}
+        for literal in reversed(trail.literals):
+            variable = abs(literal)
+            if trail.levels[variable] == 0:
+                break
+            if variable not in seen:
+                continue
+            reason = trail.reasons[variable]
+            if reason is None:
+                core.append(literal)
+            else:
+                for other in clauses[reason]:
+                    if trail.levels[abs(other)] > 0:
+                        seen.add(abs(other))
+        return core
+
+    def _minimize(self, learned: List[int]) -> List[int]:
+        """Remove the literals implied by the other literals of the clause.
+
+        A literal is redundant if every other literal of its reason clause
+        is in the learned clause (or assigned at level 0).
+        """
+        clauses = self._engine.clauses
+        trail = self._engine.trail
+        in_clause = {abs(other) for other in learned}
+        minimized = [learned[0]]
+        for other in learned[1:]:
+            reason = trail.reasons[abs(other)]
+            if reason is None or any(
+                    abs(implying) not in in_clause
+                    and trail.levels[abs(implying)] > 0
+                    for implying in clauses[reason]
+                    if implying != -other):
+                minimized.append(other)
+        return minimized
+
+    def _learn(self, learned: List[int], lbd: int) -> None:
+        """Add the learned clause and assign its asserting literal."""
+        index = self._engine.add_clause(learned)
+        if len(learned) > 1:
+            self._lbd[index] = lbd
+        self._engine.assign(learned[0], index)
+
+    def _reduce_learned_clauses(self) -> None:
+        """Delete the half of the learned clauses with the highest LBD.
+
+        Clauses with an LBD of 2 or less (glue clauses) and clauses being
+        the reason of an assigned literal are kept.
+        """
+        clauses = self._engine.clauses
+        trail = self._engine.trail
+        candidates = []
+        for index, lbd in self._lbd.items():
+            first = clauses[index][0]
+            locked = (trail.value(first)
+                      and trail.reasons[abs(first)] == index)
+            if lbd > 2 and not locked:
+                candidates.append(index)
+        candidates.sort(key=lambda index: self._lbd[index], reverse=True)
+        removed = candidates[:len(self._lbd) // 2]
+        self._engine.remove_clauses(removed)
+        for index in removed:
+            del self._lbd[index]
+        self._learned_limit += self.max_learned_increment
+
+    @property
+    def learned_clauses(self) -> List[List[int]]:
+        """Return the learned clauses currently stored."""
+        if self._engine is None:
+            return []
+        return [self._engine.clauses[index] for index in self._lbd]
+
+
+if __name__ == "__main__":
+    sat_solver = CdclSatSolver.from_file(
+        f"{pathlib.Path(__file__).parent.parent}/clauses_input.txt"
+    )
+    solution = sat_solver.solve()
+    if solution:
+        print(solution.literals)
+        print(solution)
+    else:
+        print("No solution.")
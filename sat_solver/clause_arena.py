@@ -0,0 +1,151 @@
+"""
+Compact storage of a set of clauses.
+
+The literals of every clause are stored contiguously in a single flat
+array of 32 bits integers, each clause being terminated by a 0 as in the
+DIMACS format. A clause is referenced by its index, the position of its
+first literal being kept in a second array of offsets. Compared to a list
+of lists (or sets) of Python integers, this takes an order of magnitude
+less memory and the scans over every literal run over a contiguous buffer.
+The buffers may also be read-only memoryviews of the same types, over a
+memory map or shared memory. Shared memory needs Python 3.8 or above, the
+rest of the module runs on Python 3.7.
+"""
+
+from __future__ import annotations
+from array import array
+from itertools import chain
+from typing import *
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.7
+    shared_memory = None
+
+
+class ClauseArena(Sequence[List[int]]):
+    """Sequence of clauses stored in a flat, 0-terminated array.
+
+    Indexing the arena returns a new list with the literals of the clause:
+    the arena is the storage of the formula, the solvers copy the clauses
+    they need to reorder.
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]] = ()) -> None:
+        self.literals: array = array('i')
+        self.offsets: array = array('q')
+        for clause in clauses:
+            self.append(clause)
+
+    def append(self, clause: Iterable[int]) -> int:
+        """Add the clause at the end of the arena and return its index."""
+        literals = array('i', clause)
+        if 0 in literals:
+            raise ValueError("0 is not a valid literal")
+        index = len(self.offsets)
+        self.offsets.append(len(self.literals))
+        self.literals.extend(literals)
+        self.literals.append(0)
+        return index
+
+    def size(self, index: int) -> int:
+        """Return the number of literals of the clause."""
+        return self._end(index) - self.offsets[index]
+
+    def _end(self, index: int) -> int:
+        """Return the position of the terminating 0 of the clause."""
+        if index == -1 or index == len(self.offsets) - 1:
+            return len(self.literals) - 1
+        return self.offsets[index + 1] - 1
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @overload
+    def __getitem__(self, index: int) -> List[int]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[List[int]]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self.offsets)
+        if not 0 <= index < len(self.offsets):
+            raise IndexError("clause index out of range")
+        return self.literals[self.offsets[index]:self._end(index)].tolist()
+
+    def __iter__(self) -> Iterator[List[int]]:
+        literals = self.literals
+        ends = chain(self.offsets[1:], (len(literals),))
+        for start, end in zip(self.offsets, ends):
+            yield literals[start:end - 1].tolist()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ClauseArena):
+            return (self.literals == other.literals
+                    and self.offsets == other.offsets)
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ClauseArena({list(self)})"
+
+    @property
+    def nbytes(self) -> int:
+        """Return the size in bytes of the buffers of the arena."""
+        return (len(self.literals) * self.literals.itemsize
+                + len(self.offsets) * self.offsets.itemsize)
+
+
+def to_shared_memory(arena: ClauseArena) -> shared_memory.SharedMemory:
+    """Return a new block of shared memory holding the buffers of the
+    arena, the offsets first.
+
+    The caller owns the block: it must close and unlink it. Raise
+    RuntimeError if shared memory is not available.
+    """
+    _check_shared_memory()
+    memory = shared_memory.SharedMemory(create=True,
+                                        size=max(arena.nbytes, 1))
+    offsets_size = len(arena.offsets) * arena.offsets.itemsize
+    with memoryview(arena.offsets) as offsets, \
+            memoryview(arena.literals) as literals:
+        memory.buf[:offsets_size] = offsets.cast("B")
+        memory.buf[offsets_size:arena.nbytes] = literals.cast("B")
+    return memory
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Return the existing block of shared memory of the name.
+
+    Raise RuntimeError if shared memory is not available.
+    """
+    _check_shared_memory()
+    return shared_memory.SharedMemory(name)
+
+
+def from_shared_memory(memory: shared_memory.SharedMemory, clauses: int,
+                       literals: int) -> ClauseArena:
+    """Return an arena of the number of clauses and literals (terminating
+    0s included) over the buffers of the shared memory, without copy.
+
+    The buffers are memoryviews of the block: they must be released
+    before closing it.
+    """
+    arena = ClauseArena()
+    offsets_size = clauses * arena.offsets.itemsize
+    arena.offsets = memory.buf[:offsets_size].cast("q")
+    arena.literals = memory.buf[
+        offsets_size:offsets_size + literals * arena.literals.itemsize
+    ].cast("i")
+    return arena
+
+
+def _check_shared_memory() -> None:
+    if shared_memory is None:
+        raise RuntimeError("Shared memory needs Python 3.8 or above")
@@ -4,79 +4,168 @@ or mono-literal checks.
 """
 
 from __future__ import annotations
-from itertools import chain
+import re
+from itertools import repeat
 from typing import *
 
-# from logic_formula_parser import logic_parser
+from logic_formula_parser import parser
 from logic_formula_parser.operators import *  # as op
+from sat_solver.clause_arena import ClauseArena
+
+HARD_PREFIX = "h"
 
 
 class Clauses:
-    """Class containing a set of clauses in conjunctive normal form."""
+    """Class containing a set of clauses in conjunctive normal form.
+
+    Each clause has a weight and a hard flag, used by the MaxSAT solver:
+    hard clauses must be satisfied, the total weight of the falsified soft
+    clauses is minimized. The SAT solvers consider every clause as hard.
+    Each clause also has the number of the input line it comes from, None
+    for the definitions and the modal axioms.
+    """
 
-    def __init__(self, clauses: List[Set[int]],
-                 translation: Dict[Leaf, int] = None):
+    def __init__(self, clauses: Iterable[Iterable[int]],
+                 translation: Dict[Leaf, int] = None,
+                 weights: List[int] = None, hard: List[bool] = None,
+                 lines: List[Optional[int]] = None):
         """Construct an object from clauses with propositions as integers.
         Each clause must be its own list element (they must already be split).
+
+        The clauses are stored in a compact ClauseArena, the solvers copy
+        them in their own clause database.
+        By default, every clause is soft with a weight of 1, and the clause
+        at index i comes from the line i + 1.
         """
-        self._clauses: List[Set[int]] = clauses
+        self._clauses: ClauseArena = (clauses
+                                      if isinstance(clauses, ClauseArena)
+                                      else ClauseArena(clauses))
         self._translation: Dict[Leaf, int] = translation
+        size = len(self._clauses)
+        self._weights: List[int] = (weights if weights is not None
+                                    else [1] * size)
+        self._hard: List[bool] = (hard if hard is not None
+                                  else [False] * size)
+        self._lines: List[Optional[int]] = (
+            lines if lines is not None else list(range(1, size + 1))
+        )
+        self._symbols: List[Optional[Leaf]] = []
+        self._symbols_size = -1
+
+    @classmethod
+    def from_file(cls, filename: str, chunk_size: int = 1 << 16) -> Clauses:
+        """Create an instance of this class from the clauses of the file.
+
+        The file is read by chunks of about chunk_size characters, each
+        line being converted to integers as soon as it is read.
+        """
+        with open(filename) as f:
+            return cls.from_lines(_read_lines(f, chunk_size))
 
     @classmethod
-    def from_literal_formulas(cls, formulas: List[Formula]) -> Clauses:
+    def from_lines(cls, lines: Iterable[str]) -> Clauses:
+        """Create an instance of this class from lines of clauses.
+
+        Each line may be prefixed by the weight of the clause, or by "h" if
+        the clause is hard, followed by a colon: "3: a|-b", "h: []a|c".
+        Lines without prefix are soft clauses of weight 1.
+        The modal axioms of the propositions are added as hard clauses.
+        The lines are numbered from 1, comments and blank lines included.
+        """
+        reader = ClauseReader()
+        clauses = ClauseArena()
+        weights = []
+        hard = []
+        numbers = []
+        for number, line in enumerate(lines, 1):
+            stripped_line = line.strip()
+            if not stripped_line or re.match(r'^#.*', stripped_line):
+                continue
+            weight, is_hard, stripped_line = _split_weight(stripped_line)
+            formula_clauses = reader.read(stripped_line)
+            if formula_clauses is not None:
+                _append_formula(reader, formula_clauses, weight, is_hard,
+                                number, clauses, weights, hard, numbers)
+        return cls._with_modal_axioms(reader, clauses, weights, hard,
+                                      numbers)
+
+    @classmethod
+    def from_literal_formulas(cls, formulas: Iterable[Formula],
+                              weights: Iterable[int] = None,
+                              hard: Iterable[bool] = None) -> Clauses:
         """Create an instance of this class from clauses with propositions
         as strings. They will be replaced with integers.
 
         Replace literals in the formula with an integer greater than 2 (to
         keep 0 for False and 1 for True).
         If the literal is negative, the integer takes a negative value.
+        The formulas which are not clauses are converted to clauses by
+        ClauseReader.read_formula; a soft one is represented by a single
+        soft clause.
+        The modal axioms of the propositions are added as hard clauses.
+        The formulas are numbered from 1, as lines.
+        The formulas are converted one at a time: they may be generated
+        lazily, so that they don't need to be alive at the same time.
         """
-        modal_formulas = generate_modal_axioms(formulas)
-        clauses, translation = _convert_to_int(formulas + modal_formulas)
-        return cls(clauses, translation)
+        reader = ClauseReader()
+        clauses = ClauseArena()
+        converted_weights = []
+        converted_hard = []
+        numbers = []
+        for number, (formula, weight, is_hard) in enumerate(zip(
+                formulas,
+                weights if weights is not None else repeat(1),
+                hard if hard is not None else repeat(False)), 1):
+            _append_formula(reader, reader.read_formula(formula), weight,
+                            is_hard, number, clauses, converted_weights,
+                            converted_hard, numbers)
+        return cls._with_modal_axioms(reader, clauses, converted_weights,
+                                      converted_hard, numbers)
 
-    def __copy__(self):
-        """Create a shallow copy."""
-        return Clauses(self._clauses[:], self.translation.copy())
+    @classmethod
+    def _with_modal_axioms(cls, reader: ClauseReader, clauses: ClauseArena,
+                           weights: List[int], hard: List[bool],
+                           lines: List[Optional[int]]) -> Clauses:
+        """Return the clauses read, followed by the definitions of their
+        auxiliary variables and the modal axioms."""
+        for clause in reader.definitions + reader.modal_axioms():
+            clauses.append(clause)
+            weights.append(1)
+            hard.append(True)
+            lines.append(None)
+        return cls(clauses, reader.translation, weights, hard, lines)
 
     def __eq__(self, other: Clauses):
         return self.clauses == other.clauses
 
     def __str__(self) -> str:
-        def translate(number: int) -> Leaf:
-            for leaf, value in self._translation.items():
-                if value == number:
-                    return leaf
-                elif value == -number:
-                    return Not(leaf)
-
         output = ""
         for clause in self._clauses:
-            for index, proposition in enumerate(clause):
-                if index > 0:
-                    output += '∨'
-                output += str(translate(proposition))
+            output += '∨'.join(str(self.decode(literal) or literal)
+                               for literal in clause)
             output += '\n'
-        return str(output)
-
-    def add_clause(self, clause: Set[int]) -> None:
+        return output
+
+    def symbol(self, variable: int) -> Optional[Leaf]:
+        """Return the leaf translated to the variable, None if there is
+        none (for the auxiliary variables)."""
+        symbols = self.symbols
+        return symbols[variable] if 0 <= variable < len(symbols) else None
+
+    def decode(self, literal: int) -> Optional[Formula]:
+        """Return the leaf of the literal, negated if the literal is."""
+        leaf = self.symbol(abs(literal))
+        if leaf is None or literal > 0:
+            return leaf
+        return Not(leaf)
+
+    def add_clause(self, clause: Iterable[int], weight: int = 1,
+                   hard: bool = False, line: Optional[int] = None) -> None:
         """Append the clause to the _clauses attribute."""
         self._clauses.append(clause)
-
-    def unit_propagate(self, mono_literal: int) -> None:
-        """Propagates the mono-literal in the whole formula.
-
-        Remove all the clauses containing the mono-literal, and remove the
-        negative value of the mono-literal from the clauses containing it.
-        """
-        for clause in self._clauses[:]:
-            if mono_literal in clause:
-                self._clauses.remove(clause)
-            elif -mono_literal in clause:
-                tmp = set(clause)
-                tmp.remove(-mono_literal)
-                self._clauses.remove(clause)
-                self._clauses.append(tmp)
+        self._weights.append(weight)
+        self._hard.append(hard)
+        self._lines.append(line)
 
     def find_pure_literals(self) -> Set[int]:
         """Return a set containing every pure literal in the formula.
@@ -84,32 +173,22 @@ class Clauses:
         A pure literal is a literal whose contrary doesn't exist
         in the formula.
         """
-        literals_set = set(chain.from_iterable(self._clauses))
+        literals_set = set(self._clauses.literals)
+        literals_set.discard(0)
         return {literal for literal in literals_set
                 if -literal not in literals_set}
 
-    def assign_pure_literal(self, pure_literal: int) -> None:
-        """Assign the pure literal passed as parameter.
-
-        The returned object only contains clauses without the pure literal.
-        """
-
-        def filter_function(x): return pure_literal not in x
-
-        self._clauses = list(filter(filter_function, self._clauses))
-
     def contains_only_mono_literals(self) -> bool:
         """Return True if the list contains only mono-literals."""
-        multi_literals = list(filter(
-            lambda x: not _is_mono_literal(x), self._clauses
-        ))
-        return True if not multi_literals else False
+        return all(self._clauses.size(index) == 1
+                   for index in range(len(self._clauses)))
 
     def find_mono_literals(self) -> Set[int]:
         """Return a Set containing every mono-literal."""
-        return set(chain.from_iterable(
-            filter(_is_mono_literal, self._clauses)
-        ))
+        literals = self._clauses.literals
+        return {literals[offset] for index, offset
+                in enumerate(self._clauses.offsets)
+                if self._clauses.size(index) == 1}
 
     def is_consistant_set_of_literals(self) -> bool:
         """Return True if the list contains a consistent set of literals.
@@ -117,83 +196,380 @@ class Clauses:
         A consistent set of literals is a set that doesn't contain a literal
         and its contrary.
         """
-        flat_set = self.get_distinct_propositions()
-        inconsistencies = {filter(lambda x: -x in flat_set, flat_set)}
-        return False if inconsistencies else True
+        propositions = self.get_distinct_propositions()
+        return not any(-literal in propositions for literal in propositions)
 
     def contains_empty_clause(self):
         """Return True if the list contains an empty clause."""
-        return bool(list(filter(lambda x: not x, self._clauses)))
+        literals = self._clauses.literals
+        return any(literals[offset] == 0 for offset in self._clauses.offsets)
 
     def get_distinct_propositions(self) -> Set[int]:
-        return set(filter(lambda x: not isinstance(x, Operator),
-                          chain.from_iterable(self._clauses)))
+        propositions = set(self._clauses.literals)
+        propositions.discard(0)
+        return propositions
 
     @property
-    def clauses(self):
+    def clauses(self) -> ClauseArena:
         return self._clauses
 
     @property
     def translation(self):
         return self._translation
 
+    @property
+    def symbols(self) -> List[Optional[Leaf]]:
+        """Return the reverse of the translation: the leaf of each variable,
+        indexed by the variable (None for the variables without leaf).
+
+        The table is built on first use, and again if leaves were added to
+        the translation since.
+        """
+        translation = self._translation or {}
+        if self._symbols_size != len(translation):
+            symbols: List[Optional[Leaf]] = \
+                [None] * (max(translation.values(), default=0) + 1)
+            for leaf, variable in translation.items():
+                symbols[variable] = leaf
+            self._symbols = symbols
+            self._symbols_size = len(translation)
+        return self._symbols
+
+    @property
+    def weights(self) -> List[int]:
+        return self._weights
+
+    @property
+    def hard(self) -> List[bool]:
+        return self._hard
+
+    @property
+    def lines(self) -> List[Optional[int]]:
+        return self._lines
+
+
+class ClauseReader:
+    """Reader of clauses, one per line, as integer literals.
+
+    A clause is a disjunction of literals like "-a|[]b|<>-c": each literal
+    is recognized directly from its prefixes, without building the formula
+    of the line. The lines not in this form (with conjunctions or
+    implications for instance) are parsed by the PLY parser instead, and
+    converted to clauses by read_formula.
+    Each leaf, and each auxiliary variable of the conversion, gets the next
+    integer when it is first read.
+    """
+
+    _OFFSET = 2  # Offset to avoid adding 0 and 1 to the translation table.
+
+    def __init__(self) -> None:
+        self.translation: Dict[Leaf, int] = {}
+        # Clauses defining the auxiliary variables.
+        self.definitions: List[List[int]] = []
+        self._last_variable = self._OFFSET - 1
+        self._literals: Dict[str, int] = {}
+        # Propositions in order of appearance, to generate their axioms.
+        self._propositions: Dict[Proposition, None] = {}
+        # Auxiliary variable of each subformula, and the polarities in
+        # which it is defined.
+        self._auxiliaries: Dict[Formula, int] = {}
+        self._polarities: Dict[Formula, int] = {}
+
+    def read(self, line: str) -> Optional[List[List[int]]]:
+        """Return the clauses of the formula of the line.
+
+        Return None if the line can't be parsed.
+        """
+        literals = self._literals
+        clause = []
+        for token in line.split('|'):
+            literal = literals.get(token)
+            if literal is None:
+                literal = self._read_literal(token)
+                if literal is None:
+                    return self._read_formula(line)
+            clause.append(literal)
+        return [list(dict.fromkeys(clause))]
+
+    def variable(self, leaf: Leaf) -> int:
+        """Return the integer of the leaf, assigning it if it is new."""
+        variable = self.translation.get(leaf)
+        if variable is None:
+            variable = self.new_variable()
+            self.translation[leaf] = variable
+            self._propositions[leaf if isinstance(leaf, Proposition)
+                               else leaf.right] = None
+        return variable
+
+    def new_variable(self) -> int:
+        """Return the next integer, for an auxiliary variable."""
+        self._last_variable += 1
+        return self._last_variable
+
+    def selector(self, clauses: List[List[int]]) -> List[int]:
+        """Return a unit clause implying the clauses, which are added to
+        the definitions guarded by it."""
+        selector = self.new_variable()
+        self.definitions.extend([-selector] + clause for clause in clauses)
+        return [selector]
+
+    def modal_axioms(self) -> List[List[int]]:
+        """Return the modal axioms of the propositions read, as clauses.
+
+        They are the clauses of generate_modal_axioms.
+        """
+        axioms = []
+        for proposition in list(self._propositions):
+            variable = self.variable(proposition)
+            box = self.variable(Box(proposition))
+            axioms.append([variable, -box])
+            axioms.append([-box, -self.variable(DiamondNot(proposition))])
+            axioms.append([-box, self.variable(Diamond(proposition))])
+        return axioms
+
+    def _read_literal(self, token: str) -> Optional[int]:
+        match = _LITERAL.fullmatch(token.strip())
+        if match is None:
+            return None
+        negation, modality, modal_negation, name = match.groups()
+        leaf_type = _MODALITIES.get((modality, modal_negation))
+        if leaf_type is None:
+            return None
+        leaf = _make_leaf(leaf_type, name)
+        literal = -self.variable(leaf) if negation else self.variable(leaf)
+        self._literals[token] = literal
+        return literal
+
+    def read_formula(self, formula: Formula) -> List[List[int]]:
+        """Return the clauses of the formula, in conjunctive normal form.
+
+        The formula is split into its conjuncts, and each of them into its
+        disjuncts. The disjuncts which are not literals are replaced by
+        auxiliary variables. Each auxiliary variable gets clauses in the
+        definitions. The Tseitin transformation gives both implications
+        between a variable and its subformula. Here, only the implications
+        needed by the polarity of the subformula are given, as in the
+        Plaisted-Greenbaum transformation. The size of the clauses is
+        linear in the size of the formula. A subformula met again, in this
+        formula or in another one, reuses its variable (structural
+        hashing).
+
+        Raise ValueError if a modality applies to something else than a
+        proposition: such formulas are solved by ModalSatSolver.
+        """
+        clauses = []
+        for conjunct, negated in _flatten(formula, False, And):
+            clause = []
+            for disjunct, disjunct_negated in _flatten(conjunct, negated,
+                                                       Or):
+                literal = self._literal(
+                    disjunct, _NEGATIVE if disjunct_negated else _POSITIVE
+                )
+                clause.append(-literal if disjunct_negated else literal)
+            clauses.append(list(dict.fromkeys(clause)))
+        return clauses
+
+    def _literal(self, formula: Formula, polarity: int) -> int:
+        """Return the literal of the formula, defining its auxiliary
+        variables in the polarity (_POSITIVE if the variable must imply the
+        subformula, _NEGATIVE if it must be implied by it, or both)."""
+        pending = [(formula, polarity, False)]
+        while pending:
+            node, polarity, ready = pending.pop()
+            if isinstance(node, Not):
+                pending.append((node.right, _swap(polarity), False))
+                continue
+            if _is_leaf(node):
+                continue
+            if not isinstance(node, (And, Or, Imply)):
+                raise ValueError(f"Modal operator over a formula: {node}")
+            missing = polarity & ~self._polarities.get(node, 0)
+            if not missing:
+                continue
+            # The subformula is a conjunction or a disjunction of operands.
+            operands = _flatten(node, False, type(node) if not isinstance(
+                node, Imply) else Or)
+            if not ready:
+                pending.append((node, polarity, True))
+                pending.extend(
+                    (operand, _swap(missing) if negated else missing, False)
+                    for operand, negated in operands
+                )
+                continue
+            literals = [-self._value(operand) if negated
+                        else self._value(operand)
+                        for operand, negated in operands]
+            variable = self._auxiliaries.get(node)
+            if variable is None:
+                variable = self._auxiliaries[node] = self.new_variable()
+            self._polarities[node] = self._polarities.get(node, 0) | missing
+            conjunction = isinstance(node, And)
+            if missing & _POSITIVE:
+                if conjunction:
+                    self.definitions.extend([-variable, literal]
+                                            for literal in literals)
+                else:
+                    self.definitions.append([-variable] + literals)
+            if missing & _NEGATIVE:
+                if conjunction:
+                    self.definitions.append(
+                        [variable] + [-literal for literal in literals]
+                    )
+                else:
+                    self.definitions.extend([variable, -literal]
+                                            for literal in literals)
+        return self._value(formula)
+
+    def _value(self, formula: Formula) -> int:
+        """Return the literal of the formula, already defined."""
+        sign = 1
+        while isinstance(formula, Not) and not _is_leaf(formula):
+            formula = formula.right
+            sign = -sign
+        if _is_leaf(formula):
+            return sign * self.variable(formula)
+        return sign * self._auxiliaries[formula]
+
+    def _read_formula(self, line: str) -> Optional[List[List[int]]]:
+        formula = parser.parse(line)
+        if formula is None:
+            return None
+        return self.read_formula(formula)
+
+
+_LITERAL = re.compile(r'(-?)(\[\]|<>)?(-?)(\w+)')
+_MODALITIES: Dict[Tuple[Optional[str], str], type] = {
+    (None, ''): Proposition,
+    ('[]', ''): Box,
+    ('<>', ''): Diamond,
+    ('[]', '-'): BoxNot,
+    ('<>', '-'): DiamondNot,
+}
+
+
+_PREFIXES: Dict[type, str] = {
+    leaf_type: (modality or '') + modal_negation
+    for (modality, modal_negation), leaf_type in _MODALITIES.items()
+}
+
+
+def format_leaf(leaf: Leaf) -> str:
+    """Return the leaf in the input syntax, like "[]-a"."""
+    name = leaf.literal if isinstance(leaf, Proposition) \
+        else leaf.right.literal
+    return _PREFIXES[type(leaf)] + name
+
+
+def parse_leaf(text: str) -> Leaf:
+    """Return the leaf written in the input syntax, like "[]-a"."""
+    match = _LITERAL.fullmatch(text.strip())
+    leaf_type = (_MODALITIES.get(match.group(2, 3))
+                 if match is not None and not match.group(1) else None)
+    if leaf_type is None:
+        raise ValueError(f"{text!r} is not a leaf")
+    return _make_leaf(leaf_type, match.group(4))
+
+
+def _make_leaf(leaf_type: type, name: str) -> Leaf:
+    proposition = Proposition(name)
+    return proposition if leaf_type is Proposition \
+        else leaf_type(proposition)
+
 
 def generate_modal_axioms(formulas: Collection[Formula]) -> List[Formula]:
     output: List[Formula] = []
     propositions = set()
     for formula in formulas:
-        propositions |= _get_leaves(formula)
+        for leaf in _get_leaves(formula):
+            propositions.add(leaf if isinstance(leaf, Proposition)
+                             else leaf.right)
     for f in propositions:
         # ☐f→f <=> ¬☐f∨f
         output.append(
-            Or(Proposition(f),
-               Not(Box(Proposition(f))))
+            Or(f,
+               Not(Box(f)))
         )
         # ☐f→¬◇¬f <=> ¬☐f∨¬◇¬f
         output.append(
-            Or(Not(Box(Proposition(f))),
-               Not(DiamondNot(Proposition(f))))
+            Or(Not(Box(f)),
+               Not(DiamondNot(f)))
         )
         # ☐f→◇f <=> ¬ ☐f∨◇f
         output.append(
-            Or(Not(Box(Proposition(f))),
-               Diamond(Proposition(f)))
+            Or(Not(Box(f)),
+               Diamond(f))
         )
     return output
 
 
-def _is_clausal_form(formula: List[str]) -> bool:
-    raise RuntimeError("Not yet implemented.")
-    # for element in formula:
-    #     if len(element) == 0:
-    #         raise ValueError(f"Empty clause encountered.")
-    #     if not element[0].isalpha() and element not in ["∨", "¬"]:
-    #         return False
-    # return True
+_POSITIVE = 1
+_NEGATIVE = 2
 
 
-def _convert_to_int(formulas: Collection[Formula]) \
-        -> Tuple[List[Set[int]], Dict[Leaf, int]]:
-    translation = _create_translation(formulas)
-    output = []
-    for formula in formulas:
-        # TODO: Check if the input is not in clausal form
-        # if not _is_clausal_form(formula):
-        #     raise ValueError('Formula is not in clausal form.')
-        leaves = _get_leaves(formula)
-        output.append(set(translation[leaf] for leaf in leaves))
-    return output, translation
+def _swap(polarity: int) -> int:
+    """Return the polarity of the negation of a subformula."""
+    return (polarity & _POSITIVE) << 1 | (polarity & _NEGATIVE) >> 1
 
 
-def _create_translation(clauses: Collection[Formula]) -> Dict[Leaf, int]:
-    _OFFSET = 2  # Offset to avoid adding 0 and 1 to the translation table.
-    translation: Dict[Leaf, int] = {}
-    unique_propositions = set()
-    for clause in clauses:
-        unique_propositions |= _get_leaves(clause)
-    for index, value in enumerate(unique_propositions):
-        translation[value] = index + _OFFSET
-    return translation
+def _flatten(formula: Formula, negated: bool,
+             operator: Type[Operator]) -> List[Tuple[Formula, bool]]:
+    """Return the operands of the formula, negated or not, as a chain of
+    the operator (And or Or), each with whether it is negated.
+
+    The implications are disjunctions and the negations are pushed
+    inwards, following De Morgan's laws.
+    """
+    dual = Or if operator is And else And
+    operands = []
+    pending = [(formula, negated)]
+    while pending:
+        node, negation = pending.pop()
+        if isinstance(node, Not) and not _is_leaf(node):
+            pending.append((node.right, not negation))
+        elif isinstance(node, operator if not negation else dual):
+            pending.append((node.right, negation))
+            pending.append((node.left, negation))
+        elif isinstance(node, Imply) and (operator is Or) != negation:
+            pending.append((node.right, negation))
+            pending.append((node.left, not negation))
+        else:
+            operands.append((node, negation))
+    return list(dict.fromkeys(operands))
+
+
+def _append_formula(reader: ClauseReader, formula_clauses: List[List[int]],
+                    weight: int, is_hard: bool, line: int,
+                    clauses: ClauseArena, weights: List[int],
+                    hard: List[bool], lines: List[Optional[int]]) -> None:
+    """Append the clauses of a formula with its weight, hard flag and line.
+
+    A soft formula of several clauses is replaced by a single clause, so
+    that its weight is counted once.
+    """
+    if not is_hard and len(formula_clauses) != 1:
+        formula_clauses = [reader.selector(formula_clauses)]
+    for clause in formula_clauses:
+        clauses.append(clause)
+        weights.append(weight)
+        hard.append(is_hard)
+        lines.append(line)
+
+
+def _read_lines(f: TextIO, chunk_size: int) -> Iterator[str]:
+    """Yield the lines of the file, read by chunks of lines."""
+    for chunk in iter(lambda: f.readlines(chunk_size), []):
+        yield from chunk
+
+
+def _split_weight(line: str) -> Tuple[int, bool, str]:
+    """Return the weight, the hard flag and the formula of the line."""
+    match = re.match(rf'^({HARD_PREFIX}|\d+)\s*:\s*(.*)$', line)
+    if match is None:
+        return 1, False, line
+    prefix, formula = match.groups()
+    if prefix == HARD_PREFIX:
+        return 1, True, formula
+    return int(prefix), False, formula
 
 
 def _get_propositions(formulas: Collection[Formula]) -> Set[Proposition]:
@@ -214,7 +590,7 @@ def _get_propositions(formulas: Collection[Formula]) -> Set[Proposition]:
 
 
 def _get_leaves(formula: Formula) -> Set[Leaf]:
-    if isinstance(formula, Proposition):
+    if _is_leaf(formula):
         return {formula}
     leaves: Set[Leaf] = set()
     for child in formula.children:
@@ -232,8 +608,3 @@ def _is_leaf(element: Leaf) -> bool:
                 and not isinstance(element, Not):
             return True
     return False
-
-
-def _is_mono_literal(clause: Set[int]) -> bool:
-    """Return true if the argument is a mono-literal."""
-    return len(clause) == 1
@@ -0,0 +1,279 @@
+"""
+Cube-and-conquer: parallel DPLL over independent parts of the search space.
+
+A lookahead cuber splits the formula into cubes, partial assignments
+covering every assignment together, by deciding at each node the variable
+whose two values propagate the most (the product of the numbers of
+literals they imply). A value whose propagation conflicts is a failed
+literal: its opposite is added to the cube instead. The cubes are then
+solved by DPLL solvers in a pool of processes, with the cube as
+assumptions, each mapping the clauses from shared memory.
+
+The cubes wait in a stack shared by the workers. A cube that is not solved
+after a number of conflicts is handed back and split further by the
+cuber, its parts being pushed on top of the stack: the work of a hard
+cube is redistributed to the idle workers. The first satisfiable cube
+stops the search; the formula is unsatisfiable when every cube is.
+"""
+
+from __future__ import annotations
+import math
+import multiprocessing
+import queue
+from multiprocessing import util
+from typing import *
+
+from sat_solver.clause_arena import attach_shared_memory
+from sat_solver.clause_arena import from_shared_memory, to_shared_memory
+from sat_solver.clauses import Clauses
+from sat_solver.dpll_solver import DpllSatSolver
+from sat_solver.heuristics import Evsids
+from sat_solver.model import Model
+from sat_solver.propagation import WatchedLiterals
+from sat_solver.solver import HeuristicFactory, RestartPolicyFactory
+from sat_solver.solver import SatSolver
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+
+class Cuber:
+    """Lookahead splitting of clauses into cubes."""
+
+    def __init__(self, clauses: List[List[int]], candidates: int = 20) \
+            -> None:
+        """Construct a cuber of the clauses.
+
+        At each node, the lookahead is done on the candidates unassigned
+        variables of most occurrences.
+        """
+        self.candidates = candidates
+        self._engine = WatchedLiterals([list(clause) for clause in clauses])
+        self._unsatisfiable = self._engine.reset() is not None
+        occurrences: Dict[int, int] = {}
+        for clause in clauses:
+            for literal in clause:
+                occurrences[abs(literal)] = \
+                    occurrences.get(abs(literal), 0) + 1
+        self._variables: List[int] = sorted(
+            occurrences, key=lambda variable: -occurrences[variable]
+        )
+
+    def split(self, cube: Sequence[int], depth: int) -> List[List[int]]:
+        """Return the cubes splitting the cube up to depth decisions below
+        it.
+
+        The cubes refuted by propagation are left out: an empty list means
+        that the clauses are unsatisfiable under the cube.
+        """
+        engine, trail = self._engine, self._engine.trail
+        if self._unsatisfiable:
+            return []
+        trail.backtrack(0)
+        if engine.propagate() is not None:
+            self._unsatisfiable = True
+            return []
+        trail.new_decision_level()
+        for literal in cube:
+            trail.ensure_variable(abs(literal))
+            value = engine.value(literal)
+            if value is False:
+                return []
+            elif value is None:
+                engine.assign(literal)
+        try:
+            return self._split(list(cube), depth)
+        finally:
+            trail.backtrack(0)
+
+    def _split(self, cube: List[int], depth: int) -> List[List[int]]:
+        engine, trail = self._engine, self._engine.trail
+        if engine.propagate() is not None:
+            return []
+        if depth == 0:
+            return [cube]
+        variable = self._lookahead(cube)
+        if variable is None:
+            return []
+        if variable == 0:
+            # Every candidate is assigned: the cube is a leaf.
+            return [cube]
+        cubes = []
+        level = trail.decision_level
+        for literal in (variable, -variable):
+            trail.new_decision_level()
+            engine.assign(literal)
+            cubes.extend(self._split(cube + [literal], depth - 1))
+            trail.backtrack(level)
+        return cubes
+
+    def _lookahead(self, cube: List[int]) -> Optional[int]:
+        """Return the variable to split on, 0 if there is none left, None
+        if the node is refuted.
+
+        The opposites of the failed literals found are assigned and added
+        to the cube.
+        """
+        engine, trail = self._engine, self._engine.trail
+        while True:
+            best, best_score = 0, -1
+            candidates = [variable for variable in self._variables
+                          if trail.values[variable] == 0][:self.candidates]
+            for variable in candidates:
+                if engine.value(variable) is not None:
+                    continue
+                counts = []
+                for literal in (variable, -variable):
+                    count = self._probe(literal)
+                    if count is None:
+                        engine.assign(-literal)
+                        cube.append(-literal)
+                        if engine.propagate() is not None:
+                            return None
+                        break
+                    counts.append(count)
+                else:
+                    score = (counts[0] * counts[1] * 1024
+                             + counts[0] + counts[1])
+                    if score > best_score:
+                        best, best_score = variable, score
+            # The best variable may have been implied by a failed literal
+            # found after it.
+            if not best or engine.value(best) is None:
+                return best
+
+    def _probe(self, literal: int) -> Optional[int]:
+        """Return the number of literals implied by the literal, None if
+        it fails."""
+        engine, trail = self._engine, self._engine.trail
+        level = trail.decision_level
+        size = len(trail)
+        trail.new_decision_level()
+        engine.assign(literal)
+        conflict = engine.propagate()
+        count = len(trail) - size
+        trail.backtrack(level)
+        return None if conflict is not None else count
+
+
+class CubeAndConquerSolver(SatSolver):
+    """Solve the cubes of a lookahead cuber with parallel DPLL solvers."""
+
+    def __init__(self, clauses: Clauses,
+                 heuristic: Union[str, HeuristicFactory] = Evsids,
+                 preprocess: bool = False, workers: Optional[int] = None,
+                 depth: Optional[int] = None,
+                 conflict_limit: int = 1000,
+                 restarts: Union[str, RestartPolicyFactory] = "none") \
+            -> None:
+        """Construct a solver of the clauses.
+
+        The cubes are solved by DpllSatSolver with the heuristic, the
+        preprocessing and the restart policy given, in workers processes
+        (one per CPU by default).
+        The formula is first split at the given depth (by default, about 4
+        cubes per worker). A cube not solved after conflict_limit conflicts
+        is split one level further; with a limit of 0, the cubes are solved
+        without limit.
+        """
+        super().__init__(clauses, heuristic, preprocess, restarts)
+        self.workers: int = workers or multiprocessing.cpu_count()
+        self.depth: int = (depth if depth is not None
+                           else math.ceil(math.log2(4 * self.workers)))
+        self.conflict_limit = conflict_limit
+        self.cubes_solved = 0
+
+    def solve(self) -> Optional[Model]:
+        """Return the solution if the formula is solvable.
+
+        The workers still solving cubes when one of them finds a model are
+        terminated. An exception raised by a worker is raised again here.
+        """
+        cuber = Cuber(self.clauses.clauses)
+        # Stack of the cubes to solve, the most recently split on top.
+        cubes = cuber.split([], self.depth)
+        self.cubes_solved = 0
+        if not cubes:
+            return None
+        arena = self.clauses.clauses
+        memory = to_shared_memory(arena)
+        # The results, or the exceptions, of the cubes, in order of
+        # completion.
+        results: queue.Queue = queue.Queue()
+        running = 0
+        pool = multiprocessing.Pool(
+            self.workers, initializer=_attach,
+            initargs=(memory.name, len(arena.offsets), len(arena.literals),
+                      self.heuristic, self.preprocess, self.restarts)
+        )
+        try:
+            while cubes or running:
+                # Only as many cubes as workers are submitted, so that the
+                # parts of a split cube are picked first.
+                while cubes and running < self.workers:
+                    pool.apply_async(_conquer,
+                                     (cubes.pop(),
+                                      self.conflict_limit or None),
+                                     callback=results.put,
+                                     error_callback=results.put)
+                    running += 1
+                result = results.get()
+                running -= 1
+                if isinstance(result, BaseException):
+                    raise result
+                cube, interrupted, literals = result
+                if interrupted:
+                    cubes.extend(reversed(cuber.split(cube, 1)))
+                    continue
+                self.cubes_solved += 1
+                if literals is not None:
+                    return Model(literals, self.clauses)
+            # The workers exit normally, detaching from the shared memory.
+            pool.close()
+            pool.join()
+            return None
+        finally:
+            # Stop the cubes still running.
+            pool.terminate()
+            memory.close()
+            memory.unlink()
+
+
+# Solver of the worker, over the clauses mapped by _attach.
+_solver: Optional[DpllSatSolver] = None
+_memory: Optional[SharedMemory] = None
+
+
+def _attach(name: str, clauses: int, literals: int,
+            heuristic: HeuristicFactory, preprocess: bool,
+            restarts: RestartPolicyFactory) -> None:
+    """Map the clauses of the shared memory in the worker.
+
+    The mapping is closed by _detach when the worker exits normally.
+    """
+    global _solver, _memory
+    _memory = attach_shared_memory(name)
+    _solver = DpllSatSolver(
+        Clauses(from_shared_memory(_memory, clauses, literals)),
+        heuristic, preprocess, restarts
+    )
+    util.Finalize(None, _detach, exitpriority=0)
+
+
+def _detach() -> None:
+    """Release the clauses of the worker and close the shared memory."""
+    global _solver, _memory
+    arena = _solver.clauses.clauses
+    arena.offsets.release()
+    arena.literals.release()
+    _memory.close()
+    _solver = _memory = None
+
+
+def _conquer(cube: List[int], conflict_limit: Optional[int]) \
+        -> Tuple[List[int], bool, Optional[List[int]]]:
+    """Return the cube, whether its search was interrupted, and the
+    literals of the model found, None if there is none."""
+    model = _solver.solve(cube, conflict_limit)
+    return (cube, _solver.interrupted,
+            model.literals if model is not None else None)
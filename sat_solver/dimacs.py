@@ -0,0 +1,163 @@
+"""
+Reading and writing of clauses in the DIMACS formats.
+
+- ".cnf": a header "p cnf <variables> <clauses>" followed by the clauses,
+  each one a list of non-zero integers terminated by 0.
+- ".wcnf": the MaxSAT format. With a header "p wcnf <variables> <clauses>
+  <top>", each clause starts with its weight, the clauses of weight top
+  being hard. Without a header (the format of the MaxSAT evaluations since
+  2022), hard clauses start with "h" and soft ones with their weight.
+
+Lines starting with "c" are comments. DIMACS variables start at 1, while
+the variables of Clauses start at 2: variable v is written as v - 1.
+The translation of the variables to propositions is written to a sidecar
+file, one "<DIMACS variable> <leaf>" per line, the leaf being in the
+input syntax ("a", "[]a", "<>-a"...). It is read back if present;
+otherwise each DIMACS variable n is translated to the proposition "n".
+"""
+
+from __future__ import annotations
+import mmap
+import os
+from typing import *
+
+from logic_formula_parser.operators import *
+from sat_solver.clause_arena import ClauseArena
+from sat_solver.clauses import Clauses, format_leaf, parse_leaf
+
+TRANSLATION_SUFFIX = ".translation"
+
+
+def translation_filename(filename: str) -> str:
+    """Return the name of the sidecar file of the translation."""
+    return filename + TRANSLATION_SUFFIX
+
+
+def read_dimacs(filename: str) -> Clauses:
+    """Return the clauses of a .cnf or .wcnf file.
+
+    The file is memory-mapped and read line by line. The clauses of a .cnf
+    file are soft, of weight 1. The line of each clause is the line of its
+    first token, counted from 1, comments included.
+    """
+    clauses = ClauseArena()
+    weights: List[int] = []
+    hard: List[bool] = []
+    lines: List[Optional[int]] = []
+    variables = 0
+    # Without a header, the file is in the new .wcnf format.
+    weighted = True
+    top: Optional[int] = None
+    clause: List[int] = []
+    weight: Optional[int] = None
+    is_hard = False
+    start: Optional[int] = None
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return Clauses(clauses, _read_translation(filename, variables))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for number, line in enumerate(iter(data.readline, b""), 1):
+                if line[:1] == b"c":
+                    continue
+                if line[:1] == b"%":
+                    # End of the formula in the SATLIB benchmarks.
+                    break
+                tokens = line.split()
+                if not tokens:
+                    continue
+                if tokens[0] == b"p":
+                    weighted = tokens[1] == b"wcnf"
+                    variables = int(tokens[2])
+                    if weighted and len(tokens) > 4:
+                        top = int(tokens[4])
+                    continue
+                for token in tokens:
+                    if start is None:
+                        start = number
+                    if weighted and weight is None:
+                        if token == b"h":
+                            weight, is_hard = 1, True
+                        else:
+                            weight = int(token)
+                            is_hard = top is not None and weight >= top
+                        continue
+                    literal = int(token)
+                    if literal:
+                        clause.append(literal + 1 if literal > 0
+                                      else literal - 1)
+                        variables = max(variables, abs(literal))
+                        continue
+                    clauses.append(clause)
+                    weights.append(weight if weighted else 1)
+                    hard.append(is_hard)
+                    lines.append(start)
+                    clause = []
+                    start = None
+                    weight = None
+                    is_hard = False
+    return Clauses(clauses, _read_translation(filename, variables),
+                   weights, hard, lines)
+
+
+def write_dimacs(clauses: Clauses, filename: str,
+                 weighted: Optional[bool] = None,
+                 new_style: bool = False) -> None:
+    """Write the clauses to a .cnf or .wcnf file, and their translation
+    to its sidecar file.
+
+    By default the .wcnf format is used if some clause is hard or has a
+    weight other than 1. The .wcnf format is the one with a header and a
+    top weight, unless new_style is set.
+    """
+    if weighted is None:
+        weighted = (any(clauses.hard)
+                    or any(weight != 1 for weight in clauses.weights))
+    translation = clauses.translation or {}
+    variables = max(max(map(abs, clauses.clauses.literals), default=1),
+                    max(translation.values(), default=1)) - 1
+    top = sum(weight for weight, hard
+              in zip(clauses.weights, clauses.hard) if not hard) + 1
+    with open(filename, "w") as f:
+        if not weighted:
+            f.write(f"p cnf {variables} {len(clauses.clauses)}\n")
+        elif not new_style:
+            f.write(f"p wcnf {variables} {len(clauses.clauses)} {top}\n")
+        for clause, weight, hard in zip(clauses.clauses, clauses.weights,
+                                        clauses.hard):
+            literals = " ".join(str(literal - 1 if literal > 0
+                                    else literal + 1) for literal in clause)
+            if weighted:
+                if hard:
+                    prefix = "h " if new_style else f"{top} "
+                else:
+                    prefix = f"{weight} "
+            else:
+                prefix = ""
+            f.write(f"{prefix}{literals} 0\n" if literals
+                    else f"{prefix}0\n")
+    if translation:
+        _write_translation(translation, filename)
+
+
+def _write_translation(translation: Dict[Leaf, int], filename: str) -> None:
+    with open(translation_filename(filename), "w") as f:
+        for leaf, variable in sorted(translation.items(),
+                                     key=lambda item: item[1]):
+            f.write(f"{variable - 1} {format_leaf(leaf)}\n")
+
+
+def _read_translation(filename: str, variables: int) -> Dict[Leaf, int]:
+    """Return the translation of the sidecar file, or a translation of each
+    variable to the proposition of its number."""
+    sidecar = translation_filename(filename)
+    if not os.path.exists(sidecar):
+        return {Proposition(str(variable)): variable + 1
+                for variable in range(1, variables + 1)}
+    translation: Dict[Leaf, int] = {}
+    with open(sidecar) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            variable, leaf = line.split(maxsplit=1)
+            translation[parse_leaf(leaf)] = int(variable) + 1
+    return translation
@@ -3,85 +3,135 @@ SAT Solver reading clauses from file. It expects the clauses in conjunctive
 normal form.
 Based upon the DPLL algorithm.
 """
-import re
-from copy import copy, deepcopy
 import pathlib
-import random
-from itertools import chain
 from typing import *
 
-from logic_formula_parser import parser
 from sat_solver.clauses import Clauses
+from sat_solver.heuristics import BranchingHeuristic, Evsids
+from sat_solver.model import Model
+from sat_solver.preprocessing import Preprocessor
+from sat_solver.propagation import WatchedLiterals
+from sat_solver.solver import HeuristicFactory, RestartPolicyFactory
+from sat_solver.solver import SatSolver
 
 
-class DpllSatSolver:
+class DpllSatSolver(SatSolver):
     """SAT Solver using the DPLL algorithm."""
 
-    def __init__(self, clauses: Clauses) -> None:
-        self.clauses = clauses
+    def __init__(self, clauses: Clauses,
+                 heuristic: Union[str, HeuristicFactory] = Evsids,
+                 preprocess: bool = False,
+                 restarts: Union[str, RestartPolicyFactory] = "none",
+                 rephase_interval: int = 8) -> None:
+        super().__init__(clauses, heuristic, preprocess, restarts,
+                         rephase_interval)
+        self.interrupted = False
 
-    @classmethod
-    def from_file(cls, filename: str):
-        """Create solver with the clauses from the file."""
-        clauses = []
-        with open(filename) as f:
-            for line in f:
-                stripped_line = line.strip()
-                if stripped_line is None or re.match(r'^#.*', stripped_line):
-                    continue
-                parsed_line = parser.parse(stripped_line)
-                if parsed_line is not None:
-                    clauses.append(parsed_line)
-        return cls(Clauses.from_literal_formulas(clauses))
+    def solve(self, assumptions: Iterable[int] = (),
+              conflict_limit: Optional[int] = None) -> Optional[Model]:
+        """Return the solution if the formula is solvable.
 
-    def solve(self) -> Optional[Clauses]:
-        """Return the solution if the formula is solvable."""
-        return self._davis_putnam_algorithm(deepcopy(self.clauses))
-
-    def _davis_putnam_algorithm(self, clauses: Clauses,
-                                backtrack: Optional[Set[int]] = None) \
-            -> Optional[Clauses]:
-        """Return True if the clauses are solvable.
-
-        Uses the DPLL algorithm to solve the formula under clausal form.
+        The clauses are copied out of their arena into the database of
+        the propagation engine, the search state only lives in the
+        assignment trail. The assumptions are literals set before the
+        search: None is returned if the formula is unsatisfiable under
+        them. The search gives up after conflict_limit conflicts, if set,
+        returning None with the interrupted attribute set.
         """
-        # TODO: Make recursion a terminal recursion (no context to remember).
-        #       It will give marginally but consistently better performance.
-        if backtrack is None:
-            backtrack = set()
-
-        if clauses.is_consistant_set_of_literals():
-            return clauses
-        if clauses.contains_empty_clause():
+        assumptions = list(assumptions)
+        self.interrupted = False
+        clauses = list(self.clauses.clauses)
+        preprocessor = None
+        if self.preprocess:
+            # The pure literals are eliminated by the preprocessing.
+            preprocessor = Preprocessor(
+                clauses, frozen=[abs(literal) for literal in assumptions]
+            )
+            clauses = preprocessor.simplify()
+        engine = WatchedLiterals(clauses)
+        if engine.reset() is not None:
             return None
+        for literal in assumptions:
+            engine.trail.ensure_variable(abs(literal))
+            value = engine.value(literal)
+            if value is False:
+                return None
+            elif value is None:
+                engine.assign(literal)
+        if preprocessor is None:
+            for pure_literal in self.clauses.find_pure_literals():
+                if engine.value(pure_literal) is None:
+                    engine.assign(pure_literal)
+        heuristic = self.heuristic(engine.clauses, engine.trail)
+        model = self._davis_putnam_algorithm(engine, heuristic,
+                                             conflict_limit)
+        if model is None or preprocessor is None:
+            return model
+        return Model(preprocessor.extend(model.literals), self.clauses)
 
-        while True:
-            mono_literals: Set[int] = clauses.find_mono_literals()
-            if not mono_literals:
-                break
-            for mono_literal in mono_literals:
-                backtrack.add(mono_literal)
-                clauses.unit_propagate(mono_literal)
+    def _davis_putnam_algorithm(self, engine: WatchedLiterals,
+                                heuristic: BranchingHeuristic,
+                                conflict_limit: Optional[int] = None) \
+            -> Optional[Model]:
+        """Return the solution if the clauses are solvable.
 
-        while True:
-            pure_literals = clauses.find_pure_literals()
-            if not pure_literals:
-                break
-            for pure_literal in pure_literals:
-                backtrack.add(pure_literal)
-                clauses.assign_pure_literal(pure_literal)
+        Uses the DPLL algorithm to solve the formula under clausal form.
+        The search is driven by a loop over an explicit stack of decisions,
+        one per decision level, so its depth is only limited by the number
+        of variables. On conflict, the trail is backtracked to the deepest
+        decision whose opposite has not been tried yet, which is then
+        flipped.
 
-        propositions = list(chain.from_iterable(clauses.clauses))
-        if not propositions and backtrack:
-            return Clauses([{proposition} for proposition in backtrack],
-                           clauses.translation)
-        next_literal = random.choice(propositions)
-        positive = copy(clauses)
-        positive.add_clause({next_literal})
-        negative = copy(clauses)
-        negative.add_clause({-next_literal})
-        return (self._davis_putnam_algorithm(positive, backtrack)
-                or self._davis_putnam_algorithm(negative, backtrack))
+        The search restarts according to the restart policy, which is given
+        the LBD of the conflicting clauses. Without learned clauses, the
+        decisions tried are lost on restart, hence no restarts by default:
+        they pay off against the unlucky decisions of randomized
+        heuristics. To stay complete, the search only restarts once there
+        have been more conflicts since the last restart than restarts.
+        """
+        trail = engine.trail
+        policy = self.restarts()
+        statistics = self.statistics
+        # Each decision is stored with whether it is already a flipped one.
+        decisions: List[Tuple[int, bool]] = []
+        conflicts = 0
+        restarts = 0
+        while True:
+            conflict = engine.propagate()
+            if (conflict is None and decisions
+                    and policy.conflicts > restarts
+                    and policy.should_restart()):
+                decisions = []
+                restarts += 1
+                self._restart(trail, heuristic, policy)
+                continue
+            if conflict is None:
+                literal = heuristic.pick()
+                if literal is None:
+                    return Model(trail.literals, self.clauses)
+                statistics.decisions += 1
+                flipped = False
+            else:
+                for other in engine.clauses[conflict]:
+                    heuristic.bump(abs(other))
+                heuristic.decay()
+                while decisions and decisions[-1][1]:
+                    decisions.pop()
+                if not decisions:
+                    return None
+                conflicts += 1
+                statistics.conflicts += 1
+                if conflict_limit is not None and conflicts > conflict_limit:
+                    self.interrupted = True
+                    return None
+                policy.conflict(len({trail.levels[abs(other)] for other
+                                     in engine.clauses[conflict]}))
+                literal = -decisions.pop()[0]
+                flipped = True
+                heuristic.unassigned(trail.backtrack(len(decisions)))
+            decisions.append((literal, flipped))
+            trail.new_decision_level()
+            trail.assign(literal)
 
 
 if __name__ == "__main__":
@@ -90,7 +140,7 @@ if __name__ == "__main__":
     )
     solution = sat_solver.solve()
     if solution:
-        print(solution.clauses)
+        print(solution.literals)
         print(solution)
     else:
         print("No solution.")
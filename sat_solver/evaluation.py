@@ -0,0 +1,128 @@
+"""
+Batched evaluation of clauses against candidate assignments.
+
+The assignments of a batch are bit-sliced: the values of a variable in
+every assignment are packed in the bits of a single Python integer, bit k
+holding its value in the k-th assignment. A clause is then evaluated
+against the whole batch with one bitwise OR per literal, and the weights
+of the falsified clauses are summed with a bit-sliced counter, one integer
+per bit of the sums. Big integer operations run over machine words, so a
+batch of n assignments costs about n / 64 word operations per literal.
+"""
+
+from __future__ import annotations
+from typing import *
+
+from sat_solver.clause_arena import ClauseArena
+
+_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+class ClauseEvaluator:
+    """Evaluate weighted clauses against batches of assignments.
+
+    An assignment is given as the collection of its true literals: the
+    variables whose positive literal is absent are False.
+    """
+
+    def __init__(self, clauses: Iterable[Iterable[int]],
+                 weights: Optional[Sequence[int]] = None) -> None:
+        """Construct an evaluator of the clauses.
+
+        By default every clause has a weight of 1.
+        """
+        self._arena: ClauseArena = (clauses
+                                    if isinstance(clauses, ClauseArena)
+                                    else ClauseArena(clauses))
+        self._weights: List[int] = (list(weights) if weights is not None
+                                    else [1] * len(self._arena))
+        variables = set(map(abs, self._arena.literals))
+        variables.discard(0)
+        self._variables: List[int] = sorted(variables)
+
+    def satisfied_masks(self, assignments: Sequence[Collection[int]]) \
+            -> List[int]:
+        """Return, for each clause, the mask of the assignments satisfying
+        it: bit k is set if the k-th assignment satisfies the clause."""
+        full = (1 << len(assignments)) - 1
+        values = self._pack(assignments)
+        masks = []
+        for clause in self._arena:
+            mask = 0
+            for literal in clause:
+                mask |= values[literal]
+            masks.append(mask & full)
+        return masks
+
+    def count_satisfied(self, assignments: Sequence[Collection[int]]) \
+            -> List[int]:
+        """Return the number of clauses satisfied by each assignment."""
+        masks = self.satisfied_masks(assignments)
+        return self._sum(((mask, 1) for mask in masks), len(assignments))
+
+    def falsified_weight(self, assignments: Sequence[Collection[int]]) \
+            -> List[int]:
+        """Return the total weight of the clauses falsified by each
+        assignment."""
+        full = (1 << len(assignments)) - 1
+        masks = self.satisfied_masks(assignments)
+        return self._sum(((full ^ mask, weight) for mask, weight
+                          in zip(masks, self._weights)), len(assignments))
+
+    def falsified(self, assignment: Collection[int]) -> List[int]:
+        """Return the indices of the clauses falsified by the assignment."""
+        return [index for index, mask
+                in enumerate(self.satisfied_masks([assignment])) if not mask]
+
+    def _pack(self, assignments: Sequence[Collection[int]]) \
+            -> Dict[int, int]:
+        """Return the bit-sliced value of every literal of the clauses."""
+        size = len(assignments)
+        full = (1 << size) - 1
+        rows = {variable: bytearray(size) for variable in self._variables}
+        for k, assignment in enumerate(assignments):
+            for literal in assignment:
+                row = rows.get(literal)
+                if row is not None:
+                    row[k] = 1
+        values: Dict[int, int] = {}
+        for variable, row in rows.items():
+            # Bit k of the integer is the value in the k-th assignment.
+            mask = int(row.translate(_BITS)[::-1] or b"0", 2)
+            values[variable] = mask
+            values[-variable] = full ^ mask
+        return values
+
+    @staticmethod
+    def _sum(masks: Iterable[Tuple[int, int]], size: int) -> List[int]:
+        """Return, for each bit position, the sum of the weights of the
+        masks having this bit set.
+
+        The sums are accumulated in binary, planes[i] holding bit i of
+        every sum, by adding each mask to the planes of the bits of its
+        weight with a ripple carry.
+        """
+        planes: List[int] = []
+        for mask, weight in masks:
+            position = 0
+            while weight and mask:
+                if weight & 1:
+                    carry = mask
+                    plane = position
+                    while carry:
+                        while plane >= len(planes):
+                            planes.append(0)
+                        planes[plane], carry = (planes[plane] ^ carry,
+                                                planes[plane] & carry)
+                        plane += 1
+                weight >>= 1
+                position += 1
+        sums = [0] * size
+        for position, plane in enumerate(planes):
+            bits = format(plane, f"0{size}b")[::-1]
+            increment = 1 << position
+            k = bits.find("1")
+            while k != -1:
+                sums[k] += increment
+                k = bits.find("1", k + 1)
+        return sums
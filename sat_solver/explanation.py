@@ -0,0 +1,200 @@
+"""
+Explanations of unsatisfiable inputs, by input line.
+
+When the clauses of an input are unsatisfiable, the lines in conflict are
+given by a minimal unsatisfiable subset (MUS): unsatisfiable lines, every
+one of which is needed for the unsatisfiability. Dually, a minimal
+correction set (MCS) is a set of lines whose removal makes the input
+satisfiable, none of which can be kept.
+
+Each line gets a selector variable, added negated to each of its clauses:
+assuming the selector enables the line. All the questions are then asked to
+a single incremental CDCL solver, under assumptions, so that the clauses it
+learns are reused from one call to the next. The definitions of the
+auxiliary variables and the modal axioms, without line, are always kept.
+"""
+
+from __future__ import annotations
+import pathlib
+from typing import *
+
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.clause_arena import ClauseArena
+from sat_solver.clauses import Clauses
+from sat_solver.heuristics import Evsids
+from sat_solver.model import Model
+from sat_solver.solver import HeuristicFactory
+
+MUS_ALGORITHMS = ("deletion", "quickxplain")
+
+
+class Explainer:
+    """Minimal unsatisfiable subsets and minimal correction sets of the
+    lines of an input."""
+
+    def __init__(self, clauses: Clauses, keep_hard: bool = False,
+                 heuristic: Union[str, HeuristicFactory] = Evsids) -> None:
+        """Construct an explainer of the clauses.
+
+        The lines are the ones recorded in clauses.lines. If keep_hard is
+        set, the hard lines are always kept, as in the MaxSAT problem, and
+        only the soft lines are explained.
+        """
+        self.clauses = clauses
+        # Number of calls to the SAT solver.
+        self.calls = 0
+        arena = clauses.clauses
+        lines = clauses.lines
+        last_variable = max(max(map(abs, arena.literals), default=0),
+                            max((clauses.translation or {}).values(),
+                                default=1))
+        self._selectors: Dict[int, int] = {}
+        self._groups: Dict[int, List[List[int]]] = {}
+        relaxed = ClauseArena()
+        for index, clause in enumerate(arena):
+            line = lines[index]
+            if line is None or (keep_hard and clauses.hard[index]):
+                relaxed.append(clause)
+                continue
+            selector = self._selectors.get(line)
+            if selector is None:
+                last_variable += 1
+                selector = self._selectors[line] = last_variable
+                self._groups[line] = []
+            self._groups[line].append(clause)
+            relaxed.append(clause + [-selector])
+        self._lines: Dict[int, int] = {selector: line for line, selector
+                                       in self._selectors.items()}
+        self._solver = CdclSatSolver(Clauses(relaxed, clauses.translation),
+                                     heuristic)
+
+    @classmethod
+    def from_file(cls, filename: str, *args, **kwargs) -> Explainer:
+        """Create an explainer of the clauses of the file.
+
+        Additional arguments are passed to the constructor.
+        """
+        return cls(Clauses.from_file(filename), *args, **kwargs)
+
+    def minimal_unsatisfiable_subset(self, algorithm: str = "deletion") \
+            -> Optional[List[int]]:
+        """Return the sorted lines of a minimal unsatisfiable subset.
+
+        The algorithm is one of MUS_ALGORITHMS: "deletion" removes the lines
+        one at a time, keeping the ones whose removal makes the rest
+        satisfiable, "quickxplain" splits the lines in halves recursively.
+        Both start from the lines of the unsatisfiable core of the whole
+        input. Return None if the input is satisfiable, an empty list if the
+        lines always kept are unsatisfiable on their own.
+        """
+        if algorithm not in MUS_ALGORITHMS:
+            raise ValueError(f"MUS algorithm {algorithm} unknown")
+        core = self._core(sorted(self._selectors))
+        if core is None:
+            return None
+        if not core:
+            return []
+        if algorithm == "deletion":
+            subset = self._deletion(core)
+        else:
+            subset = self._quick_xplain([], False, core)
+        return sorted(subset)
+
+    def minimal_correction_sets(self) -> Iterator[List[int]]:
+        """Yield the sorted lines of each minimal correction set.
+
+        The satisfiable lines of a model are grown into a maximal
+        satisfiable subset, whose complement is a minimal correction set.
+        Each correction set found is blocked by a clause requiring one of
+        its lines, in a scope of the solver popped at the end. A
+        satisfiable input has the empty correction set only.
+        """
+        solver = self._solver
+        solver.push()
+        try:
+            while True:
+                model = self._solve([])
+                if model is None:
+                    return
+                satisfied = self._satisfied(model)
+                for line in sorted(self._groups):
+                    if line in satisfied:
+                        continue
+                    model = self._solve(sorted(satisfied) + [line])
+                    if model is not None:
+                        satisfied |= self._satisfied(model)
+                correction = sorted(set(self._groups) - satisfied)
+                yield correction
+                solver.add_clause(self._selectors[line]
+                                  for line in correction)
+        finally:
+            solver.pop()
+
+    def _solve(self, lines: List[int]) -> Optional[Model]:
+        """Return a model of the lines, None if they are unsatisfiable."""
+        self.calls += 1
+        return self._solver.solve(self._selectors[line] for line in lines)
+
+    def _core(self, lines: List[int]) -> Optional[List[int]]:
+        """Return the lines of an unsatisfiable core of the lines, None if
+        they are satisfiable."""
+        if self._solve(lines) is not None:
+            return None
+        return [self._lines[selector] for selector in self._solver.core]
+
+    def _satisfied(self, model: Model) -> Set[int]:
+        """Return the lines whose clauses are satisfied by the model."""
+        value = model.value
+        return {line for line, group in self._groups.items()
+                if all(any(value(literal) for literal in clause)
+                       for clause in group)}
+
+    def _deletion(self, lines: List[int]) -> List[int]:
+        """Return a MUS of the unsatisfiable lines, by deletion.
+
+        When the lines left without the removed one are unsatisfiable,
+        only the lines of their core are kept (clause set refinement).
+        """
+        necessary: List[int] = []
+        candidates = sorted(lines)
+        while candidates:
+            line = candidates.pop()
+            core = self._core(necessary + candidates)
+            if core is None:
+                necessary.append(line)
+            else:
+                core = set(core)
+                candidates = [other for other in candidates
+                              if other in core]
+        return necessary
+
+    def _quick_xplain(self, background: List[int], changed: bool,
+                      lines: List[int]) -> List[int]:
+        """Return the lines of a MUS of the background and the lines, which
+        must be unsatisfiable together, left out of the background.
+
+        Changed is set if the background was extended since it was last
+        checked. The recursion depth is logarithmic in the number of lines.
+        """
+        if changed and self._solve(background) is None:
+            return []
+        if len(lines) == 1:
+            return lines
+        half = len(lines) // 2
+        first, second = lines[:half], lines[half:]
+        second = self._quick_xplain(background + first, True, second)
+        first = self._quick_xplain(background + second, bool(second), first)
+        return first + second
+
+
+if __name__ == "__main__":
+    explainer = Explainer.from_file(
+        f"{pathlib.Path(__file__).parent.parent}/clauses_input.txt"
+    )
+    subset = explainer.minimal_unsatisfiable_subset()
+    if subset is None:
+        print("Satisfiable.")
+    else:
+        print(f"Minimal unsatisfiable subset of the lines: {subset}")
+        for correction in explainer.minimal_correction_sets():
+            print(f"Minimal correction set of the lines: {correction}")
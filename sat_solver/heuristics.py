@@ -0,0 +1,363 @@
+"""
+Branching heuristics choosing the next decision literal of the solvers.
+
+The solvers notify the heuristic of the variables involved in conflicts
+(bump/decay) and of the literals unassigned by backtracking, which are
+remembered as the saved phase of their variable. The phases of the largest
+assignment reached are remembered as well, and the solvers can reset the
+saved phases to them, or to other values, on restart (rephasing).
+"""
+
+from __future__ import annotations
+import random
+from collections import Counter
+from itertools import chain
+from typing import *
+
+from sat_solver.trail import Trail, UNASSIGNED
+
+
+class BranchingHeuristic:
+    """Interface of the branching heuristics.
+
+    Every heuristic saves the phase of the unassigned variables: a variable
+    is decided with the polarity it had when it was last unassigned
+    (negative if it was never assigned).
+    """
+
+    def __init__(self, clauses: List[List[int]], trail: Trail) -> None:
+        self._clauses = clauses
+        self._trail = trail
+        self._phases: Dict[int, bool] = {}
+        # Phases of the largest assignment unassigned by a backtrack.
+        self._best_phases: Dict[int, bool] = {}
+        self._best_size = 0
+        self._variables: List[int] = sorted({
+            abs(literal) for clause in clauses for literal in clause
+        })
+        self._known: Set[int] = set(self._variables)
+
+    def add_variable(self, variable: int) -> bool:
+        """Make the heuristic aware of a variable created after it.
+
+        Return False if the variable was already known.
+        """
+        if variable in self._known:
+            return False
+        self._known.add(variable)
+        self._variables.append(variable)
+        return True
+
+    def pick(self) -> Optional[int]:
+        """Return the next literal to decide, None if all are assigned."""
+        raise NotImplementedError
+
+    def bump(self, variable: int) -> None:
+        """Notify that the variable takes part in the current conflict."""
+        pass
+
+    def decay(self) -> None:
+        """Notify that the analysis of the current conflict is over."""
+        pass
+
+    def unassigned(self, literals: Iterable[int]) -> None:
+        """Notify that the literals have been unassigned by a backtrack."""
+        literals = list(literals)
+        for literal in literals:
+            self._phases[abs(literal)] = literal > 0
+        if literals and len(self._trail) + len(literals) > self._best_size:
+            self._best_size = len(self._trail) + len(literals)
+            self._best_phases = {abs(literal): literal > 0 for literal
+                                 in chain(self._trail.literals, literals)}
+
+    def rephase(self, mode: str) -> None:
+        """Reset the saved phases.
+
+        The mode is one of REPHASE_MODES: "best" for the phases of the
+        largest assignment reached since the last rephasing, "original"
+        for the negative phase of every variable, "inverted" for the
+        positive one, "flip" to flip every saved phase.
+        """
+        if mode == "best":
+            self._phases.update(self._best_phases)
+            self._best_size = 0
+        elif mode == "original":
+            self._phases.clear()
+        elif mode == "inverted":
+            self._phases = dict.fromkeys(self._variables, True)
+        elif mode == "flip":
+            self._phases = {variable: not self._phases.get(variable, False)
+                            for variable in self._variables}
+        else:
+            raise ValueError(f"Rephasing mode {mode} unknown")
+
+    def phase(self, variable: int) -> int:
+        """Return the saved phase of the variable as a literal."""
+        return variable if self._phases.get(variable, False) else -variable
+
+    def _first_unassigned(self) -> Optional[int]:
+        """Return the saved phase of the first unassigned variable.
+
+        Used when every clause is satisfied but some variables are not
+        assigned yet.
+        """
+        values = self._trail.values
+        for variable in self._variables:
+            if values[variable] == UNASSIGNED:
+                return self.phase(variable)
+        return None
+
+    def _unsatisfied_clauses(self) -> Iterator[List[int]]:
+        """Yield the unassigned literals of each unsatisfied clause."""
+        values = self._trail.values
+        for clause in self._clauses:
+            unassigned = []
+            for literal in clause:
+                value = values[literal] if literal > 0 else -values[-literal]
+                if value > 0:
+                    break
+                elif value == UNASSIGNED:
+                    unassigned.append(literal)
+            else:
+                if unassigned:
+                    yield unassigned
+
+
+class RandomHeuristic(BranchingHeuristic):
+    """Decide a random unassigned variable with a random polarity."""
+
+    def __init__(self, clauses: List[List[int]], trail: Trail,
+                 seed: Optional[int] = None) -> None:
+        super().__init__(clauses, trail)
+        self._random = random.Random(seed)
+
+    def pick(self) -> Optional[int]:
+        values = self._trail.values
+        # Sampling is cheap while few variables are assigned, the scan is
+        # only needed near the leaves of the search tree.
+        for _ in range(8):
+            if not self._variables:
+                break
+            variable = self._random.choice(self._variables)
+            if values[variable] == UNASSIGNED:
+                return variable * self._random.choice((1, -1))
+        unassigned = [variable for variable in self._variables
+                      if values[variable] == UNASSIGNED]
+        if not unassigned:
+            return None
+        return self._random.choice(unassigned) * self._random.choice((1, -1))
+
+
+class Dlis(BranchingHeuristic):
+    """Dynamic Largest Individual Sum.
+
+    Decide the literal occurring in the largest number of unsatisfied
+    clauses.
+    """
+
+    def pick(self) -> Optional[int]:
+        occurrences = Counter()
+        for clause in self._unsatisfied_clauses():
+            occurrences.update(clause)
+        if not occurrences:
+            return self._first_unassigned()
+        return occurrences.most_common(1)[0][0]
+
+
+class Moms(BranchingHeuristic):
+    """Maximum Occurrences in clauses of Minimum Size.
+
+    Decide the variable occurring the most in the shortest unsatisfied
+    clauses, with the polarity occurring the most in them.
+    """
+
+    def pick(self) -> Optional[int]:
+        shortest: List[List[int]] = []
+        for clause in self._unsatisfied_clauses():
+            if not shortest or len(clause) < len(shortest[0]):
+                shortest = [clause]
+            elif len(clause) == len(shortest[0]):
+                shortest.append(clause)
+        if not shortest:
+            return self._first_unassigned()
+        occurrences = Counter()
+        for clause in shortest:
+            occurrences.update(clause)
+        variable = max(
+            {abs(literal) for literal in occurrences},
+            key=lambda x: occurrences[x] + occurrences[-x]
+        )
+        if occurrences[variable] >= occurrences[-variable]:
+            return variable
+        return -variable
+
+
+class Vsids(BranchingHeuristic):
+    """Variable State Independent Decaying Sum.
+
+    Each variable has an activity, increased every time it takes part in a
+    conflict. The activities are halved every decay_interval conflicts so
+    that recent conflicts weigh more. The unassigned variable of highest
+    activity is decided with its saved phase; the variables are kept in a
+    binary heap ordered by activity.
+    """
+
+    _RESCALE_LIMIT = 1e100
+
+    def __init__(self, clauses: List[List[int]], trail: Trail,
+                 decay_interval: int = 256) -> None:
+        super().__init__(clauses, trail)
+        self.decay_interval = decay_interval
+        self._increment = 1.0
+        self._conflicts = 0
+        self._activity: List[float] = [0.0] * (max(self._variables,
+                                                   default=0) + 1)
+        self._heap = ActivityHeap(self._activity)
+        for variable in self._variables:
+            self._heap.push(variable)
+
+    def add_variable(self, variable: int) -> bool:
+        if not super().add_variable(variable):
+            return False
+        if variable >= len(self._activity):
+            self._activity.extend([0.0] * (variable + 1
+                                           - len(self._activity)))
+        self._heap.push(variable)
+        return True
+
+    def pick(self) -> Optional[int]:
+        values = self._trail.values
+        while self._heap:
+            variable = self._heap.pop()
+            if values[variable] == UNASSIGNED:
+                return self.phase(variable)
+        return None
+
+    def bump(self, variable: int) -> None:
+        self._activity[variable] += self._increment
+        if self._activity[variable] > self._RESCALE_LIMIT:
+            self._rescale()
+        self._heap.increased(variable)
+
+    def decay(self) -> None:
+        self._conflicts += 1
+        if self._conflicts % self.decay_interval == 0:
+            for variable in self._variables:
+                self._activity[variable] /= 2
+
+    def unassigned(self, literals: Iterable[int]) -> None:
+        literals = list(literals)
+        super().unassigned(literals)
+        for literal in literals:
+            if abs(literal) not in self._heap:
+                self._heap.push(abs(literal))
+
+    def _rescale(self) -> None:
+        """Scale down every activity, keeping their order."""
+        for variable in self._variables:
+            self._activity[variable] /= self._RESCALE_LIMIT
+        self._increment /= self._RESCALE_LIMIT
+
+
+class Evsids(Vsids):
+    """Exponential VSIDS, as in MiniSat.
+
+    Instead of decaying every activity, the bump increment is divided by
+    the decay factor after each conflict, which amounts to an exponential
+    decay of the past bumps.
+    """
+
+    def __init__(self, clauses: List[List[int]], trail: Trail,
+                 decay_factor: float = 0.95) -> None:
+        super().__init__(clauses, trail)
+        self.decay_factor = decay_factor
+
+    def decay(self) -> None:
+        self._increment /= self.decay_factor
+        if self._increment > self._RESCALE_LIMIT:
+            self._rescale()
+
+
+class ActivityHeap:
+    """Binary max-heap of variables ordered by their activity.
+
+    The position of each variable in the heap is indexed, so that the
+    activity of a variable can be increased in O(log n).
+    """
+
+    def __init__(self, activity: List[float]) -> None:
+        self._activity = activity
+        self._heap: List[int] = []
+        self._positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, variable: int) -> bool:
+        return variable in self._positions
+
+    def push(self, variable: int) -> None:
+        """Insert the variable, it must not be in the heap already."""
+        self._positions[variable] = len(self._heap)
+        self._heap.append(variable)
+        self._sift_up(len(self._heap) - 1)
+
+    def pop(self) -> int:
+        """Remove and return the variable of highest activity."""
+        top = self._heap[0]
+        last = self._heap.pop()
+        del self._positions[top]
+        if self._heap:
+            self._heap[0] = last
+            self._positions[last] = 0
+            self._sift_down(0)
+        return top
+
+    def increased(self, variable: int) -> None:
+        """Restore the heap order after the activity was increased."""
+        position = self._positions.get(variable)
+        if position is not None:
+            self._sift_up(position)
+
+    def _sift_up(self, position: int) -> None:
+        heap, activity = self._heap, self._activity
+        variable = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if activity[heap[parent]] >= activity[variable]:
+                break
+            heap[position] = heap[parent]
+            self._positions[heap[position]] = position
+            position = parent
+        heap[position] = variable
+        self._positions[variable] = position
+
+    def _sift_down(self, position: int) -> None:
+        heap, activity = self._heap, self._activity
+        variable = heap[position]
+        size = len(heap)
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if (child + 1 < size
+                    and activity[heap[child + 1]] > activity[heap[child]]):
+                child += 1
+            if activity[heap[child]] <= activity[variable]:
+                break
+            heap[position] = heap[child]
+            self._positions[heap[position]] = position
+            position = child
+        heap[position] = variable
+        self._positions[variable] = position
+
+
+REPHASE_MODES = ("best", "original", "best", "inverted", "best", "flip")
+
+HEURISTICS: Dict[str, Type[BranchingHeuristic]] = {
+    "random": RandomHeuristic,
+    "dlis": Dlis,
+    "moms": Moms,
+    "vsids": Vsids,
+    "evsids": Evsids,
+}
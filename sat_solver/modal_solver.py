@@ -0,0 +1,422 @@
+"""
+Satisfiability of modal formulas in the logics K, KD, KT and S4.
+
+Outside of this module, the modal atoms like ☐a are propositional
+variables, only bound by the axioms of generate_modal_axioms. Here, the
+formulas are decided exactly, by building a Kripke model world by world:
+- The formulas a world must satisfy (its label) are put in negation
+  normal form and abstracted to clauses, their modal subformulas ☐φ and ◇ψ
+  being variables, and solved by a CDCL solver.
+- Each model of the abstraction sets some ☐φ and ◇ψ true: every ◇ψ needs a
+  successor world satisfying ψ and every φ (in S4, every ☐φ as well). In
+  KD, a world without ◇ψ still needs a successor. If a successor is
+  unsatisfiable, the model is excluded by a clause and the solver looks
+  for another one, incrementally.
+- In KT and S4, ☐φ → φ is added to the abstraction of every world.
+
+The worlds are expanded from an explicit stack of generators, so that the
+modal depth of the formulas is not limited by the recursion limit. The
+result of each label is memoized: a label met again, in another branch or
+another model, is not searched twice. In S4, the labels do not get smaller
+along a branch: a label contained in the label of a world of its branch,
+still being expanded, is satisfied by looping back to that world. The
+results depending on such a loop are not memoized, since that world may
+turn out unsatisfiable.
+"""
+
+from __future__ import annotations
+import math
+from typing import *
+
+from logic_formula_parser import parser
+from logic_formula_parser.operators import *
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.clauses import Clauses
+
+LOGICS = ("K", "KD", "KT", "S4")
+
+Label = FrozenSet[Formula]
+
+
+class KripkeModel:
+    """Worlds with the propositions true in each of them, and the
+    accessibility relation between them.
+
+    The formulas solved are satisfied in world 0.
+    """
+
+    def __init__(self, valuations: List[Set[Proposition]],
+                 successors: List[Set[int]]) -> None:
+        self.valuations = valuations
+        self.successors = successors
+
+    def satisfies(self, formula: Formula, world: int = 0) -> bool:
+        """Return True if the formula is true in the world."""
+        if isinstance(formula, Proposition):
+            return formula in self.valuations[world]
+        if isinstance(formula, Not):
+            return not self.satisfies(formula.right, world)
+        if isinstance(formula, And):
+            return (self.satisfies(formula.left, world)
+                    and self.satisfies(formula.right, world))
+        if isinstance(formula, Or):
+            return (self.satisfies(formula.left, world)
+                    or self.satisfies(formula.right, world))
+        if isinstance(formula, Imply):
+            return (not self.satisfies(formula.left, world)
+                    or self.satisfies(formula.right, world))
+        successors = self.successors[world]
+        if isinstance(formula, Box):
+            return all(self.satisfies(formula.right, other)
+                       for other in successors)
+        if isinstance(formula, BoxNot):
+            return not any(self.satisfies(formula.right, other)
+                           for other in successors)
+        if isinstance(formula, Diamond):
+            return any(self.satisfies(formula.right, other)
+                       for other in successors)
+        if isinstance(formula, DiamondNot):
+            return not all(self.satisfies(formula.right, other)
+                           for other in successors)
+        raise TypeError(f"{formula} is not a formula")
+
+    def __repr__(self) -> str:
+        return f"KripkeModel({self.valuations}, {self.successors})"
+
+
+class ModalSatSolver:
+    """Decide the satisfiability of modal formulas by world expansion."""
+
+    def __init__(self, formulas: Iterable[Formula], logic: str = "K") \
+            -> None:
+        """Construct a solver of the conjunction of the formulas in the
+        logic, one of LOGICS."""
+        if logic not in LOGICS:
+            raise ValueError(f"Logic {logic} unknown")
+        self.formulas: List[Formula] = list(formulas)
+        self.logic = logic
+        # Number of worlds searched, and of labels found memoized.
+        self.worlds = 0
+        self.cache_hits = 0
+        self._nnf: Dict[Tuple[Formula, bool], Formula] = {}
+        # Satisfied world of each label, None if it is unsatisfiable.
+        self._cache: Dict[Label, Optional[_World]] = {}
+
+    @classmethod
+    def from_file(cls, filename: str, logic: str = "K") -> ModalSatSolver:
+        """Create a solver of the formulas of the file, one per line."""
+        formulas = []
+        with open(filename) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                formula = parser.parse(line)
+                if formula is None:
+                    raise ValueError(f"Invalid formula {line!r}")
+                formulas.append(formula)
+        return cls(formulas, logic)
+
+    def solve(self) -> Optional[KripkeModel]:
+        """Return a model of the formulas, None if they are unsatisfiable.
+
+        In KT and S4, the accessibility relation of the model is reflexive,
+        and transitive as well in S4. In KD, every world has a successor.
+        """
+        label = frozenset(self._negation_normal_form(formula)
+                          for formula in self.formulas)
+        world = self._search(label)
+        return self._kripke_model(world) if world is not None else None
+
+    def _search(self, root: Label) -> Optional[_World]:
+        """Return the world satisfying the label, None if there is none."""
+        # Worlds being expanded, each with the lowest index in the stack
+        # of the worlds it loops back to.
+        stack: List[Tuple[Label, _World, Generator, List[float]]] = []
+        result: Optional[_World] = None
+        request: Optional[Label] = root
+        while True:
+            if request is not None:
+                result = self._lookup(request, stack)
+                if result is _PENDING:
+                    world = _World()
+                    stack.append((request, world,
+                                  self._expand(request, world), [math.inf]))
+                    self.worlds += 1
+                    result = None
+            if not stack:
+                return result
+            label, world, expansion, lowest = stack[-1]
+            try:
+                request = expansion.send(result)
+                continue
+            except StopIteration as stop:
+                satisfied = stop.value
+            stack.pop()
+            request = None
+            result = world if satisfied else None
+            if not satisfied or lowest[0] >= len(stack):
+                self._cache[label] = result
+            elif stack:
+                parent = stack[-1][3]
+                parent[0] = min(parent[0], lowest[0])
+
+    def _lookup(self, label: Label, stack: List[Tuple]) \
+            -> Union[None, _World, object]:
+        """Return the memoized world of the label, or _PENDING if it has to
+        be searched."""
+        if label in self._cache:
+            self.cache_hits += 1
+            return self._cache[label]
+        if self.logic == "S4":
+            for index, (other, world, _, _) in enumerate(stack):
+                if label <= other:
+                    lowest = stack[-1][3]
+                    lowest[0] = min(lowest[0], index)
+                    return world
+        return _PENDING
+
+    def _expand(self, label: Label, world: _World) \
+            -> Generator[Label, Optional[_World], bool]:
+        """Search a model of the label, the world of each successor
+        needed being sent back for its label yielded (None if it is
+        unsatisfiable), and return True if there is one.
+
+        The valuation and the successors of the model are set in the
+        world.
+        """
+        abstraction = _Abstraction(self.logic in ("KT", "S4"))
+        for formula in label:
+            abstraction.add_clause([abstraction.literal(formula)])
+        while True:
+            model = abstraction.solver.solve()
+            if model is None:
+                return False
+            boxes = [(formula, variable) for formula, variable
+                     in abstraction.boxes.items() if model.value(variable)]
+            diamonds = [(formula, variable) for formula, variable
+                        in abstraction.diamonds.items()
+                        if model.value(variable)]
+            inherited = [formula for formula, _ in boxes]
+            if self.logic == "S4":
+                inherited += [Box(formula) for formula, _ in boxes]
+            requests = [(frozenset([formula, *inherited]), [-variable])
+                        for formula, variable in diamonds]
+            world.successors = []
+            if self.logic == "KD" and not diamonds:
+                if inherited:
+                    requests.append((frozenset(inherited), []))
+                else:
+                    # Nothing is required of the successor: the world
+                    # itself is one.
+                    world.successors.append(world)
+            for request, conflict in requests:
+                successor = yield request
+                if successor is None:
+                    abstraction.add_clause(
+                        conflict + [-variable for _, variable in boxes]
+                    )
+                    break
+                world.successors.append(successor)
+            else:
+                world.valuation = {
+                    proposition for proposition, variable
+                    in abstraction.propositions.items()
+                    if model.value(variable)
+                }
+                return True
+
+    def _kripke_model(self, root: _World) -> KripkeModel:
+        """Return the model made of the worlds reachable from the root."""
+        indices: Dict[int, int] = {id(root): 0}
+        worlds = [root]
+        for world in worlds:
+            for successor in world.successors:
+                if id(successor) not in indices:
+                    indices[id(successor)] = len(worlds)
+                    worlds.append(successor)
+        successors = [{indices[id(successor)]
+                       for successor in world.successors}
+                      for world in worlds]
+        if self.logic in ("KT", "S4"):
+            for index, reachable in enumerate(successors):
+                reachable.add(index)
+        if self.logic == "S4":
+            successors = [_reachable(successors, index)
+                          for index in range(len(worlds))]
+        return KripkeModel([world.valuation for world in worlds],
+                           successors)
+
+    def _negation_normal_form(self, formula: Formula,
+                              negated: bool = False) -> Formula:
+        """Return the formula, negated if asked, where the negations only
+        apply to propositions, over And, Or, Box and Diamond."""
+        results = self._nnf
+        pending = [(formula, negated, False)]
+        while pending:
+            node, negation, ready = pending.pop()
+            if (node, negation) in results:
+                continue
+            rewriting = _rewrite(node, negation)
+            if isinstance(rewriting, tuple):
+                operator, operands = rewriting
+                missing = [operand for operand in operands
+                           if operand not in results]
+                if not ready and missing:
+                    pending.append((node, negation, True))
+                    pending.extend((operand, operand_negation, False)
+                                   for operand, operand_negation in missing)
+                    continue
+                results[node, negation] = operator(
+                    *(results[operand] for operand in operands)
+                )
+            else:
+                results[node, negation] = rewriting
+        return results[formula, negated]
+
+
+class _World:
+    """World of a model being built."""
+    __slots__ = ("valuation", "successors")
+
+    def __init__(self) -> None:
+        self.valuation: Set[Proposition] = set()
+        self.successors: List[_World] = []
+
+
+_PENDING = object()
+
+
+class _Abstraction:
+    """Clauses of formulas in negation normal form, over the propositions
+    and the modal subformulas, in an incremental CDCL solver.
+
+    Each conjunction and disjunction is named by a variable implying it
+    (the encoding of Plaisted and Greenbaum, enough for formulas without
+    negated subformulas), once per subformula.
+    """
+
+    def __init__(self, reflexive: bool) -> None:
+        """Construct an abstraction, adding ☐φ → φ for every ☐φ if the
+        accessibility relation is reflexive."""
+        self.reflexive = reflexive
+        self.solver = CdclSatSolver(Clauses([], {}))
+        self.propositions: Dict[Proposition, int] = {}
+        # Variable of each ☐φ and ◇ψ, by φ and ψ.
+        self.boxes: Dict[Formula, int] = {}
+        self.diamonds: Dict[Formula, int] = {}
+        self._literals: Dict[Formula, int] = {}
+        # ☐φ met, with their variable, to add ☐φ → φ for.
+        self._reflexive: List[Tuple[int, Formula]] = []
+
+    def add_clause(self, clause: List[int]) -> None:
+        self.solver.add_clause(clause)
+
+    def literal(self, formula: Formula) -> int:
+        """Return the literal of the formula, adding the clauses defining
+        it the first time."""
+        literal = self._encode(formula)
+        while self._reflexive:
+            variable, body = self._reflexive.pop()
+            self.add_clause([-variable, self._encode(body)])
+        return literal
+
+    def _encode(self, formula: Formula) -> int:
+        literals = self._literals
+        pending = [(formula, False)]
+        while pending:
+            node, ready = pending.pop()
+            if node in literals:
+                continue
+            if isinstance(node, (And, Or)):
+                operands = _operands(node)
+                if not ready:
+                    pending.append((node, True))
+                    pending.extend((operand, False) for operand in operands
+                                   if operand not in literals)
+                    continue
+                variable = self.solver.new_variable()
+                literals[node] = variable
+                if isinstance(node, And):
+                    for operand in operands:
+                        self.add_clause([-variable, literals[operand]])
+                else:
+                    self.add_clause([-variable] + [literals[operand]
+                                                   for operand in operands])
+            elif isinstance(node, Not):
+                literals[node] = -self._variable(self.propositions,
+                                                 node.right)
+            elif isinstance(node, Proposition):
+                literals[node] = self._variable(self.propositions, node)
+            elif isinstance(node, Box):
+                literals[node] = self._variable(self.boxes, node.right)
+                if self.reflexive:
+                    self._reflexive.append((literals[node], node.right))
+            else:
+                literals[node] = self._variable(self.diamonds, node.right)
+        return literals[formula]
+
+    def _variable(self, variables: Dict[Formula, int], key: Formula) -> int:
+        variable = variables.get(key)
+        if variable is None:
+            variable = variables[key] = self.solver.new_variable()
+        return variable
+
+
+def _operands(formula: Formula) -> List[Formula]:
+    """Return the operands of the chain of conjunctions or disjunctions."""
+    operands = []
+    pending = [formula]
+    while pending:
+        node = pending.pop()
+        if type(node) is type(formula):
+            pending.append(node.right)
+            pending.append(node.left)
+        else:
+            operands.append(node)
+    return list(dict.fromkeys(operands))
+
+
+def _rewrite(formula: Formula, negated: bool) \
+        -> Union[Formula, Tuple[Callable, List[Tuple[Formula, bool]]]]:
+    """Return the negation normal form of the formula if it is a literal,
+    otherwise the operator building it from the normal forms of the
+    operands returned with it, each to be negated or not."""
+    if isinstance(formula, Proposition):
+        return Not(formula) if negated else formula
+    if isinstance(formula, Not):
+        return _identity, [(formula.right, not negated)]
+    if isinstance(formula, And):
+        return (Or if negated else And), [(formula.left, negated),
+                                          (formula.right, negated)]
+    if isinstance(formula, Or):
+        return (And if negated else Or), [(formula.left, negated),
+                                          (formula.right, negated)]
+    if isinstance(formula, Imply):
+        return (And if negated else Or), [(formula.left, not negated),
+                                          (formula.right, negated)]
+    # ☐¬φ is ☐φ' and ◇¬φ is ◇φ' with φ' = ¬φ.
+    if isinstance(formula, (Box, Diamond)):
+        body_negated = negated
+    elif isinstance(formula, (BoxNot, DiamondNot)):
+        body_negated = not negated
+    else:
+        raise TypeError(f"{formula} is not a formula")
+    universal = isinstance(formula, (Box, BoxNot)) != negated
+    return (Box if universal else Diamond), [(formula.right, body_negated)]
+
+
+def _identity(formula: Formula) -> Formula:
+    return formula
+
+
+def _reachable(successors: List[Set[int]], start: int) -> Set[int]:
+    """Return the worlds reachable from the start."""
+    reachable = set(successors[start])
+    pending = list(reachable)
+    while pending:
+        for other in successors[pending.pop()]:
+            if other not in reachable:
+                reachable.add(other)
+                pending.append(other)
+    return reachable
@@ -0,0 +1,79 @@
+"""
+Assignment of the variables found by the solvers.
+"""
+
+from __future__ import annotations
+from typing import *
+
+from logic_formula_parser.operators import *
+from sat_solver.clauses import Clauses
+
+
+class Model:
+    """Truth values of the variables of a set of clauses.
+
+    The model is read either by variable, with value(), or by leaf of the
+    input (a proposition or a modal atom like Box(Proposition("a"))), with
+    model[leaf]. The variables are decoded back to their leaves with the
+    symbol table of the clauses, in time linear in the size of the model.
+    """
+
+    def __init__(self, literals: Iterable[int],
+                 clauses: Optional[Clauses] = None) -> None:
+        """Construct the model where the literals are true.
+
+        The clauses give the translation of the leaves to the variables.
+        """
+        self.literals: List[int] = list(literals)
+        self._values: Dict[int, bool] = {abs(literal): literal > 0
+                                         for literal in self.literals}
+        self._clauses = clauses
+
+    def value(self, literal: int) -> Optional[bool]:
+        """Return the value of the literal, None if it is unassigned."""
+        value = self._values.get(abs(literal))
+        if value is None:
+            return None
+        return value if literal > 0 else not value
+
+    def __getitem__(self, leaf: Leaf) -> bool:
+        """Return the value of the leaf.
+
+        Raise KeyError if the leaf is not a variable of the clauses or if
+        it is unassigned.
+        """
+        translation = (self._clauses.translation
+                       if self._clauses is not None else None) or {}
+        value = self.value(translation[leaf])
+        if value is None:
+            raise KeyError(leaf)
+        return value
+
+    def items(self) -> Iterator[Tuple[Leaf, bool]]:
+        """Return the leaves of the assigned variables with their value.
+
+        The auxiliary variables, without leaf, are left out.
+        """
+        for literal in self.literals:
+            leaf = (self._clauses.symbol(abs(literal))
+                    if self._clauses is not None else None)
+            if leaf is not None:
+                yield leaf, literal > 0
+
+    def true_leaves(self) -> Set[Leaf]:
+        """Return the leaves which are true."""
+        return {leaf for leaf, value in self.items() if value}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Model):
+            return NotImplemented
+        return self._values == other._values
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Model({self.literals})"
+
+    def __str__(self) -> str:
+        return "".join(f"{leaf if value else Not(leaf)}\n"
+                       for leaf, value in self.items())
@@ -0,0 +1,190 @@
+"""
+Portfolio of SAT solvers run in parallel, one per process.
+
+The solvers differ by their configuration (algorithm, branching heuristic,
+restart policy, seed, preprocessing) and search the same clauses: the
+buffers of the clause arena are copied once to shared memory, which every
+worker maps read-only. The first solver to find a model or to prove the
+formula unsatisfiable gives the result, and the other workers are
+terminated. Since the run time of a given configuration varies a lot
+between formulas, running several of them cuts the tail of the solving
+times.
+"""
+
+from __future__ import annotations
+import functools
+import multiprocessing
+import random
+from multiprocessing.connection import Connection, wait
+from typing import *
+
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.clause_arena import attach_shared_memory
+from sat_solver.clause_arena import from_shared_memory, to_shared_memory
+from sat_solver.clauses import Clauses
+from sat_solver.dpll_solver import DpllSatSolver
+from sat_solver.heuristics import HEURISTICS, RandomHeuristic
+from sat_solver.model import Model
+from sat_solver.restarts import RESTART_POLICIES
+from sat_solver.solver import SatSolver
+
+SOLVERS: Dict[str, Type[SatSolver]] = {
+    "cdcl": CdclSatSolver,
+    "dpll": DpllSatSolver,
+}
+
+
+class Configuration(NamedTuple):
+    """Settings of a solver of the portfolio.
+
+    The seed, if any, seeds the random heuristic and shuffles the order of
+    the clauses given to the solver, which changes the watched literals
+    and breaks the ties of the other heuristics differently.
+    """
+    solver: str = "cdcl"
+    heuristic: str = "evsids"
+    seed: Optional[int] = None
+    preprocess: bool = False
+    restarts: str = "luby"
+
+
+_CONFIGURATIONS = [
+    Configuration("cdcl", "evsids"),
+    Configuration("cdcl", "evsids", preprocess=True, restarts="glucose"),
+    Configuration("cdcl", "vsids", restarts="geometric"),
+    Configuration("dpll", "moms", restarts="none"),
+    Configuration("cdcl", "random", restarts="glucose"),
+    Configuration("dpll", "random", restarts="luby"),
+]
+
+
+def default_configurations(size: int) -> List[Configuration]:
+    """Return size different configurations.
+
+    Beyond the base configurations, they are repeated with seeds.
+    """
+    return [_CONFIGURATIONS[index % len(_CONFIGURATIONS)]._replace(
+                seed=index if index >= len(_CONFIGURATIONS) else None)
+            for index in range(size)]
+
+
+class PortfolioSolver(SatSolver):
+    """Run several SAT solvers in parallel and return the first result."""
+
+    def __init__(self, clauses: Clauses,
+                 configurations: Optional[Sequence[Configuration]] = None) \
+            -> None:
+        """Construct a portfolio solving the clauses.
+
+        Each configuration runs in its own process; by default, there is
+        one per CPU.
+        """
+        super().__init__(clauses)
+        self.configurations: List[Configuration] = (
+            list(configurations) if configurations is not None
+            else default_configurations(multiprocessing.cpu_count())
+        )
+        if not self.configurations:
+            raise ValueError("The portfolio needs a configuration")
+        for configuration in self.configurations:
+            if configuration.solver not in SOLVERS:
+                raise ValueError(f"Solver {configuration.solver} unknown")
+            if configuration.heuristic not in HEURISTICS:
+                raise ValueError(
+                    f"Heuristic {configuration.heuristic} unknown"
+                )
+            if configuration.restarts not in RESTART_POLICIES:
+                raise ValueError(
+                    f"Restart policy {configuration.restarts} unknown"
+                )
+        self.winner: Optional[Configuration] = None
+
+    def solve(self) -> Optional[Model]:
+        """Return the solution if the formula is solvable.
+
+        The configuration of the solver which answered first is stored in
+        the winner attribute. An exception raised by a solver is raised
+        again here.
+        """
+        arena = self.clauses.clauses
+        memory = to_shared_memory(arena)
+        # Each worker answers through its own pipe: terminating the others
+        # cannot leave a lock shared with them held.
+        workers: Dict[Connection,
+                      Tuple[Configuration, multiprocessing.Process]] = {}
+        self.winner = None
+        try:
+            for configuration in self.configurations:
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(
+                    target=_solve,
+                    args=(memory.name, len(arena.offsets),
+                          len(arena.literals), configuration, sender),
+                    daemon=True
+                )
+                process.start()
+                sender.close()
+                workers[receiver] = (configuration, process)
+            while workers:
+                receiver = wait(list(workers))[0]
+                configuration, process = workers.pop(receiver)
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    # The process died without answering.
+                    continue
+                finally:
+                    receiver.close()
+                    process.join()
+                if isinstance(result, BaseException):
+                    raise result
+                self.winner = configuration
+                return Model(result, self.clauses) \
+                    if result is not None else None
+            raise RuntimeError("Every solver of the portfolio died")
+        finally:
+            # Cancel the other solvers.
+            for receiver, (_, process) in workers.items():
+                process.terminate()
+            for receiver, (_, process) in workers.items():
+                process.join()
+                receiver.close()
+            memory.close()
+            memory.unlink()
+
+
+def _solve(name: str, clauses: int, literals: int,
+           configuration: Configuration, connection: Connection) -> None:
+    """Send the literals of the model found by the solver of the
+    configuration over the clauses of the shared memory, None if they are
+    unsatisfiable."""
+    memory = attach_shared_memory(name)
+    arena = from_shared_memory(memory, clauses, literals)
+    try:
+        connection.send(_run(Clauses(arena), configuration))
+    except Exception as error:
+        connection.send(error)
+    finally:
+        connection.close()
+        arena.offsets.release()
+        arena.literals.release()
+        memory.close()
+
+
+def _run(clauses: Clauses, configuration: Configuration) \
+        -> Optional[List[int]]:
+    heuristic = HEURISTICS[configuration.heuristic]
+    if configuration.seed is not None:
+        generator = random.Random(configuration.seed)
+        order = list(range(len(clauses.clauses)))
+        generator.shuffle(order)
+        clauses = Clauses([clauses.clauses[i] for i in order])
+        if heuristic is RandomHeuristic:
+            heuristic = functools.partial(RandomHeuristic,
+                                          seed=configuration.seed)
+    solver = SOLVERS[configuration.solver](
+        clauses, heuristic, preprocess=configuration.preprocess,
+        restarts=configuration.restarts
+    )
+    model = solver.solve()
+    return model.literals if model is not None else None
@@ -0,0 +1,270 @@
+"""
+Simplification of the clauses before solving, in the style of SatELite.
+
+- Subsumption: a clause C subsumes every clause D containing it, which is
+  removed.
+- Strengthening (self-subsuming resolution): if C = C' ∨ l and D contains
+  C' ∨ ¬l, the resolvent of C and D is D without ¬l, which replaces D.
+- Bounded variable elimination: the clauses containing a variable are
+  replaced by all their non-tautological resolvents on it, if there are no
+  more of them than of the clauses removed.
+
+Unit clauses are handled by the first two: [l] subsumes the clauses
+containing l and strengthens those containing ¬l. The candidates for
+subsumption of a clause are found in the occurrence lists of its literal
+of fewest occurrences, and filtered by a signature: the bitmask of its
+variables modulo 64.
+
+The formula obtained is satisfiable if and only if the original one is,
+and a model of it is extended to the eliminated variables by going
+through the clauses removed with them, in reverse order of elimination.
+"""
+
+from __future__ import annotations
+from typing import *
+
+
+class Preprocessor:
+    """Simplify clauses and extend the models of the simplified ones."""
+
+    def __init__(self, clauses: Iterable[Iterable[int]],
+                 frozen: Iterable[int] = (), occurrence_limit: int = 16,
+                 resolvent_limit: int = 20) -> None:
+        """Construct a preprocessor of the clauses.
+
+        The frozen variables are never eliminated: they are the ones used
+        outside of the clauses (in assumptions for instance). Variables
+        occurring in more than occurrence_limit clauses are only eliminated
+        if they are pure, and those having a resolvent of more than
+        resolvent_limit literals are not.
+        """
+        self.frozen: Set[int] = set(frozen)
+        self.occurrence_limit = occurrence_limit
+        self.resolvent_limit = resolvent_limit
+        self.variables: Set[int] = set()
+        self._clauses: List[Optional[Set[int]]] = []
+        self._signatures: List[int] = []
+        self._occurrences: Dict[int, Set[int]] = {}
+        self._queue: List[int] = []
+        self._touched: Set[int] = set()
+        self._unsatisfiable = False
+        # Each eliminated variable with the clauses removed with it, in
+        # order of elimination; None once restored.
+        self._eliminated: List[Optional[Tuple[int, List[List[int]]]]] = []
+        self._positions: Dict[int, int] = {}
+        for clause in clauses:
+            clause = set(clause)
+            self.variables.update(map(abs, clause))
+            self._add(clause)
+
+    @property
+    def eliminated(self) -> Set[int]:
+        """Return the variables eliminated and not restored."""
+        return set(self._positions)
+
+    def simplify(self) -> List[List[int]]:
+        """Return the simplified clauses.
+
+        If the clauses are found to be unsatisfiable, the empty clause is
+        returned instead.
+        """
+        self._subsume()
+        while not self._unsatisfiable and self._touched:
+            self._eliminate_variables()
+        if self._unsatisfiable:
+            return [[]]
+        return [sorted(clause, key=abs) for clause in self._clauses
+                if clause is not None]
+
+    def extend(self, literals: Iterable[int]) -> List[int]:
+        """Return the model of the simplified clauses extended to a model
+        of the original ones.
+
+        The variables of the original clauses absent from the model are
+        set to False, then the eliminated ones to satisfy their clauses.
+        """
+        values: Dict[int, bool] = {abs(literal): literal > 0
+                                   for literal in literals}
+        for variable in self.variables:
+            values.setdefault(variable, False)
+        for entry in reversed(self._eliminated):
+            if entry is None:
+                continue
+            variable, clauses = entry
+            values[variable] = False
+            for clause in clauses:
+                if not any(values[abs(literal)] == (literal > 0)
+                           for literal in clause if abs(literal) != variable):
+                    values[variable] = variable in clause
+        return [variable if value else -variable
+                for variable, value in values.items()]
+
+    def restore(self, variables: Iterable[int]) -> List[List[int]]:
+        """Cancel the elimination of the variables and return the clauses
+        removed with them, to be added back to the simplified clauses.
+
+        The variables eliminated after them and occurring in these clauses
+        are restored as well.
+        """
+        pending = [variable for variable in variables
+                   if variable in self._positions]
+        restored: List[List[int]] = []
+        while pending:
+            position = self._positions.pop(pending.pop(), None)
+            if position is None:
+                continue
+            _, clauses = self._eliminated[position]
+            self._eliminated[position] = None
+            for clause in clauses:
+                restored.append(clause)
+                pending.extend(abs(literal) for literal in clause
+                               if abs(literal) in self._positions)
+        return restored
+
+    def _subsume(self) -> None:
+        """Subsume and strengthen with every clause of the queue."""
+        while self._queue and not self._unsatisfiable:
+            index = self._queue.pop()
+            if self._clauses[index] is not None:
+                self._backward_subsume(index)
+
+    def _backward_subsume(self, index: int) -> None:
+        """Remove the clauses subsumed by the clause and strengthen those
+        it resolves with into a subset of themselves."""
+        clause = self._clauses[index]
+        signature = self._signatures[index]
+        # The candidates contain the literal or its negation.
+        literal = min(clause, key=lambda literal:
+                      len(self._occurrences.get(literal, ()))
+                      + len(self._occurrences.get(-literal, ())))
+        candidates = (self._occurrences.get(literal, set())
+                      | self._occurrences.get(-literal, set()))
+        for other in candidates:
+            target = self._clauses[other]
+            if (other == index or target is None
+                    or len(target) < len(clause)
+                    or signature & ~self._signatures[other]):
+                continue
+            removed = _subsumption(clause, target)
+            if removed == 0:
+                self._remove(other)
+            elif removed is not None:
+                self._strengthen(other, removed)
+                if self._unsatisfiable:
+                    return
+
+    def _eliminate_variables(self) -> None:
+        """Try to eliminate the variables of the clauses changed since the
+        last time, fewest occurrences first."""
+        candidates = sorted(
+            (variable for variable in self._touched
+             if variable not in self.frozen
+             and variable not in self._positions),
+            key=lambda variable: (len(self._occurrences.get(variable, ()))
+                                  + len(self._occurrences.get(-variable, ())),
+                                  variable)
+        )
+        self._touched = set()
+        for variable in candidates:
+            if self._try_eliminate(variable):
+                self._subsume()
+                if self._unsatisfiable:
+                    return
+
+    def _try_eliminate(self, variable: int) -> bool:
+        """Eliminate the variable if it does not increase the number of
+        clauses and return True if it did."""
+        positive = sorted(self._occurrences.get(variable, ()))
+        negative = sorted(self._occurrences.get(-variable, ()))
+        if not positive and not negative:
+            return False
+        if (positive and negative
+                and len(positive) + len(negative) > self.occurrence_limit):
+            return False
+        resolvents: List[Set[int]] = []
+        for first in positive:
+            for second in negative:
+                resolvent = _resolve(self._clauses[first],
+                                     self._clauses[second], variable)
+                if resolvent is None:
+                    continue
+                if len(resolvent) > self.resolvent_limit:
+                    return False
+                resolvents.append(resolvent)
+                if len(resolvents) > len(positive) + len(negative):
+                    return False
+        self._positions[variable] = len(self._eliminated)
+        self._eliminated.append((variable, [
+            sorted(self._clauses[index], key=abs)
+            for index in positive + negative
+        ]))
+        for index in positive + negative:
+            self._remove(index)
+        for resolvent in resolvents:
+            self._add(resolvent)
+        return True
+
+    def _add(self, clause: Set[int]) -> None:
+        """Add the clause unless it is a tautology."""
+        if any(-literal in clause for literal in clause):
+            return
+        if not clause:
+            self._unsatisfiable = True
+        index = len(self._clauses)
+        self._clauses.append(clause)
+        self._signatures.append(_signature(clause))
+        for literal in clause:
+            self._occurrences.setdefault(literal, set()).add(index)
+            self._touched.add(abs(literal))
+        self._queue.append(index)
+
+    def _remove(self, index: int) -> None:
+        for literal in self._clauses[index]:
+            self._occurrences[literal].discard(index)
+            self._touched.add(abs(literal))
+        self._clauses[index] = None
+
+    def _strengthen(self, index: int, literal: int) -> None:
+        """Remove the literal from the clause."""
+        clause = self._clauses[index]
+        clause.discard(literal)
+        self._occurrences[literal].discard(index)
+        self._signatures[index] = _signature(clause)
+        self._touched.update(map(abs, clause))
+        self._touched.add(abs(literal))
+        if not clause:
+            self._unsatisfiable = True
+        self._queue.append(index)
+
+
+def _signature(clause: Set[int]) -> int:
+    signature = 0
+    for literal in clause:
+        signature |= 1 << (abs(literal) & 63)
+    return signature
+
+
+def _subsumption(clause: Set[int], other: Set[int]) -> Optional[int]:
+    """Return 0 if the clause subsumes the other, the literal to remove
+    from the other if the clause strengthens it, None otherwise."""
+    removed = 0
+    for literal in clause:
+        if literal in other:
+            continue
+        if removed or -literal not in other:
+            return None
+        removed = -literal
+    return removed
+
+
+def _resolve(positive: Set[int], negative: Set[int],
+             variable: int) -> Optional[Set[int]]:
+    """Return the resolvent of the clauses on the variable, None if it is
+    a tautology."""
+    if any(-literal in negative for literal in positive
+           if literal != variable):
+        return None
+    resolvent = positive | negative
+    resolvent.discard(variable)
+    resolvent.discard(-variable)
+    return resolvent
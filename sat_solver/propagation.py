@@ -0,0 +1,158 @@
+"""
+Unit propagation based on the two watched literals scheme.
+
+Each clause watches two of its literals. A clause only needs to be visited
+when one of its watched literals becomes false: either another non-false
+literal can be watched instead, or the clause is unit (or conflicting).
+Backtracking only unassigns literals, the watches stay valid as they are.
+"""
+
+from __future__ import annotations
+from collections import defaultdict
+from typing import *
+
+from sat_solver.trail import Trail, UNASSIGNED
+
+
+class WatchedLiterals:
+    """Unit propagation engine using two watched literals per clause."""
+
+    def __init__(self, clauses: List[List[int]],
+                 trail: Optional[Trail] = None) -> None:
+        """Build the watch lists of the clauses.
+
+        The clauses are not copied: the engine reorders their literals in
+        place to keep the watched ones at the first two positions.
+        """
+        self._clauses: List[List[int]] = clauses
+        self._watches: DefaultDict[int, List[int]] = defaultdict(list)
+        self._trail: Trail = trail if trail is not None else Trail()
+        self._units: List[int] = []
+        self._empty_clause: Optional[int] = None
+        self._free: List[int] = []
+        for index, clause in enumerate(clauses):
+            if len(set(clause)) < len(clause):
+                clause[:] = dict.fromkeys(clause)
+            self._watch(index)
+
+    def _watch(self, index: int) -> None:
+        clause = self._clauses[index]
+        self._trail.ensure_variable(max(map(abs, clause), default=0))
+        if not clause:
+            self._empty_clause = index
+        elif len(clause) == 1:
+            self._units.append(index)
+        else:
+            self._watches[clause[0]].append(index)
+            self._watches[clause[1]].append(index)
+
+    def add_clause(self, clause: Iterable[int]) -> int:
+        """Add a clause to the database and return its index.
+
+        The first two literals of the clause are watched: when the clause is
+        added under an assignment (like a learned clause), they must be the
+        asserting literal and the literal of highest decision level. Unit
+        clauses are not assigned, they are only enqueued by reset().
+        """
+        literals = list(dict.fromkeys(clause))
+        if self._free:
+            index = self._free.pop()
+            self._clauses[index] = literals
+        else:
+            index = len(self._clauses)
+            self._clauses.append(literals)
+        self._watch(index)
+        return index
+
+    def remove_clauses(self, indices: Collection[int]) -> None:
+        """Remove the clauses from the watch lists and free their index.
+
+        The clauses must not be the reason of an assigned literal.
+        """
+        removed = set(indices)
+        for literal, watchers in self._watches.items():
+            self._watches[literal] = [index for index in watchers
+                                      if index not in removed]
+        for index in removed:
+            self._clauses[index] = []
+        self._free.extend(removed)
+
+    def value(self, literal: int) -> Optional[bool]:
+        """Return the truth value of the literal, None if unassigned."""
+        return self._trail.value(literal)
+
+    def assign(self, literal: int, reason: Optional[int] = None) -> None:
+        """Set the literal to True and enqueue it for propagation."""
+        self._trail.assign(literal, reason)
+
+    def reset(self) -> Optional[int]:
+        """Unassign everything and assign the unit clauses.
+
+        Return the index of a conflicting clause if two unit clauses
+        contradict each other or if the formula contains an empty clause.
+        """
+        self._trail.backtrack(0)
+        if self._empty_clause is not None:
+            return self._empty_clause
+        for index in self._units:
+            literal = self._clauses[index][0]
+            value = self.value(literal)
+            if value is False:
+                return index
+            elif value is None:
+                self.assign(literal, index)
+        return None
+
+    def propagate(self) -> Optional[int]:
+        """Propagate every enqueued literal until a fixpoint is reached.
+
+        Return the index of a falsified clause if a conflict is found,
+        None otherwise. Only the clauses watching the negation of a newly
+        assigned literal are visited.
+        """
+        clauses = self._clauses
+        watches = self._watches
+        trail = self._trail
+        values = trail.values
+        literals = trail.literals
+        while trail.head < len(literals):
+            false_literal = -literals[trail.head]
+            trail.head += 1
+            watchers = watches[false_literal]
+            kept: List[int] = []
+            for position, index in enumerate(watchers):
+                clause = clauses[index]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], false_literal
+                other = clause[0]
+                other_value = values[other] if other > 0 else -values[-other]
+                if other_value > 0:
+                    kept.append(index)
+                    continue
+                for k in range(2, len(clause)):
+                    candidate = clause[k]
+                    if candidate > 0:
+                        value = values[candidate]
+                    else:
+                        value = -values[-candidate]
+                    if value >= 0:
+                        clause[1], clause[k] = candidate, false_literal
+                        watches[candidate].append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if other_value != UNASSIGNED:
+                        kept.extend(watchers[position + 1:])
+                        watches[false_literal] = kept
+                        return index
+                    trail.assign(other, index)
+            watches[false_literal] = kept
+        return None
+
+    @property
+    def clauses(self) -> List[List[int]]:
+        return self._clauses
+
+    @property
+    def trail(self) -> Trail:
+        return self._trail
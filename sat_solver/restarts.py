@@ -0,0 +1,132 @@
+"""
+Restart policies of the solvers.
+
+A restart backtracks to the top decision level while keeping what the
+search gathered (learned clauses, activities, saved phases), so that an
+unlucky early decision does not trap the search in a hard subtree. The
+policy is notified of every conflict, with the LBD (number of distinct
+decision levels) of the conflicting or learned clause, and tells the
+solver when to restart:
+- "luby": after unit * luby(i) conflicts for the i-th restart, the Luby
+  sequence 1, 1, 2, 1, 1, 2, 4, 1... being optimal for heavy-tailed run
+  times of unknown distribution ;
+- "geometric": after first * factor^i conflicts ;
+- "glucose": when the recent conflicts are of poor quality, the moving
+  average of their LBD over the last few conflicts (fast) exceeding the
+  long term one (slow) by a margin ;
+- "none": never.
+"""
+
+from __future__ import annotations
+from typing import *
+
+
+class RestartPolicy:
+    """Interface of the restart policies."""
+
+    def __init__(self) -> None:
+        # Conflicts since the last restart.
+        self.conflicts = 0
+
+    def conflict(self, lbd: int) -> None:
+        """Notify a conflict of the LBD."""
+        self.conflicts += 1
+
+    def should_restart(self) -> bool:
+        """Return True if the search should restart now."""
+        raise NotImplementedError
+
+    def restarted(self) -> None:
+        """Notify that the search restarted."""
+        self.conflicts = 0
+
+
+class NoRestarts(RestartPolicy):
+    """Never restart."""
+
+    def should_restart(self) -> bool:
+        return False
+
+
+class LubyRestarts(RestartPolicy):
+    """Restart after unit times the terms of the Luby sequence."""
+
+    def __init__(self, unit: int = 100) -> None:
+        super().__init__()
+        self.unit = unit
+        self._restarts = 0
+
+    def should_restart(self) -> bool:
+        return self.conflicts >= self.unit * luby(self._restarts + 1)
+
+    def restarted(self) -> None:
+        super().restarted()
+        self._restarts += 1
+
+
+class GeometricRestarts(RestartPolicy):
+    """Restart after a number of conflicts growing geometrically."""
+
+    def __init__(self, first: int = 100, factor: float = 1.5) -> None:
+        super().__init__()
+        self.factor = factor
+        self._limit: float = first
+
+    def should_restart(self) -> bool:
+        return self.conflicts >= self._limit
+
+    def restarted(self) -> None:
+        super().restarted()
+        self._limit *= self.factor
+
+
+class GlucoseRestarts(RestartPolicy):
+    """Restart when the recent LBDs are high compared to the average.
+
+    The averages are exponential moving averages, of smoothing factors
+    fast and slow, initialized with the first LBD.
+    """
+
+    def __init__(self, fast: float = 1 / 32, slow: float = 1 / 4096,
+                 margin: float = 1.25, minimum: int = 50) -> None:
+        """Construct a policy restarting when the fast average exceeds
+        margin times the slow one, at least minimum conflicts after the
+        last restart."""
+        super().__init__()
+        self.fast = fast
+        self.slow = slow
+        self.margin = margin
+        self.minimum = minimum
+        self._fast_average: Optional[float] = None
+        self._slow_average: Optional[float] = None
+
+    def conflict(self, lbd: int) -> None:
+        super().conflict(lbd)
+        if self._fast_average is None:
+            self._fast_average = self._slow_average = float(lbd)
+        else:
+            self._fast_average += self.fast * (lbd - self._fast_average)
+            self._slow_average += self.slow * (lbd - self._slow_average)
+
+    def should_restart(self) -> bool:
+        return (self.conflicts >= self.minimum
+                and self._fast_average > self.margin * self._slow_average)
+
+
+RESTART_POLICIES: Dict[str, Callable[[], RestartPolicy]] = {
+    "none": NoRestarts,
+    "luby": LubyRestarts,
+    "geometric": GeometricRestarts,
+    "glucose": GlucoseRestarts,
+}
+
+
+def luby(index: int) -> int:
+    """Return the index-th term (from 1) of the Luby sequence."""
+    while True:
+        size = index.bit_length()
+        # The sequence up to 2^size - 1 is two copies of the sequence up to
+        # 2^(size - 1) - 1 followed by 2^(size - 1).
+        if index == (1 << size) - 1:
+            return 1 << (size - 1)
+        index -= (1 << (size - 1)) - 1
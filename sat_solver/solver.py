@@ -0,0 +1,88 @@
+"""
+Base class of the SAT solvers, reading clauses from file. It expects the
+clauses in conjunctive normal form.
+"""
+from typing import *
+
+from sat_solver.clauses import Clauses
+from sat_solver.heuristics import BranchingHeuristic, Evsids, HEURISTICS
+from sat_solver.heuristics import REPHASE_MODES
+from sat_solver.model import Model
+from sat_solver.restarts import RESTART_POLICIES, RestartPolicy
+from sat_solver.trail import Trail
+
+HeuristicFactory = Callable[..., BranchingHeuristic]
+RestartPolicyFactory = Callable[[], RestartPolicy]
+
+
+class Statistics:
+    """Counters of the search of a solver, over all its calls."""
+
+    def __init__(self) -> None:
+        self.decisions = 0
+        self.conflicts = 0
+        self.restarts = 0
+        self.rephases = 0
+
+    def __repr__(self) -> str:
+        return (f"Statistics(decisions={self.decisions}, "
+                f"conflicts={self.conflicts}, restarts={self.restarts}, "
+                f"rephases={self.rephases})")
+
+
+class SatSolver:
+    """Base class of the SAT solvers."""
+
+    def __init__(self, clauses: Clauses,
+                 heuristic: Union[str, HeuristicFactory] = Evsids,
+                 preprocess: bool = False,
+                 restarts: Union[str, RestartPolicyFactory] = "luby",
+                 rephase_interval: int = 8) -> None:
+        """Construct a solver for the clauses.
+
+        The branching heuristic is either the name of one of the HEURISTICS
+        or a callable building it from the clauses and the trail. If
+        preprocess is set, the clauses are simplified by a Preprocessor
+        before the search.
+
+        The restart policy is either the name of one of the
+        RESTART_POLICIES or a callable building it. Every rephase_interval
+        restarts, the saved phases of the heuristic are reset to the next
+        of the REPHASE_MODES (never if it is 0).
+        """
+        self.clauses = clauses
+        self.preprocess = preprocess
+        if isinstance(heuristic, str):
+            heuristic = HEURISTICS[heuristic]
+        self.heuristic: HeuristicFactory = heuristic
+        if isinstance(restarts, str):
+            restarts = RESTART_POLICIES[restarts]
+        self.restarts: RestartPolicyFactory = restarts
+        self.rephase_interval = rephase_interval
+        self.statistics = Statistics()
+
+    @classmethod
+    def from_file(cls, filename: str, *args, **kwargs):
+        """Create solver with the clauses from the file.
+
+        Additional arguments are passed to the constructor of the solver.
+        """
+        return cls(Clauses.from_file(filename), *args, **kwargs)
+
+    def solve(self) -> Optional[Model]:
+        """Return the solution if the formula is solvable."""
+        raise NotImplementedError
+
+    def _restart(self, trail: Trail, heuristic: BranchingHeuristic,
+                 policy: RestartPolicy, level: int = 0) -> None:
+        """Backtrack to the decision level and rephase when it is time."""
+        heuristic.unassigned(trail.backtrack(level))
+        policy.restarted()
+        statistics = self.statistics
+        statistics.restarts += 1
+        if (self.rephase_interval
+                and statistics.restarts % self.rephase_interval == 0):
+            heuristic.rephase(
+                REPHASE_MODES[statistics.rephases % len(REPHASE_MODES)]
+            )
+            statistics.rephases += 1
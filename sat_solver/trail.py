@@ -0,0 +1,96 @@
+"""
+Assignment trail of the solvers.
+
+The trail records the assigned literals in chronological order along with
+their decision level and the clause which implied them (their reason).
+Backtracking to a decision level only pops the literals assigned after it.
+"""
+
+from __future__ import annotations
+from typing import *
+
+TRUE = 1
+FALSE = -1
+UNASSIGNED = 0
+
+
+class Trail:
+    """Chronological assignment of the literals, split in decision levels.
+
+    The per-variable arrays are public so that the propagation and
+    search loops can index them without a method call:
+    - values[variable] is TRUE, FALSE or UNASSIGNED ;
+    - levels[variable] is the decision level of the assignment ;
+    - reasons[variable] is the index of the implying clause (or None for
+      decisions) ;
+    - literals is the list of assigned literals, head being the index of
+      the next literal to propagate.
+    """
+
+    def __init__(self, variables: int = 0) -> None:
+        self.values: List[int] = []
+        self.levels: List[int] = []
+        self.reasons: List[Optional[int]] = []
+        self.literals: List[int] = []
+        self.head: int = 0
+        self._level_starts: List[int] = []
+        self.ensure_variable(variables)
+
+    def __len__(self) -> int:
+        return len(self.literals)
+
+    def ensure_variable(self, variable: int) -> None:
+        """Grow the per-variable arrays so that they can hold the variable."""
+        missing = variable + 1 - len(self.values)
+        if missing > 0:
+            self.values.extend([UNASSIGNED] * missing)
+            self.levels.extend([0] * missing)
+            self.reasons.extend([None] * missing)
+
+    def value(self, literal: int) -> Optional[bool]:
+        """Return the truth value of the literal, None if unassigned."""
+        if literal > 0:
+            value = self.values[literal]
+        else:
+            value = -self.values[-literal]
+        return None if value == UNASSIGNED else value == TRUE
+
+    def assign(self, literal: int, reason: Optional[int] = None) -> None:
+        """Set the literal to True at the current decision level."""
+        variable = abs(literal)
+        self.values[variable] = TRUE if literal > 0 else FALSE
+        self.levels[variable] = len(self._level_starts)
+        self.reasons[variable] = reason
+        self.literals.append(literal)
+
+    def new_decision_level(self) -> None:
+        """Open a decision level, the next assignment being its decision."""
+        self._level_starts.append(len(self.literals))
+
+    def backtrack(self, level: int) -> List[int]:
+        """Unassign every literal assigned above the decision level.
+
+        Return the unassigned literals, most recent last.
+        """
+        if level >= len(self._level_starts):
+            return []
+        start = self._level_starts[level]
+        unassigned = self.literals[start:]
+        for literal in unassigned:
+            self.values[abs(literal)] = UNASSIGNED
+        del self.literals[start:]
+        del self._level_starts[level:]
+        self.head = min(self.head, start)
+        return unassigned
+
+    def level(self, variable: int) -> int:
+        """Return the decision level at which the variable was assigned."""
+        return self.levels[variable]
+
+    def reason(self, variable: int) -> Optional[int]:
+        """Return the index of the clause which implied the variable."""
+        return self.reasons[variable]
+
+    @property
+    def decision_level(self) -> int:
+        return len(self._level_starts)
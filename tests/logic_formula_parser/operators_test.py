@@ -0,0 +1,28 @@
+import pickle
+
+import pytest
+
+from logic_formula_parser.operators import *
+
+
+def test_hash_consing():
+    formula = Or(Not(Box(Proposition('a'))), Proposition('b'))
+    assert Or(Not(Box(Proposition('a'))), Proposition('b')) is formula
+    assert formula.left.right is Box(Proposition('a'))
+    assert Box(Proposition('a')) != Diamond(Proposition('a'))
+    assert Or(Proposition('a'), Proposition('b')) \
+        != Or(Proposition('b'), Proposition('a'))
+    assert len({formula, Or(Not(Box(Proposition('a'))),
+                            Proposition('b'))}) == 1
+    assert pickle.loads(pickle.dumps(formula)) is formula
+
+
+def test_immutable():
+    formula = And(Proposition('a'), Proposition('b'))
+    with pytest.raises(AttributeError):
+        formula.left = Proposition('c')
+    with pytest.raises(AttributeError):
+        formula.left.literal = 'c'
+    assert not hasattr(formula, '__dict__')
+    with pytest.raises(ValueError):
+        Or(None, None)
@@ -12,3 +12,17 @@ def test_tokenize():
                                 Not(Box(Proposition('e'))))),
                          Not(DiamondNot(Proposition('a'))))
     assert expected_result == actual_result
+
+
+def test_get_parser():
+    assert parser.get_parser() is parser.get_parser()
+    assert lexer.get_lexer() is lexer.lexer
+
+
+def test_parse_file(tmp_path):
+    filename = tmp_path / "formulas.txt"
+    filename.write_text("a|-b\n[]c\n")
+    assert parser.parse_file(str(filename)) == [
+        Or(Proposition('a'), Not(Proposition('b'))),
+        Box(Proposition('c')),
+    ]
@@ -0,0 +1,48 @@
+import pathlib
+
+from max_sat_solver.local_search import LocalSearch
+from sat_solver.clauses import Clauses
+
+
+class TestLocalSearch:
+    def test_solve(self):
+        clauses = Clauses([
+            [2],
+            [-2],
+            [2, 3],
+            [-3],
+            [-2, 3],
+            [4, 5],
+            [-4],
+            [-5],
+        ], {})
+        solution = LocalSearch(clauses, seed=0).solve(1000)
+        assert solution.cost == 3 and not solution.optimal
+        literals = set(solution.model.literals)
+        assert {abs(literal) for literal in literals} == {2, 3, 4, 5}
+
+    def test_solve_weighted(self):
+        clauses = Clauses.from_file(
+            f"{pathlib.Path(__file__).parent}/weighted_clauses.txt"
+        )
+        solution = LocalSearch(clauses, seed=0).solve(1000)
+        assert solution.cost == 2
+        literals = set(solution.model.literals)
+        for clause, hard in zip(clauses.clauses, clauses.hard):
+            assert not hard or literals & set(clause)
+
+    def test_solve_satisfiable(self):
+        clauses = Clauses([[2, 3], [-2, 4], [-3, -4], [], [2, -2]], {},
+                          [1, 1, 1, 7, 1], [True, False, False, False, True])
+        solution = LocalSearch(clauses, seed=0).solve(100, initial=[-2, -3])
+        assert solution.cost == 7 and solution.optimal
+        # Variable 5 only occurs in a tautology.
+        clauses.add_clause([5, -5])
+        solution = LocalSearch(clauses, seed=0).solve(100)
+        assert solution.model.value(5) is not None
+
+    def test_solve_hard_unsatisfiable(self):
+        clauses = Clauses([[2], [-2], [3]], {}, [1, 1, 1], [True, True, False])
+        assert LocalSearch(clauses, seed=0).solve(100) is None
+        clauses.add_clause([], hard=True)
+        assert LocalSearch(clauses).solve(100) is None
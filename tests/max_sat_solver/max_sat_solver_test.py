@@ -0,0 +1,81 @@
+import pathlib
+import pytest
+
+from max_sat_solver.max_sat_solver import MaxSatSolver
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.clauses import Clauses
+
+
+class TestMaxSatSolver:
+    def test_solve(self):
+        clauses = Clauses([
+            [2],
+            [-2],
+            [2, 3],
+            [-3],
+            [-2, 3],
+            [4, 5],
+            [-4],
+            [-5],
+        ], {})
+        solution = MaxSatSolver().solve(clauses)
+        assert solution.cost == 3
+        literals = set(solution.model.literals)
+        assert {abs(literal) for literal in literals} == {2, 3, 4, 5}
+        falsified = [clause for clause in clauses.clauses
+                     if not literals & set(clause)]
+        assert len(falsified) == 3
+
+    def test_solve_satisfiable(self):
+        solver = CdclSatSolver.from_file(
+            f"{pathlib.Path(__file__).parent.parent}"
+            f"/sat_solver/satisfiable_clauses.txt"
+        )
+        assert MaxSatSolver().solve(solver.clauses).cost == 0
+
+    def test_solve_unsatisfiable(self):
+        solver = CdclSatSolver.from_file(
+            f"{pathlib.Path(__file__).parent.parent}"
+            f"/sat_solver/unsatisfiable_clauses.txt"
+        )
+        assert MaxSatSolver().solve(solver.clauses).cost == 1
+
+    @pytest.mark.parametrize("algorithm", MaxSatSolver.ALGORITHMS)
+    @pytest.mark.parametrize("stratified", [True, False])
+    @pytest.mark.parametrize("preprocess", [False, True])
+    def test_solve_weighted(self, algorithm, stratified, preprocess):
+        clauses = Clauses.from_file(
+            f"{pathlib.Path(__file__).parent}/weighted_clauses.txt"
+        )
+        assert clauses.weights[:6] == [1, 1, 5, 3, 2, 4]
+        assert clauses.hard[:6] == [True, True, False, False, False, False]
+        costs = []
+        solver = MaxSatSolver(algorithm, stratified,
+                              on_solution=lambda s: costs.append(s.cost),
+                              preprocess=preprocess)
+        solution = solver.solve(clauses)
+        # a is true: b is false, c is true to satisfy b|c and -a|c.
+        assert solution.cost == 2 and solution.optimal
+        assert costs == sorted(costs, reverse=True) and costs[-1] == 2
+
+    @pytest.mark.parametrize("algorithm", MaxSatSolver.ALGORITHMS)
+    def test_solve_local_search(self, algorithm):
+        clauses = Clauses.from_file(
+            f"{pathlib.Path(__file__).parent}/weighted_clauses.txt"
+        )
+        costs = []
+        solver = MaxSatSolver(algorithm, local_search_flips=1000,
+                              on_solution=lambda s: costs.append(s.cost))
+        solution = solver.solve(clauses)
+        assert solution.cost == 2 and solution.optimal
+        assert costs == [2]
+
+    def test_solve_hard_unsatisfiable(self):
+        clauses = Clauses([[2], [-2], [3]], {}, [1, 1, 1], [True, True, False])
+        assert MaxSatSolver().solve(clauses) is None
+        assert MaxSatSolver("linear").solve(clauses) is None
+
+    def test_solve_time_limit(self):
+        clauses = Clauses([[2, 3], [-2], [-3]], {}, [1, 2, 3], None)
+        solution = MaxSatSolver("linear", time_limit=0).solve(clauses)
+        assert solution and not solution.optimal
@@ -0,0 +1,22 @@
+import itertools
+
+from max_sat_solver.totalizer import Totalizer
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.clauses import Clauses
+
+
+class TestTotalizer:
+    def test_at_most(self):
+        inputs = [2, 3, 4, 5]
+        variables = iter(range(6, 100))
+        totalizer = Totalizer(inputs, lambda: next(variables))
+        assert len(totalizer.outputs) == 4
+        assert totalizer.at_most(4) is None
+        for bound in range(4):
+            for true_inputs in itertools.combinations(inputs, bound + 1):
+                assumptions = [totalizer.at_most(bound)] + list(true_inputs)
+                solver = CdclSatSolver(Clauses(totalizer.clauses[:], {}))
+                assert solver.solve(assumptions) is None
+            assumptions = [totalizer.at_most(bound)] + inputs[:bound]
+            solver = CdclSatSolver(Clauses(totalizer.clauses[:], {}))
+            assert solver.solve(assumptions)
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from sat_solver.cache import input_digest, load_clauses, read_cache
+from sat_solver.clauses import Clauses
+
+
+class TestCache:
+    def test_load_clauses(self, tmp_path):
+        filename = tmp_path / "clauses.txt"
+        filename.write_text("h: a|-[]b\n3: <>-a\n-a|b\n")
+        directory = str(tmp_path / "cache")
+        clauses = load_clauses(str(filename), directory)
+        assert clauses == Clauses.from_file(str(filename))
+        path = os.path.join(directory,
+                            input_digest(str(filename)) + ".clauses")
+        cached = read_cache(path)
+        assert cached == clauses
+        assert cached.weights == clauses.weights
+        assert cached.hard == clauses.hard
+        assert cached.lines == clauses.lines
+        assert cached.lines[:4] == [1, 2, 3, None]
+        assert cached.translation == clauses.translation
+        assert load_clauses(str(filename), directory) == clauses
+
+        filename.write_text("a|b\n")
+        assert len(load_clauses(str(filename), directory).clauses) == 7
+        assert len(os.listdir(directory)) == 2
+
+    def test_invalid_cache(self, tmp_path):
+        path = tmp_path / "invalid.clauses"
+        path.write_bytes(b"not a cache file, but long enough to be read")
+        with pytest.raises(ValueError):
+            read_cache(str(path))
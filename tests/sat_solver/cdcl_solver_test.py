@@ -0,0 +1,100 @@
+import pathlib
+import pytest
+
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.clauses import Clauses
+from tests.sat_solver.pigeonhole import pigeonhole
+
+
+class TestCdclSatSolver:
+    def test_solve(self):
+        solver = CdclSatSolver.from_file(
+            f"{pathlib.Path(__file__).parent}"
+            f"/super_simple_satisfiable_clauses.txt"
+        )
+        solution = solver.solve()
+        assert solution and len(solution.literals) > 1
+
+        solver = CdclSatSolver.from_file(
+            f"{pathlib.Path(__file__).parent}/satisfiable_clauses.txt"
+        )
+        solution = solver.solve()
+        literals = set(solution.literals)
+        for clause in solver.clauses.clauses:
+            assert literals & set(clause)
+
+    def test_solve_unsatisfiable(self):
+        solver = CdclSatSolver.from_file(
+            f"{pathlib.Path(__file__).parent}/unsatisfiable_clauses.txt"
+        )
+        assert solver.solve() is None
+
+    def test_learned_clauses_deletion(self):
+        solver = CdclSatSolver(pigeonhole(4, 3), max_learned=4,
+                               max_learned_increment=1)
+        assert solver.solve() is None
+        assert all(clause for clause in solver.learned_clauses)
+
+    def test_solve_assumptions(self):
+        clauses = Clauses([[-2, 3], [-3, 4], [-5, -4], [6, 7]], {})
+        solver = CdclSatSolver(clauses)
+        assert solver.solve([2, 6])
+        assert solver.solve([7, 2, 5]) is None
+        assert sorted(solver.core) == [2, 5]
+        assert solver.solve([-4, 4]) is None
+        assert sorted(solver.core) == [-4, 4]
+
+    def test_add_clause(self):
+        solver = CdclSatSolver(Clauses([[2, 3], [-2, 3]], {}))
+        solution = solver.solve()
+        assert solution.value(3)
+        solver.add_clause([-3, 4])
+        solution = solver.solve()
+        assert solution.value(4)
+        solver.add_clause([-4])
+        assert solver.solve() is None
+        assert solver.solve() is None
+
+    def test_push_pop(self):
+        solver = CdclSatSolver(Clauses([[2, 3]], {}))
+        solver.push()
+        solver.add_clause([-2])
+        solver.add_clause([-3])
+        assert solver.solve() is None
+        assert solver.core == []
+        solver.pop()
+        solution = solver.solve()
+        assert solution and (solution.value(2)
+                             or solution.value(3))
+        variable = solver.new_variable()
+        assert variable > 3
+        assert all(abs(literal) <= 3 for literal in solution.literals)
+
+    def test_push_after_assumptions(self):
+        # A variable only used in assumptions is not reused as a selector.
+        solver = CdclSatSolver(Clauses([[2]], {}))
+        assert solver.solve([3])
+        solver.push()
+        solver.pop()
+        solution = solver.solve([3])
+        assert solution and solution.value(3)
+        solver.push()
+        selector = solver.new_variable() - 1
+        with pytest.raises(ValueError):
+            solver.add_clause([selector])
+        with pytest.raises(ValueError):
+            solver.solve([-selector])
+
+    def test_learned_clauses_kept(self):
+        solver = CdclSatSolver(pigeonhole(3, 3))
+        solver.push()
+        # No pigeon in the first hole.
+        solver.add_clause([-2])
+        solver.add_clause([-5])
+        solver.add_clause([-8])
+        assert solver.solve() is None
+        learned = len(solver.learned_clauses)
+        assert solver.solve() is None
+        assert len(solver.learned_clauses) == learned
+        solver.pop()
+        assert solver.solve()
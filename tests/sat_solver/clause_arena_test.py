@@ -0,0 +1,46 @@
+import pytest
+
+from sat_solver.clause_arena import ClauseArena
+from sat_solver.clauses import Clauses
+
+
+class TestClauseArena:
+    def test_append(self):
+        arena = ClauseArena([[2, -3], [], [4]])
+        assert arena.append([-2, 3, 5]) == 3
+        assert len(arena) == 4
+        assert list(arena.literals) == [2, -3, 0, 0, 4, 0, -2, 3, 5, 0]
+        assert list(arena.offsets) == [0, 3, 4, 6]
+        assert [arena.size(index) for index in range(4)] == [2, 0, 1, 3]
+        with pytest.raises(ValueError):
+            arena.append([2, 0])
+        assert len(arena) == 4
+
+    def test_sequence(self):
+        clauses = [[2, -3], [], [4], [-2, 3, 5]]
+        arena = ClauseArena(clauses)
+        assert list(arena) == clauses
+        assert arena == clauses
+        assert arena[-1] == [-2, 3, 5]
+        assert arena[1:3] == [[], [4]]
+        assert [4] in arena
+        with pytest.raises(IndexError):
+            arena[4]
+        assert arena.nbytes == 10 * 4 + 4 * 8
+
+    def test_clauses_scans(self):
+        clauses = Clauses([[2, -3], [4], [-2, 3, 4]])
+        assert clauses.find_pure_literals() == {4}
+        assert clauses.find_mono_literals() == {4}
+        assert not clauses.contains_only_mono_literals()
+        assert not clauses.contains_empty_clause()
+        assert clauses.get_distinct_propositions() == {2, -2, 3, -3, 4}
+        clauses.add_clause([])
+        assert clauses.contains_empty_clause()
+
+    def test_clauses_from_generator(self):
+        clauses = Clauses(clause for clause in [[2], [-3, 4]])
+        assert clauses.clauses == [[2], [-3, 4]]
+        assert clauses.weights == [1, 1]
+        assert clauses.hard == [False, False]
+        assert clauses.lines == [1, 2]
@@ -1,6 +1,10 @@
+import itertools
 import pytest
 
-from sat_solver.clauses import Clauses, _get_leaves
+from logic_formula_parser import parser
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.clauses import (Clauses, ClauseReader, _get_leaves,
+                                generate_modal_axioms)
 from logic_formula_parser.operators import *
 
 
@@ -21,6 +25,20 @@ class TestClauses:
                          Proposition('d')}
         assert leaves == actual_leaves
 
+    def test_generate_modal_axioms(self):
+        # ☐a∨¬b
+        formula = Or(Box(Proposition('a')), Not(Proposition('b')))
+        axioms = generate_modal_axioms([formula])
+        assert len(axioms) == 6
+        assert Or(Proposition('a'), Not(Box(Proposition('a')))) in axioms
+        assert Or(Not(Box(Proposition('b'))),
+                  Diamond(Proposition('b'))) in axioms
+
+        clauses = Clauses.from_literal_formulas([formula], [3])
+        assert clauses.weights == [3] + [1] * 6
+        assert clauses.hard == [False] + [True] * 6
+        assert len(clauses.translation) == 8
+
     # def test_is_mono_literal(self):
     #     multi_literal = {-1, -3, -1}
     #     assert Clauses.is_mono_literal(multi_literal) is False
@@ -69,3 +87,128 @@ class TestClauses:
     # @pytest.mark.skip(reason="Not yet implemented")
     # def test_contains_empty_clause(self):
     #     assert False
+
+    def test_is_consistent_set_of_literals(self):
+        assert Clauses([[2], [-3, 4]]).is_consistant_set_of_literals()
+        assert not Clauses([[2], [-2, 4]]).is_consistant_set_of_literals()
+
+    def test_clause_reader(self):
+        reader = ClauseReader()
+        assert reader.read("a|-b|[]c") == [[2, -3, 4]]
+        assert reader.read("-[]c|<>-a|a") == [[-4, 5, 2]]
+        assert reader.translation == {
+            Proposition('a'): 2,
+            Proposition('b'): 3,
+            Box(Proposition('c')): 4,
+            DiamondNot(Proposition('a')): 5,
+        }
+        # Not a clause: parsed by PLY.
+        assert reader.read("a&[]-d") == [[2], [6]]
+        assert reader.translation[BoxNot(Proposition('d'))] == 6
+        assert reader.read("a->b|-[]c") == [[-2, 3, -4]]
+        assert reader.definitions == []
+        axioms = reader.modal_axioms()
+        assert len(axioms) == 12
+        assert [2, -reader.translation[Box(Proposition('a'))]] in axioms
+
+    def test_from_file(self, tmp_path):
+        filename = tmp_path / "clauses.txt"
+        filename.write_text("# comment\nh: a|-b\n3: []-b\n\n-a\n")
+        clauses = Clauses.from_file(str(filename))
+        leaves = {value: leaf for leaf, value in clauses.translation.items()}
+        assert [{(literal > 0, leaves[abs(literal)]) for literal in clause}
+                for clause in clauses.clauses[:3]] == [
+            {(True, Proposition('a')), (False, Proposition('b'))},
+            {(True, BoxNot(Proposition('b')))},
+            {(False, Proposition('a'))},
+        ]
+        assert clauses.weights == [1, 3, 1] + [1] * 6
+        assert clauses.hard == [True, False, False] + [True] * 6
+        assert _get_leaves(BoxNot(Proposition('b'))) == {
+            BoxNot(Proposition('b'))
+        }
+
+    def test_read_formula(self):
+        a, b, c, d = map(Proposition, "abcd")
+        reader = ClauseReader()
+        # (a∧b)∨¬(c∨d): one auxiliary variable per subformula.
+        assert reader.read_formula(Or(And(a, b), Not(Or(c, d)))) == \
+            [[4, -7]]
+        assert reader.definitions == [[-4, 2], [-4, 3], [7, -5], [7, -6]]
+        # ¬(a∧b) at the top level is a clause.
+        assert reader.read_formula(Imply(And(a, b), c)) == [[-2, -3, 5]]
+        # (a∧b) again, negated: its other implication is added.
+        assert reader.read_formula(Or(And(c, Not(And(a, b))), d)) == \
+            [[8, 6]]
+        assert reader.definitions[4:] == [[4, -2, -3], [-8, 5], [-8, -4]]
+        # ¬(a→c∧d) is a∧(¬c∨¬d).
+        assert reader.read_formula(Not(Imply(a, And(c, d)))) == \
+            [[2], [-5, -6]]
+        with pytest.raises(ValueError):
+            reader.read_formula(Box(Or(a, b)))
+
+    def test_read_formula_linear(self):
+        # The distribution of the disjunction over the conjunctions would
+        # give 2^20 clauses.
+        formula = And(Proposition("a0"), Proposition("b0"))
+        for index in range(1, 20):
+            formula = Or(formula, And(Proposition(f"a{index}"),
+                                      Proposition(f"b{index}")))
+        clauses = Clauses.from_literal_formulas([formula], hard=[True])
+        assert len(clauses.clauses) == 1 + 2 * 20 + 3 * 40
+
+    @pytest.mark.parametrize("line", ["a&b|-c", "a->b->c", "-a&b->c|a&-b"])
+    def test_read_formula_models(self, line):
+        # The models of the clauses are the models of the formula.
+        formula = parser.parse(line)
+        clauses = Clauses.from_lines([f"h: {line}"])
+        leaves = [Proposition(name) for name in "abc"]
+        for values in itertools.product((True, False), repeat=3):
+            assumptions = [clauses.translation[leaf] * (1 if value else -1)
+                           for leaf, value in zip(leaves, values)]
+            solver = CdclSatSolver(clauses)
+            expected = _evaluate(formula, dict(zip(leaves, values)))
+            assert (solver.solve(assumptions) is not None) == expected
+
+    def test_from_lines(self, tmp_path):
+        lines = ["a|b", "2: -a", "h: []b|-c"]
+        clauses = Clauses.from_lines(iter(lines))
+        filename = tmp_path / "clauses.txt"
+        filename.write_text("\n".join(lines))
+        assert Clauses.from_file(str(filename), chunk_size=4) == clauses
+        assert clauses.weights[:3] == [1, 2, 1]
+
+        # A soft formula of several clauses is a single soft clause.
+        clauses = Clauses.from_lines(["3: a&b", "h: a&-c"])
+        assert clauses.clauses[:3] == [[4], [2], [-5]]
+        assert clauses.weights[:3] == [3, 1, 1]
+        assert clauses.hard[:5] == [False, True, True, True, True]
+        assert clauses.clauses[3:5] == [[-4, 2], [-4, 3]]
+        assert clauses.symbol(4) is None
+
+        clauses = Clauses.from_lines(["# comment", "h: a&b", "", "-c"])
+        assert clauses.lines[:3] == [2, 2, 4]
+        assert set(clauses.lines[3:]) == {None}
+
+        formulas = (Or(Proposition('a'), Proposition('b')),
+                    Not(Proposition('a')))
+        clauses = Clauses.from_literal_formulas(formula for formula
+                                                in formulas)
+        assert len(clauses.clauses) == 2 + 6
+        assert clauses.clauses[:2] == [[2, 3], [-2]]
+        assert clauses.lines[:3] == [1, 2, None]
+
+
+def _evaluate(formula, values):
+    """Return the value of the propositional formula."""
+    if isinstance(formula, Proposition):
+        return values[formula]
+    if isinstance(formula, Not):
+        return not _evaluate(formula.right, values)
+    left = _evaluate(formula.left, values)
+    right = _evaluate(formula.right, values)
+    if isinstance(formula, And):
+        return left and right
+    if isinstance(formula, Or):
+        return left or right
+    return not left or right
@@ -0,0 +1,67 @@
+import itertools
+import pathlib
+import random
+
+import pytest
+
+from sat_solver.clauses import Clauses
+from sat_solver.cube_and_conquer import CubeAndConquerSolver, Cuber
+from tests.sat_solver.pigeonhole import pigeonhole
+
+
+class TestCuber:
+    def test_split(self):
+        clauses = [[2, 3, 4], [-2, 3], [-3, 4, 5], [-4, -5], [2, -5, 6]]
+        cubes = Cuber(clauses).split([], 3)
+        assert 1 < len(cubes) <= 8
+        # Every model of the clauses is in one of the cubes.
+        for values in itertools.product((True, False), repeat=5):
+            model = {variable if value else -variable
+                     for variable, value in zip(range(2, 7), values)}
+            if all(model & set(clause) for clause in clauses):
+                assert any(set(cube) <= model for cube in cubes)
+
+    def test_split_unsatisfiable(self):
+        clauses = [[2, 3], [2, -3], [-2, 4], [-2, -4]]
+        assert Cuber(clauses).split([], 2) == []
+        assert Cuber([[2, 3]]).split([-2, -3], 2) == []
+
+
+class TestCubeAndConquerSolver:
+    @pytest.mark.parametrize("conflict_limit", [0, 1000])
+    def test_solve(self, conflict_limit):
+        solver = CubeAndConquerSolver.from_file(
+            f"{pathlib.Path(__file__).parent}/satisfiable_clauses.txt",
+            workers=2, conflict_limit=conflict_limit
+        )
+        model = solver.solve()
+        for clause in solver.clauses.clauses:
+            assert any(model.value(literal) for literal in clause)
+        solver = CubeAndConquerSolver.from_file(
+            f"{pathlib.Path(__file__).parent}/unsatisfiable_clauses.txt",
+            workers=2, conflict_limit=conflict_limit
+        )
+        assert solver.solve() is None
+
+    def test_pigeonhole(self):
+        # 5 pigeons, 4 holes: every cube has to be refuted.
+        solver = CubeAndConquerSolver(pigeonhole(5, 4), workers=2,
+                                      depth=2, conflict_limit=10)
+        assert solver.solve() is None
+        assert solver.cubes_solved >= 4
+
+    def test_solve_stops_running_cubes(self):
+        # Under -2, 9 pigeons in 8 holes: the cube would take minutes to
+        # refute without limit. Its worker is terminated once the cube 2,
+        # slower to start with, gives a model.
+        clauses = [clause + [2] for clause
+                   in pigeonhole(9, 8, first_variable=3).clauses]
+        generator = random.Random(0)
+        for _ in range(300):
+            clauses.append([generator.choice((1, -1))
+                            * (75 + generator.randrange(80))
+                            for _ in range(3)] + [-2])
+        solver = CubeAndConquerSolver(Clauses(clauses, {}), workers=2,
+                                      depth=1, conflict_limit=0)
+        model = solver.solve()
+        assert model and model.value(2)
@@ -0,0 +1,54 @@
+from logic_formula_parser.operators import *
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.clauses import Clauses
+from sat_solver.dimacs import read_dimacs, translation_filename, write_dimacs
+
+
+class TestDimacs:
+    def test_read_cnf(self, tmp_path):
+        filename = tmp_path / "formula.cnf"
+        filename.write_text("c comment\np cnf 3 3\n1 -2 0\n2 3\n-1 0 0\n"
+                            "%\n0\n")
+        clauses = read_dimacs(str(filename))
+        assert clauses.clauses == [[2, -3], [3, 4, -2], []]
+        assert clauses.weights == [1, 1, 1]
+        assert clauses.hard == [False, False, False]
+        assert clauses.lines == [3, 4, 5]
+        assert clauses.translation == {Proposition("1"): 2,
+                                       Proposition("2"): 3,
+                                       Proposition("3"): 4}
+
+    def test_read_wcnf(self, tmp_path):
+        filename = tmp_path / "formula.wcnf"
+        filename.write_text("p wcnf 2 3 10\n10 1 2 0\n3 -1 0\n10 -2 0\n")
+        clauses = read_dimacs(str(filename))
+        assert clauses.clauses == [[2, 3], [-2], [-3]]
+        assert clauses.weights == [10, 3, 10]
+        assert clauses.hard == [True, False, True]
+
+        filename.write_text("c new format\nh 1 2 0\n3 -1 0\n12 -2 0\n")
+        clauses = read_dimacs(str(filename))
+        assert clauses.clauses == [[2, 3], [-2], [-3]]
+        assert clauses.weights == [1, 3, 12]
+        assert clauses.hard == [True, False, False]
+        assert clauses.lines == [2, 3, 4]
+
+    def test_write(self, tmp_path):
+        clauses = Clauses.from_lines(["h: a|-[]b", "3: <>-a", "-a|b"])
+        for new_style in (False, True):
+            filename = str(tmp_path / "formula.wcnf")
+            write_dimacs(clauses, filename, new_style=new_style)
+            read = read_dimacs(filename)
+            assert read.clauses == clauses.clauses
+            assert read.weights[:3] == [1 if new_style else 5, 3, 1]
+            assert read.hard == clauses.hard
+            assert read.translation == clauses.translation
+        with open(translation_filename(filename)) as f:
+            assert "[]b" in f.read().split()
+
+        clauses = Clauses([[2, -3], [3]], {})
+        filename = str(tmp_path / "formula.cnf")
+        write_dimacs(clauses, filename)
+        with open(filename) as f:
+            assert f.read() == "p cnf 2 2\n1 -2 0\n2 0\n"
+        assert CdclSatSolver(read_dimacs(filename)).solve()
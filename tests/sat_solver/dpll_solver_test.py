@@ -1,7 +1,10 @@
 import pathlib
+import sys
 import pytest
 
+from sat_solver.clauses import Clauses
 from sat_solver.dpll_solver import DpllSatSolver
+from tests.sat_solver.pigeonhole import pigeonhole
 
 
 class TestDpllSatSolver:
@@ -11,10 +14,39 @@ class TestDpllSatSolver:
             f"/super_simple_satisfiable_clauses.txt"
         )
         solution = solver.solve()
-        assert solution and len(solution.clauses) > 1
+        assert solution and len(solution.literals) > 1
 
         solver = DpllSatSolver.from_file(
             f"{pathlib.Path(__file__).parent}/satisfiable_clauses.txt"
         )
         solution = solver.solve()
-        assert solution and len(solver.solve().clauses) > 1
+        assert solution and len(solver.solve().literals) > 1
+
+    def test_solve_unsatisfiable(self):
+        solver = DpllSatSolver.from_file(
+            f"{pathlib.Path(__file__).parent}/unsatisfiable_clauses.txt"
+        )
+        assert solver.solve() is None
+
+    def test_solve_deep_search(self):
+        # Every clause needs its own decision: the search goes deeper than
+        # the recursion limit of Python.
+        depth = sys.getrecursionlimit() + 500
+        clauses = []
+        for variable in range(2, depth + 2):
+            clauses.append([variable, variable + depth])
+            clauses.append([-variable, -variable - depth])
+        solution = DpllSatSolver(Clauses(clauses, {})).solve()
+        assert solution and len(solution.literals) == 2 * depth
+
+    def test_solve_assumptions(self):
+        clauses = Clauses([[-2, 3], [-3, 4], [-5, -4], [6, 7]], {})
+        solver = DpllSatSolver(clauses)
+        model = solver.solve([2, 6])
+        assert model.value(4) and not model.value(5)
+        assert solver.solve([2, 5]) is None and not solver.interrupted
+
+    def test_solve_conflict_limit(self):
+        solver = DpllSatSolver(pigeonhole(4, 3))
+        assert solver.solve(conflict_limit=2) is None and solver.interrupted
+        assert solver.solve() is None and not solver.interrupted
@@ -0,0 +1,27 @@
+from sat_solver.evaluation import ClauseEvaluator
+
+
+class TestClauseEvaluator:
+    def test_count_satisfied(self):
+        evaluator = ClauseEvaluator([[2, 3], [-2, 3], [-3], []])
+        assignments = [[2, 3], [-2, -3], [2, -3], [3]]
+        assert evaluator.count_satisfied(assignments) == [2, 2, 2, 2]
+        assert evaluator.satisfied_masks(assignments) == [0b1101, 0b1011,
+                                                         0b0110, 0]
+        assert evaluator.falsified([2, -3]) == [1, 3]
+
+    def test_falsified_weight(self):
+        evaluator = ClauseEvaluator([[2, 3], [-2], [-3, 4]], [5, 2, 9])
+        assignments = [[-2, -3, -4], [2, 3, 4], [2, 3, -4], [-2, 3, 4]]
+        assert evaluator.falsified_weight(assignments) == [5, 2, 11, 0]
+        assert evaluator.falsified_weight([]) == []
+
+    def test_batch(self):
+        clauses = [[2, -3, 4], [-2, 3], [3, -4], [-2, -4]]
+        assignments = [[variable if k >> (variable - 2) & 1 else -variable
+                        for variable in range(2, 5)] for k in range(8)]
+        evaluator = ClauseEvaluator(clauses)
+        expected = [sum(any(literal in assignment for literal in clause)
+                        for clause in clauses)
+                    for assignment in assignments]
+        assert evaluator.count_satisfied(assignments) == expected
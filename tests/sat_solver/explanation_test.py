@@ -0,0 +1,57 @@
+import pytest
+
+from sat_solver.clauses import Clauses
+from sat_solver.explanation import Explainer, MUS_ALGORITHMS
+
+# Two MUS: lines 1, 3 and 4, lines 1, 2 and 6.
+LINES = ["a", "b", "-a|c", "-c", "d|e", "-b|-a"]
+
+
+def _explainer(lines, **kwargs):
+    return Explainer(Clauses.from_lines(lines), **kwargs)
+
+
+class TestExplainer:
+    @pytest.mark.parametrize("algorithm", MUS_ALGORITHMS)
+    def test_minimal_unsatisfiable_subset(self, algorithm):
+        explainer = _explainer(LINES)
+        assert explainer.minimal_unsatisfiable_subset(algorithm) in \
+            ([1, 3, 4], [1, 2, 6])
+        assert explainer.calls > 0
+        # Line numbers count the comments and the blank lines, a line of
+        # several clauses is kept or removed as a whole.
+        explainer = _explainer(["# comment", "h: a&b", "", "c", "-b|-a"])
+        assert explainer.minimal_unsatisfiable_subset(algorithm) == [2, 5]
+        # The modal axioms are always kept.
+        explainer = _explainer(["[]a", "<>-a", "-[]a|<>-a"])
+        assert explainer.minimal_unsatisfiable_subset(algorithm) == [1, 2]
+
+    @pytest.mark.parametrize("algorithm", MUS_ALGORITHMS)
+    def test_keep_hard(self, algorithm):
+        lines = ["h: a", "b"] + LINES[2:]
+        explainer = _explainer(lines, keep_hard=True)
+        assert explainer.minimal_unsatisfiable_subset(algorithm) in \
+            ([3, 4], [2, 6])
+        assert sorted(explainer.minimal_correction_sets()) == \
+            [[2, 3], [2, 4], [3, 6], [4, 6]]
+        explainer = _explainer(["h: a", "h: -a", "b"], keep_hard=True)
+        assert explainer.minimal_unsatisfiable_subset(algorithm) == []
+        assert list(explainer.minimal_correction_sets()) == []
+
+    def test_satisfiable(self):
+        explainer = _explainer(LINES[1:])
+        assert explainer.minimal_unsatisfiable_subset() is None
+        assert list(explainer.minimal_correction_sets()) == [[]]
+
+    def test_minimal_correction_sets(self):
+        explainer = _explainer(LINES)
+        assert sorted(explainer.minimal_correction_sets()) == \
+            [[1], [2, 3], [2, 4], [3, 6], [4, 6]]
+        # The blocking clauses are removed after the enumeration.
+        assert explainer.minimal_unsatisfiable_subset() in \
+            ([1, 3, 4], [1, 2, 6])
+        assert len(list(explainer.minimal_correction_sets())) == 5
+
+    def test_unknown_algorithm(self):
+        with pytest.raises(ValueError):
+            _explainer(LINES).minimal_unsatisfiable_subset("unknown")
@@ -0,0 +1,86 @@
+import pathlib
+import pytest
+
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.dpll_solver import DpllSatSolver
+from sat_solver.heuristics import ActivityHeap, Evsids, HEURISTICS, Moms, Dlis
+from sat_solver.trail import Trail
+
+
+class TestHeuristics:
+    def test_activity_heap(self):
+        activity = [0.0, 0.0, 3.0, 1.0, 5.0, 2.0]
+        heap = ActivityHeap(activity)
+        for variable in range(2, 6):
+            heap.push(variable)
+        activity[3] = 10.0
+        heap.increased(3)
+        assert 3 in heap
+        assert [heap.pop() for _ in range(4)] == [3, 4, 2, 5]
+        assert not heap
+
+    def test_evsids(self):
+        clauses = [[2, 3], [-3, 4], [-2, -4]]
+        trail = Trail(4)
+        heuristic = Evsids(clauses, trail)
+        heuristic.bump(4)
+        heuristic.decay()
+        heuristic.bump(3)
+        assert heuristic.pick() == -3
+        trail.assign(-3)
+        heuristic.unassigned([-3])
+        trail.backtrack(0)
+        assert heuristic.pick() == -4
+
+    def test_phase_saving(self):
+        trail = Trail(3)
+        heuristic = Evsids([[2, 3]], trail)
+        heuristic.unassigned([2, -3])
+        assert heuristic.phase(2) == 2
+        assert heuristic.phase(3) == -3
+
+    def test_rephase(self):
+        trail = Trail(4)
+        heuristic = Evsids([[2, 3, 4]], trail)
+        trail.new_decision_level()
+        for literal in (2, -3, 4):
+            trail.assign(literal)
+        heuristic.unassigned(trail.backtrack(0))
+        trail.new_decision_level()
+        trail.assign(-2)
+        heuristic.unassigned(trail.backtrack(0))
+        assert [heuristic.phase(variable) for variable in (2, 3, 4)] == \
+            [-2, -3, 4]
+        heuristic.rephase("inverted")
+        assert [heuristic.phase(variable) for variable in (2, 3, 4)] == \
+            [2, 3, 4]
+        heuristic.rephase("flip")
+        assert [heuristic.phase(variable) for variable in (2, 3, 4)] == \
+            [-2, -3, -4]
+        # The phases of the largest assignment, with 2 true.
+        heuristic.rephase("best")
+        assert [heuristic.phase(variable) for variable in (2, 3, 4)] == \
+            [2, -3, 4]
+        heuristic.rephase("original")
+        assert [heuristic.phase(variable) for variable in (2, 3, 4)] == \
+            [-2, -3, -4]
+        with pytest.raises(ValueError):
+            heuristic.rephase("inverse")
+
+    def test_dlis_moms(self):
+        clauses = [[2, 3, 4], [2, -3, 4], [-4, 5], [5, 6], [2, 5, 6]]
+        assert Dlis(clauses, Trail(6)).pick() == 2
+        assert Moms(clauses, Trail(6)).pick() == 5
+
+    @pytest.mark.parametrize("heuristic", sorted(HEURISTICS))
+    def test_solve(self, heuristic):
+        directory = pathlib.Path(__file__).parent
+        for solver_class in (DpllSatSolver, CdclSatSolver):
+            solver = solver_class.from_file(
+                f"{directory}/satisfiable_clauses.txt", heuristic
+            )
+            assert solver.solve()
+            solver = solver_class.from_file(
+                f"{directory}/unsatisfiable_clauses.txt", heuristic
+            )
+            assert solver.solve() is None
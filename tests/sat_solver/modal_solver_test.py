@@ -0,0 +1,85 @@
+import pytest
+
+from logic_formula_parser.operators import *
+from sat_solver.modal_solver import KripkeModel, LOGICS, ModalSatSolver
+
+p = Proposition("p")
+q = Proposition("q")
+
+
+def _satisfiable(formulas, logic):
+    model = ModalSatSolver(formulas, logic).solve()
+    if model is None:
+        return False
+    assert all(model.satisfies(formula) for formula in formulas)
+    worlds = range(len(model.valuations))
+    if logic in ("KT", "S4"):
+        assert all(world in model.successors[world] for world in worlds)
+    if logic == "KD":
+        assert all(model.successors)
+    if logic == "S4":
+        assert all(model.successors[other] <= model.successors[world]
+                   for world in worlds for other in model.successors[world])
+    return True
+
+
+class TestKripkeModel:
+    def test_satisfies(self):
+        model = KripkeModel([{p}, {q}, {p, q}], [{1, 2}, set(), {2}])
+        assert model.satisfies(And(p, Not(q)))
+        assert model.satisfies(Box(q))
+        assert model.satisfies(Diamond(p)) and model.satisfies(DiamondNot(p))
+        assert not model.satisfies(BoxNot(p))
+        assert model.satisfies(Box(p), 1)
+        assert model.satisfies(Imply(q, Box(Box(p))), 2)
+
+
+class TestModalSatSolver:
+    @pytest.mark.parametrize("formulas, satisfiable", [
+        ([Box(p), Diamond(Not(p))], []),
+        ([Box(p), Not(p)], ["K", "KD"]),
+        ([Box(p), BoxNot(p)], ["K"]),
+        ([Not(Imply(Box(p), Box(Box(p))))], ["K", "KD", "KT"]),
+        ([Box(p), Diamond(Diamond(Not(p)))], ["K", "KD", "KT"]),
+        ([Diamond(p), DiamondNot(p), Box(Or(p, q))], LOGICS),
+        ([Not(Imply(Diamond(Box(p)), Box(Diamond(p))))], LOGICS),
+        ([], LOGICS),
+    ])
+    def test_solve(self, formulas, satisfiable):
+        for logic in LOGICS:
+            assert _satisfiable(formulas, logic) == (logic in satisfiable)
+
+    def test_solve_deep(self):
+        # The modal depth is beyond the recursion limit of Python.
+        box, diamond = p, Not(p)
+        for _ in range(2000):
+            box, diamond = Box(box), Diamond(diamond)
+        assert ModalSatSolver([box, diamond]).solve() is None
+        assert ModalSatSolver([box, Diamond(diamond)]).solve()
+
+    def test_solve_memoized(self):
+        # 2^10 paths of length 10, over 21 different labels.
+        formula = p
+        for index in range(10):
+            proposition = Proposition(f"q{index}")
+            formula = And(Diamond(And(proposition, formula)),
+                          Diamond(And(Not(proposition), formula)))
+        solver = ModalSatSolver([formula, Box(Box(Not(q)))], "K")
+        model = solver.solve()
+        assert model and model.satisfies(formula)
+        assert solver.worlds == 21 and solver.cache_hits > 0
+        solver = ModalSatSolver([formula, Box(Box(Not(Proposition("q0"))))],
+                                "S4")
+        assert solver.solve() is None
+
+    def test_from_file(self, tmp_path):
+        path = tmp_path / "formulas.txt"
+        path.write_text("# Comment\n[]a\n<>-a|b\n\n-b\n")
+        assert ModalSatSolver.from_file(str(path), "K").solve() is None
+        path.write_text("[]a\n-a\n")
+        assert ModalSatSolver.from_file(str(path), "K").solve()
+        assert ModalSatSolver.from_file(str(path), "KT").solve() is None
+
+    def test_unknown_logic(self):
+        with pytest.raises(ValueError):
+            ModalSatSolver([p], "S5")
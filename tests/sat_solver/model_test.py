@@ -0,0 +1,31 @@
+import pytest
+
+from logic_formula_parser.operators import *
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.clauses import Clauses
+from sat_solver.model import Model
+
+
+class TestModel:
+    def test_decode(self):
+        clauses = Clauses.from_lines(["[]a|-b", "b", "-c"])
+        model = CdclSatSolver(clauses).solve()
+        assert isinstance(model, Model)
+        a, b, c = Proposition("a"), Proposition("b"), Proposition("c")
+        assert model[a] and model[b] and not model[c] and model[Box(a)]
+        assert model.value(clauses.translation[b])
+        assert not model.value(-clauses.translation[b])
+        assert {a, b, c, Box(a)} & model.true_leaves() == {a, b, Box(a)}
+        assert {"☐a", "b", "¬c"} <= set(str(model).splitlines())
+        with pytest.raises(KeyError):
+            model[Proposition("d")]
+
+    def test_auxiliary_variables(self):
+        clauses = Clauses([[2, 5]], {Proposition("a"): 2})
+        model = Model([-2, 5], clauses)
+        assert model.value(5) and model.value(3) is None
+        assert list(model.items()) == [(Proposition("a"), False)]
+        assert str(model) == "¬a\n"
+        assert clauses.symbols == [None, None, Proposition("a")]
+        assert str(clauses) == "a∨5\n"
+        assert model == Model([5, -2])
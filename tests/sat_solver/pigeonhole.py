@@ -0,0 +1,19 @@
+from sat_solver.clauses import Clauses
+
+
+def pigeonhole(pigeons, holes, first_variable=2):
+    """Return the clauses putting each pigeon in a hole, with at most one
+    pigeon per hole: unsatisfiable when there are more pigeons than holes.
+
+    Pigeon p is in hole h if the variable first_variable + p * holes + h
+    is true.
+    """
+    def variable(pigeon, hole): return first_variable + pigeon * holes + hole
+    clauses = [[variable(pigeon, hole) for hole in range(holes)]
+               for pigeon in range(pigeons)]
+    for hole in range(holes):
+        for first in range(pigeons):
+            for second in range(first + 1, pigeons):
+                clauses.append([-variable(first, hole),
+                                -variable(second, hole)])
+    return Clauses(clauses, {})
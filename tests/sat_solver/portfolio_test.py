@@ -0,0 +1,40 @@
+import pathlib
+import pytest
+
+from sat_solver.clauses import Clauses
+from sat_solver.portfolio import (Configuration, PortfolioSolver,
+                                  default_configurations)
+
+
+class TestPortfolioSolver:
+    def test_solve(self):
+        configurations = default_configurations(8)
+        assert len(set(configurations)) == 8
+        solver = PortfolioSolver.from_file(
+            f"{pathlib.Path(__file__).parent}/satisfiable_clauses.txt",
+            configurations
+        )
+        model = solver.solve()
+        assert solver.winner in configurations
+        for clause in solver.clauses.clauses:
+            assert any(model.value(literal) for literal in clause)
+        solver = PortfolioSolver.from_file(
+            f"{pathlib.Path(__file__).parent}/unsatisfiable_clauses.txt",
+            configurations[:3]
+        )
+        assert solver.solve() is None
+
+    def test_empty(self):
+        solver = PortfolioSolver(Clauses([], {}), [Configuration()])
+        assert solver.solve().literals == []
+        solver = PortfolioSolver(Clauses([[]], {}), [Configuration("dpll")])
+        assert solver.solve() is None
+
+    def test_unknown_configuration(self):
+        with pytest.raises(ValueError):
+            PortfolioSolver(Clauses([], {}), [Configuration("walksat")])
+        with pytest.raises(ValueError):
+            PortfolioSolver(Clauses([], {}),
+                            [Configuration(restarts="sometimes")])
+        with pytest.raises(ValueError):
+            PortfolioSolver(Clauses([], {}), [])
@@ -0,0 +1,71 @@
+import pathlib
+import pytest
+
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.clauses import Clauses
+from sat_solver.dpll_solver import DpllSatSolver
+from sat_solver.preprocessing import Preprocessor
+
+
+class TestPreprocessor:
+    def test_subsumption(self):
+        preprocessor = Preprocessor([[2, 3], [2, 3, 4], [-2, 3, 5], [5, 6]],
+                                    frozen=[2, 3, 4, 5, 6])
+        # [2, 3] subsumes [2, 3, 4] and strengthens [-2, 3, 5] to [3, 5].
+        assert preprocessor.simplify() == [[2, 3], [3, 5], [5, 6]]
+
+    def test_units(self):
+        preprocessor = Preprocessor([[2], [-2, 3], [-3, 4, 5]], frozen=[4])
+        assert preprocessor.simplify() == []
+        assert preprocessor.eliminated == {2, 3, 5}
+        model = set(preprocessor.extend([-4]))
+        assert {2, 3, -4, 5} == model
+
+    def test_unsatisfiable(self):
+        preprocessor = Preprocessor([[2, 3], [2, -3], [-2, 3], [-2, -3]])
+        assert preprocessor.simplify() == [[]]
+
+    def test_elimination(self):
+        clauses = [[2, 3], [-2, 4], [-3, -4, 5], [-5, 6], [-6, -2]]
+        preprocessor = Preprocessor(clauses, frozen=[3])
+        simplified = preprocessor.simplify()
+        assert len(simplified) < len(clauses)
+        assert 3 not in preprocessor.eliminated
+        for value in (3, -3):
+            model = set(preprocessor.extend([value]))
+            assert all(model & set(clause) for clause in clauses)
+
+    def test_restore(self):
+        clauses = [[2, 3], [-3, 4]]
+        preprocessor = Preprocessor(clauses, frozen=[2])
+        assert preprocessor.simplify() == []
+        restored = preprocessor.restore([4])
+        assert sorted(restored) == sorted(clauses)
+        assert preprocessor.eliminated == set()
+        model = set(preprocessor.extend([-2, 3, 4]))
+        assert model == {-2, 3, 4}
+
+    @pytest.mark.parametrize("solver_class", [DpllSatSolver, CdclSatSolver])
+    def test_solve(self, solver_class):
+        solver = solver_class.from_file(
+            f"{pathlib.Path(__file__).parent}/satisfiable_clauses.txt",
+            preprocess=True
+        )
+        model = solver.solve()
+        for clause in solver.clauses.clauses:
+            assert any(model.value(literal) for literal in clause)
+        solver = solver_class.from_file(
+            f"{pathlib.Path(__file__).parent}/unsatisfiable_clauses.txt",
+            preprocess=True
+        )
+        assert solver.solve() is None
+
+    def test_incremental(self):
+        solver = CdclSatSolver(Clauses([[2, 3], [-3, 4]], {}),
+                               preprocess=True)
+        assert solver.solve()
+        assert solver.solve([-2, -4]) is None
+        assert sorted(solver.core) == [-4, -2]
+        solver.add_clause([-2])
+        model = solver.solve()
+        assert not model.value(2) and model.value(3) and model.value(4)
@@ -0,0 +1,56 @@
+from sat_solver.propagation import WatchedLiterals
+
+
+class TestWatchedLiterals:
+    def test_propagate(self):
+        engine = WatchedLiterals([
+            [2, 3],
+            [-2, 4],
+            [-4, -3, 5],
+        ])
+        assert engine.reset() is None
+        engine.assign(-3)
+        assert engine.propagate() is None
+        assert engine.trail.literals == [-3, 2, 4]
+        assert engine.trail.reason(4) == 1
+        assert engine.value(5) is None
+        assert engine.value(-2) is False
+
+    def test_propagate_conflict(self):
+        engine = WatchedLiterals([
+            [2, 3],
+            [2, -3],
+            [-2, 4],
+        ])
+        assert engine.reset() is None
+        engine.assign(-2)
+        assert engine.propagate() in (0, 1)
+
+    def test_backtrack(self):
+        engine = WatchedLiterals([
+            [2, 3, 4],
+            [-2, -3],
+        ])
+        assert engine.reset() is None
+        engine.trail.new_decision_level()
+        engine.assign(2)
+        assert engine.propagate() is None
+        assert engine.value(3) is False
+        engine.trail.backtrack(0)
+        assert engine.trail.literals == []
+        engine.trail.new_decision_level()
+        engine.assign(-3)
+        engine.assign(-4)
+        assert engine.propagate() is None
+        assert engine.value(2) is True
+
+    def test_reset(self):
+        engine = WatchedLiterals([[2], [-2, 3], [-3]])
+        assert engine.reset() is None
+        assert engine.propagate() is not None
+
+        engine = WatchedLiterals([[2], [-2]])
+        assert engine.reset() == 1
+
+        engine = WatchedLiterals([[2, 3], []])
+        assert engine.reset() == 1
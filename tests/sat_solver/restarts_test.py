@@ -0,0 +1,76 @@
+import functools
+import pytest
+
+from sat_solver.cdcl_solver import CdclSatSolver
+from sat_solver.dpll_solver import DpllSatSolver
+from sat_solver.restarts import (GeometricRestarts, GlucoseRestarts,
+                                 LubyRestarts, NoRestarts, RESTART_POLICIES,
+                                 luby)
+from tests.sat_solver.pigeonhole import pigeonhole
+
+
+def _intervals(policy, count):
+    """Return the numbers of conflicts of the first restarts."""
+    intervals = []
+    for _ in range(count):
+        conflicts = 0
+        while not policy.should_restart():
+            policy.conflict(2)
+            conflicts += 1
+        policy.restarted()
+        intervals.append(conflicts)
+    return intervals
+
+
+class TestRestarts:
+    def test_luby(self):
+        assert [luby(index) for index in range(1, 16)] == \
+            [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+        assert _intervals(LubyRestarts(10), 7) == \
+            [10, 10, 20, 10, 10, 20, 40]
+
+    def test_geometric(self):
+        assert _intervals(GeometricRestarts(10, 2), 4) == [10, 20, 40, 80]
+
+    def test_glucose(self):
+        policy = GlucoseRestarts(minimum=5)
+        for _ in range(100):
+            policy.conflict(3)
+        assert not policy.should_restart()
+        # A burst of conflicts of high LBD raises the fast average only.
+        for _ in range(10):
+            policy.conflict(10)
+        assert policy.should_restart()
+        policy.restarted()
+        assert not policy.should_restart()
+
+    def test_no_restarts(self):
+        policy = NoRestarts()
+        for _ in range(1000):
+            policy.conflict(5)
+        assert not policy.should_restart()
+
+    @pytest.mark.parametrize("solver_class", [DpllSatSolver, CdclSatSolver])
+    @pytest.mark.parametrize("restarts", [
+        functools.partial(LubyRestarts, 1),
+        functools.partial(GeometricRestarts, 1, 1.1),
+        functools.partial(GlucoseRestarts, minimum=1, margin=0.5),
+    ])
+    def test_solve(self, solver_class, restarts):
+        solver = solver_class(pigeonhole(5, 4), restarts=restarts,
+                              rephase_interval=2)
+        assert solver.solve() is None
+        statistics = solver.statistics
+        assert statistics.restarts > 0
+        assert statistics.rephases == statistics.restarts // 2
+        assert statistics.conflicts > statistics.restarts
+        solver = solver_class(pigeonhole(4, 4), "random", restarts=restarts)
+        assert solver.solve()
+
+    def test_solve_names(self):
+        for name in RESTART_POLICIES:
+            solver = CdclSatSolver(pigeonhole(4, 3), restarts=name)
+            assert solver.solve() is None
+        solver = CdclSatSolver(pigeonhole(4, 3), restarts="none")
+        solver.solve()
+        assert solver.statistics.restarts == 0
@@ -0,0 +1,34 @@
+from sat_solver.trail import Trail
+
+
+class TestTrail:
+    def test_assign(self):
+        trail = Trail(4)
+        trail.assign(2)
+        trail.new_decision_level()
+        trail.assign(-3)
+        trail.assign(4, reason=0)
+        assert trail.value(2) is True
+        assert trail.value(-3) is True
+        assert trail.value(3) is False
+        assert trail.value(-4) is False
+        assert trail.level(2) == 0
+        assert trail.level(4) == 1
+        assert trail.reason(3) is None
+        assert trail.reason(4) == 0
+
+    def test_backtrack(self):
+        trail = Trail(5)
+        trail.assign(2)
+        trail.new_decision_level()
+        trail.assign(3)
+        trail.new_decision_level()
+        trail.assign(-4)
+        trail.assign(5)
+        trail.head = len(trail)
+        assert trail.backtrack(1) == [-4, 5]
+        assert trail.literals == [2, 3]
+        assert trail.decision_level == 1
+        assert trail.head == 2
+        assert trail.value(4) is None
+        assert trail.backtrack(3) == []